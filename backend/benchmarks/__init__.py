@@ -0,0 +1,5 @@
+"""
+Benchmark scripts for the employee directory backend.
+
+Run from the backend directory, e.g. `python -m benchmarks.bench_search_count`.
+"""
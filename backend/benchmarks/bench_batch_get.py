@@ -0,0 +1,82 @@
+"""
+Microbenchmark: resolving N employee IDs one GET at a time vs one batch-get.
+
+Runs against a seeded temporary SQLite database through AsyncEmployeeRepository.
+The per-ID path issues one primary-key lookup per ID, each in a request-scoped
+repository as N calls to GET /api/employees/{id} would; the batch path is what POST
+/api/employees/batch-get does: one IN query behind the request's identity map.
+A quarter of each ID list repeats earlier IDs and a few IDs do not exist.
+
+Usage:
+    python -m benchmarks.bench_batch_get [rows] [rounds]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from benchmarks.common import StatementTimer, create_async_sqlite, create_seeded_sqlite
+from repositories.async_employee_repository import AsyncEmployeeRepository
+
+BATCH_SIZES = (10, 100, 500)
+
+
+def make_ids(size: int, rows: int, rng: random.Random) -> list:
+    """IDs in random order: mostly existing, a quarter repeated, a few missing."""
+    distinct = [rng.randint(1, rows + rows // 50) for _ in range(size - size // 4)]
+    return distinct + [rng.choice(distinct) for _ in range(size // 4)]
+
+
+async def run(rows: int = 100000, rounds: int = 20) -> list:
+    engine = create_async_sqlite(create_seeded_sqlite(rows))
+    Session = async_sessionmaker(bind=engine)
+    timer = StatementTimer(engine)
+    rng = random.Random(5)
+    results = []
+    for size in BATCH_SIZES:
+        batches = [make_ids(size, rows, rng) for _ in range(rounds)]
+        
+        with timer.measure():
+            started = time.perf_counter()
+            for ids in batches:
+                async with Session() as db:
+                    for employee_id in ids:
+                        await AsyncEmployeeRepository(db).get_employee_rows_by_ids([employee_id])
+            single_seconds = (time.perf_counter() - started) / rounds
+            single_statements = timer.statements / rounds
+        
+        with timer.measure():
+            started = time.perf_counter()
+            for ids in batches:
+                async with Session() as db:
+                    await AsyncEmployeeRepository(db).get_employee_rows_by_ids(ids)
+            batch_seconds = (time.perf_counter() - started) / rounds
+            batch_statements = timer.statements / rounds
+        
+        results.append({
+            "ids": size,
+            "single_ms": single_seconds * 1000,
+            "single_statements": single_statements,
+            "batch_ms": batch_seconds * 1000,
+            "batch_statements": batch_statements,
+        })
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"{rows} employees, {rounds} rounds per size")
+    for result in asyncio.run(run(rows, rounds)):
+        print(
+            f"  {result['ids']:>4} ids: one-by-one {result['single_ms']:8.2f} ms "
+            f"({result['single_statements']:.0f} statements), "
+            f"batch-get {result['batch_ms']:7.2f} ms ({result['batch_statements']:.0f} statement)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Microbenchmark: re-polling the full listing vs reading the change feed.
+
+Runs against a seeded temporary SQLite database. After `writes` new employees
+are created, a consumer catches up either by re-reading the whole directory in
+keyset pages of 100 (what downstream systems did before the change feed) or
+by asking the change feed for everything after the last sequence it saw.
+Reports time, SQL statements and JSON bytes per poll.
+
+Usage:
+    python -m benchmarks.bench_changes [rows] [writes] [rounds]
+"""
+import asyncio
+import sys
+import time
+
+import orjson
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import StatementTimer, create_async_sqlite, create_seeded_sqlite
+from repositories.async_employee_repository import AsyncEmployeeRepository
+from repositories.employee_repository import EmployeeRepository
+from seed_data import generate_sample_employees
+from services.async_employee_service import AsyncEmployeeService
+
+PAGE_SIZE = 100
+
+
+async def full_poll(db) -> int:
+    """Page through the whole listing by keyset; return the JSON bytes received."""
+    repository = AsyncEmployeeRepository(db)
+    received, after = 0, None
+    while True:
+        employees, _, _ = await repository.search_employees(limit=PAGE_SIZE, after=after, include_total=False)
+        received += len(orjson.dumps([employee._asdict() for employee in employees]))
+        if len(employees) < PAGE_SIZE:
+            return received
+        after = (employees[-1].name, employees[-1].id)
+
+
+async def feed_poll(db, since: int) -> int:
+    """Read the change feed from `since` to the end; return the JSON bytes received."""
+    service = AsyncEmployeeService(db)
+    received = 0
+    while True:
+        page = await service.get_changes(since, PAGE_SIZE)
+        received += len(orjson.dumps(page))
+        since = page["next_since"]
+        if not page["has_more"]:
+            return received
+
+
+async def run(rows: int = 100000, writes: int = 20, rounds: int = 5) -> dict:
+    engine = create_seeded_sqlite(rows)
+    # Seeded rows are numbered 1..rows; the consumer has seen all of them
+    since = rows
+    with sessionmaker(bind=engine)() as db:
+        new_rows = [dict(row, email=f"bench.{index}.{row['email']}")
+                    for index, row in enumerate(generate_sample_employees(writes))]
+        EmployeeRepository(db).bulk_create_employees(new_rows)
+    async_engine = create_async_sqlite(engine)
+    Session = async_sessionmaker(bind=async_engine)
+    timer = StatementTimer(async_engine)
+    
+    results = {}
+    for name, poll in (("full listing", full_poll), ("change feed", lambda db: feed_poll(db, since))):
+        with timer.measure():
+            started = time.perf_counter()
+            for _ in range(rounds):
+                async with Session() as db:
+                    received = await poll(db)
+            results[name] = {
+                "ms": (time.perf_counter() - started) / rounds * 1000,
+                "statements": timer.statements / rounds,
+                "bytes": received,
+            }
+    await async_engine.dispose()
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    writes = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    print(f"{rows} employees, {writes} new since the last poll, {rounds} rounds")
+    for name, result in asyncio.run(run(rows, writes, rounds)).items():
+        print(
+            f"  {name:<12} {result['ms']:9.2f} ms, {result['statements']:6.0f} statements, "
+            f"{result['bytes']:>10} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: sync vs async DB path under concurrent requests.
+
+Each simulated request opens its own session and runs a LIKE search, exactly
+like a route handler. The "sync" path issues the same COUNT and page queries on
+a blocking Session from a coroutine (the previous route behaviour); the
+"async" path awaits AsyncEmployeeService. For every concurrency level the script reports
+- throughput (requests/second)
+- event loop lag: how late a 1 ms heartbeat coroutine wakes up while the
+  searches run. With the sync path the loop is blocked for the whole query, so
+  every other request on the worker waits; with the async path it stays
+  responsive.
+
+Throughput only scales with in-flight requests when the database can work on
+several queries at once (MySQL over the network). SQLite on a single core is
+CPU bound either way; set BENCH_DATABASE_URL to a seeded MySQL database
+(mysql+pymysql://...) to measure that case.
+
+Usage:
+    python -m benchmarks.bench_concurrency [rows] [requests_per_level]
+"""
+import asyncio
+import os
+import sys
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+
+from benchmarks.common import create_async_sqlite, create_seeded_sqlite
+from config import Settings, settings
+from models import Employee
+from repositories.count_cache import search_count_cache
+from repositories.employee_repository import EMPLOYEE_COLUMNS, search_filter
+from services.async_employee_service import AsyncEmployeeService
+from services.search_cache import search_result_cache
+
+CONCURRENCY_LEVELS = [1, 4, 16, 32]
+SEARCH_TERMS = ["ra", "sh", "en", "an", "ku"]
+
+
+def _blocking_search(db: Session, term: str) -> None:
+    """Run a LIKE search's COUNT and page queries on a blocking session."""
+    query = select(*EMPLOYEE_COLUMNS).where(search_filter(term))
+    db.execute(select(func.count()).select_from(query.subquery())).scalar()
+    db.execute(query.order_by(Employee.name, Employee.id).limit(51)).all()
+
+
+async def _run_level(make_request, concurrency: int, total_requests: int) -> dict:
+    """Issue total_requests with `concurrency` in flight and sample loop lag."""
+    queue = list(range(total_requests))
+    lags = []
+    done = asyncio.Event()
+    
+    async def worker():
+        while queue:
+            i = queue.pop()
+            await make_request(SEARCH_TERMS[i % len(SEARCH_TERMS)])
+    
+    async def heartbeat():
+        while not done.is_set():
+            expected = time.perf_counter() + 0.001
+            await asyncio.sleep(0.001)
+            lags.append(max(0.0, time.perf_counter() - expected))
+    
+    monitor = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await monitor
+    
+    lags.sort()
+    return {
+        "requests_per_second": round(total_requests / elapsed, 1),
+        "loop_lag_p99_ms": round(lags[int(len(lags) * 0.99) - 1] * 1000, 2) if lags else 0.0,
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2) if lags else 0.0,
+    }
+
+
+async def run(rows: int = 50000, total_requests: int = 100) -> dict:
+    # Force every request onto the SQL path with a real COUNT, each running
+    # its own queries (no result cache hits, no coalescing) like the sync path
+    settings.search_index_enabled = False
+    settings.search_coalescing_enabled = False
+    database_url = os.environ.get("BENCH_DATABASE_URL")
+    if database_url:
+        sync_engine = create_engine(database_url)
+        async_engine = create_async_engine(Settings(database_url=database_url).async_database_url_resolved)
+    else:
+        sync_engine = create_seeded_sqlite(rows)
+        async_engine = create_async_sqlite(sync_engine)
+    
+    async def sync_request(term: str):
+        with Session(sync_engine) as db:
+            _blocking_search(db, term)
+    
+    async def async_request(term: str):
+        search_count_cache.invalidate()
+        search_result_cache.invalidate()
+        async with AsyncSession(async_engine) as db:
+            await AsyncEmployeeService(db).search_employees(search=term, limit=50)
+    
+    results = {"sync": {}, "async": {}}
+    for concurrency in CONCURRENCY_LEVELS:
+        results["sync"][concurrency] = await _run_level(sync_request, concurrency, total_requests)
+        results["async"][concurrency] = await _run_level(async_request, concurrency, total_requests)
+    await async_engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    total_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    results = asyncio.run(run(rows, total_requests))
+    print(f"{'in-flight':>9} {'path':>6} {'req/s':>8} {'lag p99 ms':>11} {'lag max ms':>11}")
+    for concurrency in CONCURRENCY_LEVELS:
+        for path in ("sync", "async"):
+            stats = results[path][concurrency]
+            print(f"{concurrency:>9} {path:>6} {stats['requests_per_second']:>8.1f} "
+                  f"{stats['loop_lag_p99_ms']:>11.2f} {stats['loop_lag_max_ms']:>11.2f}")
@@ -0,0 +1,94 @@
+"""
+Microbenchmark: sparse fieldsets and response compression.
+
+Runs against a seeded temporary SQLite database. For each fieldset, a page of
+employees is selected with exactly the columns `fields=` would select and
+encoded with orjson as the API does. Reported per page:
+- row width: bytes of column data the database returns per row
+- JSON: uncompressed response body size
+- gzip / br: body size with the middleware's compressor settings (br only
+  when the `brotli` package is installed)
+- query and encode time
+
+Usage:
+    python -m benchmarks.bench_fields_compression [rows] [page_size] [rounds]
+"""
+import sys
+import time
+from datetime import date
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import create_seeded_sqlite
+from compression import SUPPORTED_ENCODINGS, compress
+from models import Employee
+from repositories.employee_repository import select_columns
+
+FIELDSETS = ((), ("name", "department"), ("name",))
+
+
+def value_width(value) -> int:
+    """Approximate stored size of one column value."""
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, date):
+        return 10
+    return 8
+
+
+def measure(Session, fields: tuple, page_size: int, rounds: int) -> dict:
+    columns = select_columns(fields)
+    statement = select(*columns).order_by(Employee.name, Employee.id).offset(page_size).limit(page_size)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        with Session() as db:
+            rows = db.execute(statement).all()
+        body = orjson.dumps({"employees": [row._asdict() for row in rows]})
+    seconds = (time.perf_counter() - started) / rounds
+    
+    result = {
+        "fields": ",".join(rows[0]._fields),
+        "row_width": sum(value_width(value) for row in rows for value in row) / len(rows),
+        "json": len(body),
+        "ms": seconds * 1000,
+    }
+    for encoding in SUPPORTED_ENCODINGS:
+        result[encoding] = len(compress(body, encoding))
+    return result
+
+
+def run(rows: int = 100000, page_size: int = 100, rounds: int = 200) -> list:
+    engine = create_seeded_sqlite(rows)
+    Session = sessionmaker(bind=engine)
+    results = [measure(Session, fields, page_size, rounds) for fields in FIELDSETS]
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    print(f"{rows} employees, pages of {page_size}, {rounds} rounds")
+    results = run(rows, page_size, rounds)
+    full = results[0]
+    for result in results:
+        sizes = ", ".join(f"{encoding} {result[encoding]:>6} B" for encoding in SUPPORTED_ENCODINGS)
+        print(
+            f"  {result['fields']}\n"
+            f"    row width {result['row_width']:6.1f} B ({result['row_width'] / full['row_width']:4.0%}), "
+            f"JSON {result['json']:>6} B, {sizes}, "
+            f"query+encode {result['ms']:.3f} ms"
+        )
+    for encoding in SUPPORTED_ENCODINGS:
+        saved = full["json"] - full[encoding]
+        print(f"  {encoding} saves {saved} B ({saved / full['json']:.0%}) on the full page")
+    sparse = results[-1]
+    print(f"  fields={sparse['fields']} saves {full['json'] - sparse['json']} B uncompressed, "
+          f"{full['gzip'] - sparse['gzip']} B gzipped")
+
+
+if __name__ == "__main__":
+    main()
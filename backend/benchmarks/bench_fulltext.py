@@ -0,0 +1,93 @@
+"""
+Benchmark: LIKE search vs the native full-text backend on SQLite (FTS5).
+
+Runs the page query (50 rows) and the COUNT(*) the list endpoint issues for a
+mix of names, surnames, departments and two-word terms, on a seeded temporary
+database. Three ways to search are compared:
+- like: leading-wildcard ILIKE on name and department (no in-memory index)
+- trigram: the in-memory trigram index narrows candidates, SQL fetches the page
+- fulltext: FTS5 prefix MATCH, ranked by bm25 (search_backend="fulltext")
+The trigram index is built before timing; its build time is printed separately.
+
+Usage:
+    python -m benchmarks.bench_fulltext [rows] [iterations]
+"""
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from benchmarks.common import create_seeded_sqlite
+from indexes.trigram_index import TrigramIndex
+from models import Employee
+from repositories.employee_repository import EMPLOYEE_COLUMNS, search_filter
+from repositories.fulltext_search import MIN_WORD_LENGTH, FulltextMatch, create_fulltext_index
+
+SEARCH_TERMS = ["Priya", "Kumar", "Sharma", "Engineering", "Sales", "kum", "Priya Sharma", "Data Science", "zzz"]
+
+
+def _like(connection, term: str, trigram=None) -> int:
+    query = select(*EMPLOYEE_COLUMNS).where(search_filter(term))
+    connection.execute(query.order_by(Employee.name, Employee.id).limit(50)).all()
+    return connection.scalar(select(func.count()).select_from(query.subquery()))
+
+
+def _trigram(connection, term: str, trigram=None) -> int:
+    employee_ids, total, _ = trigram.search(term, 50, 0)
+    if employee_ids:
+        connection.execute(select(*EMPLOYEE_COLUMNS).where(Employee.id.in_(employee_ids))).all()
+    return total
+
+
+def _fulltext(connection, term: str, trigram=None) -> int:
+    ranked = FulltextMatch("sqlite", [word for word in term.lower().split() if len(word) >= MIN_WORD_LENGTH])
+    query = ranked.apply(select(*EMPLOYEE_COLUMNS))
+    connection.execute(query.order_by(*ranked.order_by()).limit(50)).all()
+    return connection.scalar(select(func.count()).select_from(query.subquery()))
+
+
+def run(rows: int = 100000, iterations: int = 20) -> dict:
+    engine = create_seeded_sqlite(rows)
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        create_fulltext_index(connection)
+    fts_build_seconds = time.perf_counter() - started
+    
+    trigram = TrigramIndex()
+    with engine.connect() as connection:
+        started = time.perf_counter()
+        trigram.build(connection.execute(select(
+            Employee.id, Employee.name, Employee.department, Employee.designation, Employee.date_of_joining
+        )).all())
+        trigram_build_seconds = time.perf_counter() - started
+        
+        results = {"fts_build_s": fts_build_seconds, "trigram_build_s": trigram_build_seconds, "terms": {}}
+        for term in SEARCH_TERMS:
+            results["terms"][term] = {}
+            for name, search in (("like", _like), ("trigram", _trigram), ("fulltext", _fulltext)):
+                timings = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    total = search(connection, term, trigram)
+                    timings.append(time.perf_counter() - started)
+                results["terms"][term][name] = (statistics.median(timings) * 1000, total)
+    engine.dispose()
+    return results
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    results = run(rows, iterations)
+    print(f"{rows} employees: FTS5 build {results['fts_build_s']:.2f} s, trigram build {results['trigram_build_s']:.2f} s")
+    print(f"{'term':<14} {'like ms':>9} {'trigram ms':>11} {'fulltext ms':>12}   matches (like / fulltext)")
+    for term, timings in results["terms"].items():
+        print(
+            f"{term:<14} {timings['like'][0]:9.2f} {timings['trigram'][0]:11.2f} {timings['fulltext'][0]:12.2f}"
+            f"   {timings['like'][1]} / {timings['fulltext'][1]}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Microbenchmark: fuzzy (SymSpell) index build time, memory and query latency.
+
+Names are generated as "<first name> <random surname>" like bench_suggest, with
+one in four surnames drawn from a list of common ones, so the vocabulary
+holds hundreds of thousands of distinct tokens, which is the worst case for
+the deletion dictionary. Queries are misspellings of
+first names, departments and generated surnames (one or two edits), alone and
+combined, and each returns the first page of 20.
+
+Usage:
+    python -m benchmarks.bench_fuzzy [employees] [queries]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.bench_suggest import DEPARTMENTS
+from benchmarks.bench_suggest import generate_rows as generate_random_rows
+from indexes.fuzzy_index import FuzzyIndex
+
+SURNAMES = ["Sharma", "Agarwal", "Patel", "Iyer", "Reddy", "Kumar", "Singh", "Gupta", "Nair", "Mehta"]
+
+FIXED_QUERIES = ["Priyaa", "Agarwall", "Enginering", "Markting", "Vikrma Enginering", "Sneah Sales"]
+
+
+def generate_rows(count: int, seed: int = 7):
+    rng = random.Random(seed + 1)
+    for name, department in generate_random_rows(count, seed):
+        if rng.random() < 0.25:
+            name = f"{name.split(' ')[0]} {rng.choice(SURNAMES)}"
+        yield name, department
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Apply one random edit: deletion, insertion, substitution or transposition."""
+    i = rng.randrange(len(word))
+    edit = rng.randrange(4)
+    if edit == 0 and len(word) > 4:
+        return word[:i] + word[i + 1:]
+    if edit == 1:
+        return word[:i] + rng.choice("aeiounrst") + word[i:]
+    if edit == 2:
+        return word[:i] + rng.choice("aeiounrst") + word[i + 1:]
+    if i < len(word) - 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word + rng.choice("aeiou")
+
+
+def make_queries(count: int, seed: int = 17):
+    rng = random.Random(seed)
+    sample = [name for name, _ in generate_rows(1000, seed=13)]
+    queries = list(FIXED_QUERIES)
+    while len(queries) < count:
+        first, surname = rng.choice(sample).split(" ")
+        shape = rng.randrange(3)
+        if shape == 0:
+            queries.append(misspell(surname, rng))
+        elif shape == 1:
+            queries.append(f"{first} {misspell(surname, rng)}")
+        else:
+            queries.append(misspell(rng.choice(DEPARTMENTS).split(" ")[0], rng))
+    return queries
+
+
+def run(count: int = 1000000, query_count: int = 2000) -> dict:
+    rows = [(i, name, department) for i, (name, department) in enumerate(generate_rows(count), 1)]
+    index = FuzzyIndex()
+    started = time.perf_counter()
+    index.build(rows)
+    build_seconds = time.perf_counter() - started
+    
+    queries = make_queries(query_count)
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, 20, 0)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    
+    examples = {}
+    for query in FIXED_QUERIES:
+        ranked, total = index.search(query, 3, 0)
+        examples[query] = (total, [(index._names[i], distance) for i, distance in ranked])
+    
+    # Measure a second build under tracemalloc, generating the rows inside the
+    # trace so the name strings are counted too
+    del rows, index
+    index = FuzzyIndex()
+    tracemalloc.start()
+    index.build((i, name, department) for i, (name, department) in enumerate(generate_rows(count), 1))
+    memory_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    return {
+        "employees": count,
+        "vocabulary": len(index._postings),
+        "delete_keys": len(index._deletes),
+        "build_s": build_seconds,
+        "memory_mb": memory_bytes / 1e6,
+        "bytes_per_employee": memory_bytes / count,
+        "p50_ms": timings[len(timings) // 2] * 1e3,
+        "p95_ms": timings[int(len(timings) * 0.95)] * 1e3,
+        "p99_ms": timings[int(len(timings) * 0.99)] * 1e3,
+        "max_ms": timings[-1] * 1e3,
+        "examples": examples,
+    }
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    query_count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    result = run(count, query_count)
+    print(f"{result['employees']} employees, {result['vocabulary']} tokens, {result['delete_keys']} delete keys")
+    print(f"  build:   {result['build_s']:.2f} s")
+    print(f"  memory:  {result['memory_mb']:.1f} MB ({result['bytes_per_employee']:.0f} bytes/employee)")
+    print(
+        f"  query:   p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, "
+        f"p99 {result['p99_ms']:.1f} ms, max {result['max_ms']:.1f} ms (first page of 20)"
+    )
+    for query, (total, top) in result["examples"].items():
+        print(f"  {query!r}: {total} matches, top {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: cost of the total count on employee search.
+
+Replays the same mix of search terms and pages against the repository and
+reports DB time and statements per request for
+- count_query: COUNT(*) plus the page query on every request (previous behaviour)
+- cached_count: counts served from the per-term count cache after the first hit
+- no_total: page query only (include_total=false)
+
+Usage:
+    python -m benchmarks.bench_search_count [rows] [iterations]
+"""
+import asyncio
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from benchmarks.common import StatementTimer, create_async_sqlite, create_seeded_sqlite
+from config import settings
+from repositories.async_employee_repository import AsyncEmployeeRepository
+from repositories.count_cache import search_count_cache
+
+SEARCH_TERMS = ["ra", "sh", "en", "Engineering", "Sales", "Priya", "Kumar", "zz"]
+OFFSETS = [0, 50, 100]
+
+
+async def _replay(db: AsyncSession, iterations: int, include_total: bool, invalidate: bool) -> int:
+    repository = AsyncEmployeeRepository(db)
+    requests = 0
+    for _ in range(iterations):
+        for term in SEARCH_TERMS:
+            for offset in OFFSETS:
+                if invalidate:
+                    search_count_cache.invalidate()
+                await repository.search_employees(term, 50, offset, include_total=include_total)
+                requests += 1
+    return requests
+
+
+async def run(rows: int = 20000, iterations: int = 20) -> dict:
+    # Exercise the SQL path; the trigram index answers longer terms without SQL
+    settings.search_index_enabled = False
+    engine = create_async_sqlite(create_seeded_sqlite(rows))
+    timer = StatementTimer(engine)
+    strategies = {
+        "count_query": {"include_total": True, "invalidate": True},
+        "cached_count": {"include_total": True, "invalidate": False},
+        "no_total": {"include_total": False, "invalidate": False},
+    }
+    
+    results = {}
+    for name, options in strategies.items():
+        search_count_cache.invalidate()
+        async with AsyncSession(engine) as db:
+            with timer.measure():
+                requests = await _replay(db, iterations, **options)
+                results[name] = {
+                    "db_ms_per_request": round(timer.seconds * 1000 / requests, 3),
+                    "statements_per_request": round(timer.statements / requests, 2),
+                }
+    await engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    results = asyncio.run(run(rows, iterations))
+    baseline = results["count_query"]["db_ms_per_request"]
+    print(f"{'strategy':<13} {'db ms/req':>10} {'stmts/req':>10} {'vs count':>9}")
+    for name, stats in results.items():
+        ratio = stats["db_ms_per_request"] / baseline if baseline else 0
+        print(f"{name:<13} {stats['db_ms_per_request']:>10.3f} "
+              f"{stats['statements_per_request']:>10.2f} {ratio:>8.2f}x")
@@ -0,0 +1,79 @@
+"""
+Microbenchmark: list response serialization, ORM + Pydantic vs Core rows + orjson.
+
+For page sizes 10, 50 and 100 it measures the time to fetch a page and turn it
+into JSON bytes
+- orm_pydantic: Employee ORM objects validated into EmployeeListResponse
+  (from_attributes, EmailStr re-validation), dumped and encoded with json,
+  mirroring FastAPI's response_model path
+- rows_orjson: EMPLOYEE_COLUMNS Core rows turned into dicts and encoded with
+  orjson, as the list endpoint now does
+
+Usage:
+    python -m benchmarks.bench_serialization [rows] [iterations]
+"""
+import json
+import sys
+import time
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from benchmarks.common import create_seeded_sqlite
+from models import Employee
+from repositories.employee_repository import EMPLOYEE_COLUMNS
+from schemas import EmployeeListResponse
+
+PAGE_SIZES = [10, 50, 100]
+
+
+def orm_pydantic(db: Session, limit: int) -> bytes:
+    employees = db.scalars(
+        select(Employee).order_by(Employee.name, Employee.id).limit(limit)
+    ).all()
+    result = {"employees": employees, "total": 0, "limit": limit, "offset": 0, "next_cursor": None}
+    content = EmployeeListResponse.model_validate(result).model_dump(mode="json")
+    db.expunge_all()
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def rows_orjson(db: Session, limit: int) -> bytes:
+    rows = db.execute(
+        select(*EMPLOYEE_COLUMNS).order_by(Employee.name, Employee.id).limit(limit)
+    ).all()
+    result = {
+        "employees": [row._asdict() for row in rows],
+        "total": 0,
+        "limit": limit,
+        "offset": 0,
+        "next_cursor": None,
+        "facets": None,
+    }
+    return orjson.dumps(result)
+
+
+def run(rows: int = 5000, iterations: int = 300) -> dict:
+    engine = create_seeded_sqlite(rows)
+    results = {}
+    with Session(engine) as db:
+        for limit in PAGE_SIZES:
+            # Both paths must produce the same document
+            assert json.loads(orm_pydantic(db, limit)) == json.loads(rows_orjson(db, limit))
+            results[limit] = {}
+            for name, path in (("orm_pydantic", orm_pydantic), ("rows_orjson", rows_orjson)):
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    path(db, limit)
+                results[limit][name] = (time.perf_counter() - started) * 1000 / iterations
+    return results
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    results = run(rows, iterations)
+    print(f"{'page size':>9} {'orm+pydantic ms':>16} {'rows+orjson ms':>15} {'speedup':>8}")
+    for limit in PAGE_SIZES:
+        old, new = results[limit]["orm_pydantic"], results[limit]["rows_orjson"]
+        print(f"{limit:>9} {old:>16.3f} {new:>15.3f} {old / new:>7.1f}x")
@@ -0,0 +1,193 @@
+"""
+Microbenchmark: one memory-mapped snapshot file shared by worker processes vs
+a snapshot built in every worker.
+
+Runs against a seeded temporary SQLite database. Publishes the snapshot file
+the way snapshot_builder.py does, then starts N worker processes twice:
+- private: each builds its own DirectorySnapshot from the employees table
+- mapped: each maps the published file (MappedSnapshot)
+
+Every worker answers a first search (cold start: time to serve), runs reads
+that touch all columns, and reports its memory from /proc/self/smaps_rollup
+while all workers are alive: private memory added by the snapshot, and PSS
+(shared pages split between the processes mapping them). Finally it compares
+read throughput of the mapped and in-process snapshots.
+
+Usage:
+    python -m benchmarks.bench_shared_snapshot [rows] [workers] [seconds_per_case]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_snapshot import PAGE_SIZE, TERMS, throughput
+from benchmarks.common import create_seeded_sqlite
+from indexes.directory_snapshot import DirectorySnapshot
+from indexes.snapshot_file import MappedSnapshot, write_snapshot_file
+from models import Employee
+from repositories.employee_filters import EmployeeFilters
+from repositories.employee_repository import EMPLOYEE_COLUMNS
+
+SMAPS_ROLLUP = "/proc/self/smaps_rollup"
+
+
+def memory_kib() -> dict:
+    """Rss, Pss and private kilobytes of this process (empty where smaps_rollup is unavailable)."""
+    if not os.path.exists(SMAPS_ROLLUP):
+        return {}
+    fields = {}
+    with open(SMAPS_ROLLUP) as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def load_rows(database_path: str) -> list:
+    from sqlalchemy import create_engine
+    
+    engine = create_engine(f"sqlite:///{database_path}")
+    with sessionmaker(bind=engine)() as db:
+        rows = db.execute(select(Employee.change_seq, *EMPLOYEE_COLUMNS).order_by(Employee.id)).all()
+    engine.dispose()
+    return rows
+
+
+def touch(snapshot, rows: int) -> None:
+    """Reads that visit every column, so mapped pages are faulted in."""
+    for term in TERMS:
+        snapshot.search(term, PAGE_SIZE, 0)
+    snapshot.search("", PAGE_SIZE, 0, facet_fields=("department", "designation", "year"))
+    snapshot.search("", PAGE_SIZE, 0, filters=EmployeeFilters(department="Engineering"))
+    snapshot.search("", PAGE_SIZE, rows // 2)
+    for first in range(1, rows + 1, 10000):
+        snapshot.get_rows(range(first, first + 10000))
+
+
+def worker(mode: str, database_path: str, snapshot_path: str, rows: int, barrier, results) -> None:
+    """One worker process: get a snapshot, serve a first search, touch it, report memory."""
+    baseline = memory_kib()
+    started = time.perf_counter()
+    if mode == "mapped":
+        snapshot = MappedSnapshot(snapshot_path)
+        snapshot.refresh()
+    else:
+        snapshot = DirectorySnapshot()
+        snapshot.build(load_rows(database_path))
+    snapshot.search(TERMS[0], PAGE_SIZE, 0)
+    cold_start = time.perf_counter() - started
+    touch(snapshot, rows)
+    # Measure while every worker holds its snapshot, so shared pages are split N ways
+    barrier.wait()
+    loaded = memory_kib()
+    barrier.wait()
+    results.put({
+        "cold_start": cold_start,
+        "private": loaded.get("private", 0) - baseline.get("private", 0),
+        "pss": loaded.get("pss", 0) - baseline.get("pss", 0),
+        "rss": loaded.get("rss", 0) - baseline.get("rss", 0),
+    })
+
+
+def run_workers(mode: str, workers: int, database_path: str, snapshot_path: str, rows: int) -> dict:
+    # spawn: workers start from a fresh interpreter, like uvicorn workers
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(mode, database_path, snapshot_path, rows, barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return {
+        "cold_start": max(report["cold_start"] for report in reports),
+        "private": sum(report["private"] for report in reports),
+        "pss": sum(report["pss"] for report in reports),
+        "rss": sum(report["rss"] for report in reports),
+    }
+
+
+def run(rows: int = 1000000, workers: int = 4, seconds: float = 2.0) -> dict:
+    directory = tempfile.mkdtemp(prefix="bench_shared_snapshot_")
+    database_path = os.path.join(directory, "employees.db")
+    snapshot_path = os.path.join(directory, "snapshot.bin")
+    create_seeded_sqlite(rows, database_path).dispose()
+    
+    snapshot = DirectorySnapshot()
+    snapshot.build(load_rows(database_path))
+    started = time.perf_counter()
+    file_bytes = write_snapshot_file(snapshot_path, snapshot)
+    write_seconds = time.perf_counter() - started
+    
+    modes = {mode: run_workers(mode, workers, database_path, snapshot_path, rows) for mode in ("private", "mapped")}
+    
+    mapped = MappedSnapshot(snapshot_path)
+    mapped.refresh()
+    rng = random.Random(7)
+    ids = [rng.randint(1, rows) for _ in range(1000)]
+    filters = EmployeeFilters(department="Engineering")
+    cases = [
+        (f"search {term!r}", lambda snapshot, term=term: snapshot.search(term, PAGE_SIZE, 0))
+        for term in TERMS
+    ]
+    cases.append(("department filter", lambda snapshot: snapshot.search("", PAGE_SIZE, 0, filters=filters)))
+    cases.append(("list deep page", lambda snapshot: snapshot.search("", PAGE_SIZE, rows // 2)))
+    cases.append(("get by id (x1000)", lambda snapshot: [snapshot.get_rows([i]) for i in ids]))
+    results = [
+        {
+            "case": name,
+            "memory": throughput(lambda: call(snapshot), seconds),
+            "mapped": throughput(lambda: call(mapped), seconds),
+        }
+        for name, call in cases
+    ]
+    for name in os.listdir(directory):
+        os.remove(os.path.join(directory, name))
+    os.rmdir(directory)
+    return {
+        "rows": rows,
+        "workers": workers,
+        "file_bytes": file_bytes,
+        "write_seconds": write_seconds,
+        "modes": modes,
+        "cases": results,
+    }
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+    result = run(rows, workers, seconds)
+    print(f"{rows} employees, {workers} workers")
+    print(f"  snapshot file {result['file_bytes'] / 2 ** 20:.1f} MiB, written in {result['write_seconds']:.2f} s")
+    for mode, stats in result["modes"].items():
+        print(
+            f"  {mode:<8} cold start {stats['cold_start']:6.2f} s  "
+            f"private {stats['private'] / 1024:7.1f} MiB  PSS {stats['pss'] / 1024:7.1f} MiB  "
+            f"RSS {stats['rss'] / 1024:7.1f} MiB  (all workers)"
+        )
+    for case in result["cases"]:
+        print(
+            f"  {case['case']:<22} in-process {case['memory']:10.1f}/s  mapped {case['mapped']:10.1f}/s  "
+            f"x{case['mapped'] / case['memory']:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
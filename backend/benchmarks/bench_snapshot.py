@@ -0,0 +1,146 @@
+"""
+Microbenchmark: directory snapshot serving vs the SQL path.
+
+Runs against a seeded temporary SQLite database. Builds the columnar
+snapshot from the employees table and reports its memory (measured with
+tracemalloc, and scaled to one million employees) and build time. Then it
+measures throughput for the reads snapshot serving takes over:
+- search: ILIKE page plus COUNT(*) vs the snapshot's substring scan
+- filtered listing: a department filter page plus count
+- list: first page and a deep keyset page of the whole directory
+- get by ID: single-row lookups
+
+Usage:
+    python -m benchmarks.bench_snapshot [rows] [seconds_per_case]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import create_seeded_sqlite
+from indexes.directory_snapshot import DirectorySnapshot
+from models import Employee
+from repositories.employee_filters import EmployeeFilters, apply_filters
+from repositories.employee_repository import EMPLOYEE_COLUMNS, after_keyset, search_filter
+
+TERMS = ("ku", "sharma", "eng", "priya k")
+PAGE_SIZE = 50
+
+
+def sql_page(db, term: str = "", filters: EmployeeFilters = None, after=None, count: bool = True):
+    """The SQL path: one page in (name, id) order, plus the match count."""
+    query = apply_filters(select(*EMPLOYEE_COLUMNS), filters)
+    if term:
+        query = query.where(search_filter(term))
+    total = db.scalar(select(func.count()).select_from(query.subquery())) if count else None
+    if after is not None:
+        query = query.where(after_keyset(after))
+    return db.execute(query.order_by(Employee.name, Employee.id).limit(PAGE_SIZE)).all(), total
+
+
+def throughput(call, seconds: float) -> float:
+    """Calls per second over roughly `seconds`."""
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        call()
+        calls += 1
+    return calls / (time.perf_counter() - started)
+
+
+def build_snapshot(Session) -> dict:
+    """Build once for the time, and once under tracemalloc for the memory it retains."""
+    with Session() as db:
+        rows = db.execute(select(Employee.change_seq, *EMPLOYEE_COLUMNS).order_by(Employee.id)).all()
+    started = time.perf_counter()
+    DirectorySnapshot().build(rows)
+    seconds = time.perf_counter() - started
+    
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    snapshot = DirectorySnapshot()
+    snapshot.build(rows)
+    del rows
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return {"snapshot": snapshot, "build_seconds": seconds, "retained": retained}
+
+
+def run(rows: int = 1000000, seconds: float = 2.0) -> dict:
+    engine = create_seeded_sqlite(rows)
+    Session = sessionmaker(bind=engine)
+    built = build_snapshot(Session)
+    snapshot = built["snapshot"]
+    rng = random.Random(7)
+    ids = [rng.randint(1, rows) for _ in range(1000)]
+    deep = snapshot.search("", 1, rows // 2)[0][0]
+    deep_after = (deep.name, deep.id)
+    
+    cases = []
+    with Session() as db:
+        for term in TERMS:
+            cases.append((
+                f"search {term!r}",
+                lambda term=term: sql_page(db, term),
+                lambda term=term: snapshot.search(term, PAGE_SIZE, 0)
+            ))
+        filters = EmployeeFilters(department="Engineering")
+        cases.append((
+            "department filter",
+            lambda: sql_page(db, filters=filters),
+            lambda: snapshot.search("", PAGE_SIZE, 0, filters=filters)
+        ))
+        cases.append(("list first page", lambda: sql_page(db), lambda: snapshot.search("", PAGE_SIZE, 0)))
+        cases.append((
+            "list deep keyset page",
+            lambda: sql_page(db, after=deep_after, count=False),
+            lambda: snapshot.search("", PAGE_SIZE, 0, deep_after)
+        ))
+        by_id = select(*EMPLOYEE_COLUMNS).where(Employee.id == 0).compile().statement
+        cases.append((
+            "get by id (x1000)",
+            lambda: [db.execute(by_id.where(Employee.id == i)).first() for i in ids],
+            lambda: [snapshot.get_rows([i]) for i in ids]
+        ))
+        results = [
+            {"case": name, "sql": throughput(sql, seconds), "snapshot": throughput(memory, seconds)}
+            for name, sql, memory in cases
+        ]
+    engine.dispose()
+    return {
+        "rows": rows,
+        "build_seconds": built["build_seconds"],
+        "retained": built["retained"],
+        "estimated": snapshot.memory_bytes(),
+        "cases": results,
+    }
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    result = run(rows, seconds)
+    per_million = 1000000 / rows
+    print(f"{rows} employees")
+    print(
+        f"  snapshot build {result['build_seconds']:.2f} s, "
+        f"{result['retained'] / 2 ** 20:.1f} MiB retained ({result['retained'] / rows:.0f} B/employee, "
+        f"~{result['retained'] * per_million / 2 ** 20:.0f} MiB per million; "
+        f"column estimate {result['estimated'] * per_million / 2 ** 20:.0f} MiB per million)"
+    )
+    for case in result["cases"]:
+        print(
+            f"  {case['case']:<22} SQL {case['sql']:9.1f}/s  snapshot {case['snapshot']:10.1f}/s  "
+            f"x{case['snapshot'] / case['sql']:.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark: worker cold start, from interpreter launch to the first responses.
+
+For each STARTUP_MODE a fresh Python process is started several times against
+the same seeded SQLite file, and it records
+- import: `import main` (FastAPI, SQLAlchemy, routers, engines)
+- startup: the startup event (full: create_all, seed check, autocomplete
+  index build; lean: nothing unless STARTUP_POOL_WARMUP is set)
+- first_list: the first GET /api/employees?limit=20
+- first_search: the first substring search (builds the trigram index lazily)
+- ready: launch to first list response, what a load balancer waits for
+
+Medians over the runs are reported in milliseconds. Requests go through an
+in-process ASGI client, so no socket or server start-up time is included.
+
+Usage:
+    python -m benchmarks.bench_startup [rows] [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ["full", "lean"]
+PHASES = ["import", "startup", "first_list", "first_search", "ready"]
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def child() -> None:
+    """Run one cold start in this (fresh) process and print its timings as JSON."""
+    launched = float(os.environ["BENCH_LAUNCHED_AT"])
+    started = time.perf_counter()
+    import main
+    from fastapi.testclient import TestClient
+    imported = time.perf_counter()
+    
+    timings = {"import": imported - started}
+    with TestClient(main.app) as client:
+        timings["startup"] = time.perf_counter() - imported
+        mark = time.perf_counter()
+        client.get("/api/employees", params={"limit": 20}).raise_for_status()
+        timings["first_list"] = time.perf_counter() - mark
+        timings["ready"] = time.time() - launched
+        mark = time.perf_counter()
+        client.get("/api/employees", params={"search": "kumar", "limit": 20}).raise_for_status()
+        timings["first_search"] = time.perf_counter() - mark
+    print(json.dumps(timings))
+
+
+def cold_start(mode: str, database_path: str) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database_path}",
+        STARTUP_MODE=mode,
+        BENCH_LAUNCHED_AT=repr(time.time()),
+    )
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(rows: int = 100000, runs: int = 5) -> dict:
+    from benchmarks.common import create_seeded_sqlite
+    
+    workdir = tempfile.mkdtemp(prefix="employee_startup_")
+    database_path = os.path.join(workdir, "employees.db")
+    create_seeded_sqlite(rows, database_path).dispose()
+    
+    results = {}
+    for mode in MODES:
+        samples = [cold_start(mode, database_path) for _ in range(runs)]
+        results[mode] = {phase: statistics.median(sample[phase] for sample in samples) * 1000 for phase in PHASES}
+    return results
+
+
+def main() -> None:
+    if "--child" in sys.argv:
+        child()
+        return
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    results = run(rows, runs)
+    print(f"Cold start with {rows} employees (median of {runs} runs, ms)")
+    print(f"{'mode':<6}" + "".join(f"{phase:>14}" for phase in PHASES))
+    for mode, timings in results.items():
+        print(f"{mode:<6}" + "".join(f"{timings[phase]:>14.0f}" for phase in PHASES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Microbenchmark: autocomplete prefix index build time, lookup latency and memory.
+
+Names are generated as "<first name> <random surname>" so nearly every name is
+distinct, which is the worst case for memory (seed_data repeats a few hundred
+names). Memory is measured with tracemalloc around a build and reported per
+employee (the name strings themselves are counted, as they would be when read
+from the database); lookups use 1-4 character prefixes of real names and departments.
+
+Usage:
+    python -m benchmarks.bench_suggest [employees] [lookups]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from indexes.prefix_index import PrefixIndex
+
+FIRST_NAMES = ["Rahul", "Priya", "Amit", "Sneha", "Vikram", "Anjali", "Rohan", "Neha",
+               "Arjun", "Pooja", "Karan", "Divya", "Sanjay", "Riya", "Aditya", "Kavya"]
+SYLLABLES = ["ka", "ra", "sh", "ma", "ni", "pa", "te", "lo", "vi", "an", "de", "su", "ro", "ya", "mi", "ja"]
+DEPARTMENTS = ["Engineering", "Product", "Design", "Marketing", "Sales", "HR",
+               "Finance", "Operations", "Customer Success", "Data Science"]
+
+
+def generate_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        surname = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 5))).capitalize()
+        yield f"{rng.choice(FIRST_NAMES)} {surname}", rng.choice(DEPARTMENTS)
+
+
+def run(count: int = 1000000, lookups: int = 20000) -> dict:
+    rows = list(generate_rows(count))
+    index = PrefixIndex()
+    started = time.perf_counter()
+    index.build(rows)
+    build_seconds = time.perf_counter() - started
+    
+    # Measure a second build under tracemalloc (which slows it down considerably),
+    # generating the rows inside the trace so the name strings are counted too
+    del rows
+    index = PrefixIndex()
+    tracemalloc.start()
+    index.build(generate_rows(count))
+    memory_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    rng = random.Random(11)
+    sample = [name for name, _ in generate_rows(1000, seed=13)] + DEPARTMENTS
+    prefixes = [rng.choice(sample).lower()[:rng.randint(1, 4)] for _ in range(lookups)]
+    started = time.perf_counter()
+    for prefix in prefixes:
+        index.suggest(prefix, 10)
+    lookup_seconds = (time.perf_counter() - started) / lookups
+    
+    return {
+        "employees": count,
+        "entries": len(index),
+        "build_s": build_seconds,
+        "memory_mb": memory_bytes / 1e6,
+        "bytes_per_employee": memory_bytes / count,
+        "lookup_us": lookup_seconds * 1e6,
+    }
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    result = run(count, lookups)
+    print(f"{result['employees']} employees, {result['entries']} index entries")
+    print(f"  build:   {result['build_s']:.2f} s")
+    print(f"  memory:  {result['memory_mb']:.1f} MB ({result['bytes_per_employee']:.0f} bytes/employee)")
+    print(f"  lookup:  {result['lookup_us']:.1f} us (top 10)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Shared helpers for benchmark scripts."""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from database import Base
+from models import Employee
+from repositories.change_feed import stamp_change_seqs
+from seed_data import generate_sample_employees
+
+
+def create_seeded_sqlite(count: int, path: str = None) -> Engine:
+    """
+    Create a SQLite database file seeded with `count` sample employees.
+    
+    Args:
+        count: Number of employees to generate
+        path: Database file path (a temporary file is used if omitted)
+    
+    Returns:
+        Engine bound to the seeded database
+    """
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".db", prefix="employee_bench_")
+        os.close(fd)
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    rows = generate_sample_employees(count)
+    with engine.begin() as connection:
+        for start in range(0, len(rows), 5000):
+            connection.execute(insert(Employee), stamp_change_seqs(connection, rows[start:start + 5000]))
+    return engine
+
+
+def create_async_sqlite(engine: Engine) -> AsyncEngine:
+    """Async (aiosqlite) engine on the SQLite file of `engine`, as the API reads it."""
+    return create_async_engine(engine.url.set(drivername="sqlite+aiosqlite"))
+
+
+class StatementTimer:
+    """Accumulates the number of statements and time spent inside the DB driver."""
+    
+    def __init__(self, engine: Engine):
+        # An AsyncEngine emits its statements through the sync engine it wraps
+        engine = getattr(engine, "sync_engine", engine)
+        self.statements = 0
+        self.seconds = 0.0
+        self._started: List[float] = []
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+    
+    def _before(self, *args):
+        self._started.append(time.perf_counter())
+    
+    def _after(self, *args):
+        self.seconds += time.perf_counter() - self._started.pop()
+        self.statements += 1
+    
+    @contextmanager
+    def measure(self) -> Iterator["StatementTimer"]:
+        """Reset counters and measure the enclosed block."""
+        self.statements = 0
+        self.seconds = 0.0
+        yield self
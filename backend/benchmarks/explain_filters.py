@@ -0,0 +1,124 @@
+"""
+EXPLAIN check: every structured filter combination must be answered through an index.
+
+Builds the statements the list endpoint issues for each combination of the
+department, designation and date_of_joining filters (alone and together, with
+and without a short search term, which bypasses the trigram index) - the page
+query, its keyset continuation and the COUNT(*) - and runs EXPLAIN on them:
+- SQLite (default): a seeded temporary database after ANALYZE
+- MySQL (BENCH_DATABASE_URL=mysql+pymysql://...): an already seeded database
+  (see `python -m benchmarks.load_test --mysql-url`)
+
+A plan passes when every read of employees goes through an index: either a
+filter index narrows the rows, or, for a filter matching a large share of the
+table, idx_name is walked in page order and LIMIT stops the walk early. A
+full table scan fails. The facet aggregates are built first, as they are in
+a serving worker, so the driver printed next to each plan is the one
+repositories.employee_filters picks in production. MySQL receives it as a
+USE INDEX hint; SQLite has no hint syntax in SQLAlchemy and plans on its own.
+Exits with status 1 if any plan scans the table.
+
+Usage:
+    python -m benchmarks.explain_filters [rows]
+"""
+import os
+import sys
+from datetime import date
+from itertools import combinations
+
+from sqlalchemy import create_engine, func, select, text
+
+from benchmarks.common import create_seeded_sqlite
+from indexes.facet_counts import facet_counts
+from models import Employee
+from repositories.employee_filters import EmployeeFilters, apply_filters, plan_filters
+from repositories.employee_repository import EMPLOYEE_COLUMNS, after_keyset, facet_group_query, search_filter
+
+FILTER_VALUES = {
+    "department": {"department": "Engineering"},
+    "designation": {"designation": "Tech Lead"},
+    "joined_from": {"joined_from": date(2024, 1, 1)},
+    "joined_to": {"joined_to": date(2022, 6, 30)},
+    "joined_range": {"joined_from": date(2023, 3, 1), "joined_to": date(2023, 5, 31)},
+}
+
+
+def filter_combinations():
+    """Yield (label, EmployeeFilters) for every combination of filters, at most one date filter."""
+    names = list(FILTER_VALUES)
+    for size in range(1, 4):
+        for combination in combinations(names, size):
+            if sum(name.startswith("joined") for name in combination) > 1:
+                continue
+            values = {}
+            for name in combination:
+                values.update(FILTER_VALUES[name])
+            yield "+".join(combination), EmployeeFilters(**values)
+
+
+def statements(filters: EmployeeFilters, term: str):
+    """The page, next-page and count statements the repository issues for these filters."""
+    query = apply_filters(select(*EMPLOYEE_COLUMNS), filters)
+    if term:
+        query = query.where(search_filter(term))
+    ordered = query.order_by(Employee.name, Employee.id).limit(51)
+    return {
+        "page": ordered,
+        "next": ordered.where(after_keyset(("M", 0))),
+        "count": select(func.count()).select_from(query.subquery()),
+    }
+
+
+def explain(connection, statement):
+    """Return (plan lines, every read of employees goes through an index)."""
+    compiled = statement.compile(dialect=connection.dialect)
+    params = tuple(
+        value.isoformat() if isinstance(value, date) and connection.dialect.name == "sqlite" else value
+        for value in (compiled.params[name] for name in compiled.positiontup)
+    )
+    if connection.dialect.name == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+        lines = [row[-1] for row in rows]
+        reads = [line for line in lines if line.startswith(("SCAN employees", "SEARCH employees"))]
+        return lines, bool(reads) and all(" INDEX " in line for line in reads)
+    rows = connection.exec_driver_sql(f"EXPLAIN {compiled}", params).mappings().all()
+    lines = [f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']}" for row in rows]
+    reads = [row for row in rows if row["table"] == Employee.__tablename__]
+    return lines, bool(reads) and all(row["type"] != "ALL" and row["key"] for row in reads)
+
+
+def run(rows: int = 20000) -> int:
+    database_url = os.environ.get("BENCH_DATABASE_URL")
+    if database_url:
+        engine = create_engine(database_url)
+    else:
+        engine = create_seeded_sqlite(rows)
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+    
+    failures = 0
+    with engine.connect() as connection:
+        facet_counts.build(connection.execute(facet_group_query()).all())
+        for label, filters in filter_combinations():
+            driver = plan_filters(filters).index or "(optimizer's choice)"
+            for term in ("", "ra"):
+                for kind, statement in statements(filters, term).items():
+                    lines, uses_index = explain(connection, statement)
+                    failures += not uses_index
+                    status = "ok  " if uses_index else "SCAN"
+                    search = f" search={term}" if term else ""
+                    print(f"{status} {label}{search} [{kind}] driver={driver}")
+                    for line in lines:
+                        print(f"       {line}")
+    engine.dispose()
+    print(f"{failures} statement(s) without an index" if failures else "All filter combinations use an index")
+    return failures
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sys.exit(1 if run(rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
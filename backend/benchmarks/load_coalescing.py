@@ -0,0 +1,118 @@
+"""
+Load test: identical concurrent searches with and without request coalescing.
+
+Simulates the "all-hands email" burst: waves of D clients search the same term
+at the same moment, for D = 1, 10, 50, 200. Every wave uses a new term so the
+result cache (disabled anyway) cannot help, and the trigram index is off so
+each execution is the ILIKE page query plus its COUNT(*).
+
+For each mode (SEARCH_COALESCING_ENABLED false / true) a fresh process replays
+the waves in-process through httpx's ASGI transport against a seeded SQLite
+file and reports request throughput, SQL statements per second and per wave,
+and the coalescing counters. With coalescing on, statements per wave stay at
+one execution's worth however many duplicates arrive, so DB load stays flat
+while request throughput grows.
+
+Usage:
+    python -m benchmarks.load_coalescing [rows] [waves]
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DUPLICATES = [1, 10, 50, 200]
+SEARCH_TERMS = ["ra", "sh", "an", "ku", "pr", "ne", "ar", "pa", "me", "ja", "ri", "de"]
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def replay(waves: int) -> dict:
+    """Replay the waves against the in-process app (runs inside the worker process)."""
+    import httpx
+    
+    from benchmarks.common import StatementTimer
+    from database import async_engine
+    from main import app
+    from services.single_flight import search_flights
+    
+    timer = StatementTimer(async_engine.sync_engine)
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get("/api/employees", params={"limit": 1})
+        for duplicates in DUPLICATES:
+            executions, coalesced = search_flights.executions, search_flights.coalesced
+            with timer.measure():
+                started = time.perf_counter()
+                for wave in range(waves):
+                    # Vary limit too, so every wave is a distinct search
+                    params = {"search": SEARCH_TERMS[wave % len(SEARCH_TERMS)], "limit": 20 + wave}
+                    responses = await asyncio.gather(
+                        *(client.get("/api/employees", params=params) for _ in range(duplicates))
+                    )
+                    for response in responses:
+                        response.raise_for_status()
+                elapsed = time.perf_counter() - started
+                requests = waves * duplicates
+                results[duplicates] = {
+                    "requests_per_s": requests / elapsed,
+                    "statements_per_s": timer.statements / elapsed,
+                    "statements_per_wave": timer.statements / waves,
+                    "executions": search_flights.executions - executions,
+                    "coalesced": search_flights.coalesced - coalesced,
+                }
+    return results
+
+
+def run_mode(coalescing: bool, database_path: str, waves: int) -> dict:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database_path}",
+        STARTUP_MODE="lean",
+        SEARCH_CACHE_BACKEND="none",
+        SEARCH_INDEX_ENABLED="false",
+        SEARCH_COALESCING_ENABLED="true" if coalescing else "false",
+        METRICS_ENABLED="false",
+    )
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.load_coalescing", "--worker", str(waves)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return {int(duplicates): result for duplicates, result in json.loads(output.strip().splitlines()[-1]).items()}
+
+
+def run(rows: int = 100000, waves: int = 20) -> dict:
+    from benchmarks.common import create_seeded_sqlite
+    
+    database_path = os.path.join(tempfile.mkdtemp(prefix="employee_coalescing_"), "employees.db")
+    create_seeded_sqlite(rows, database_path).dispose()
+    return {"off": run_mode(False, database_path, waves), "on": run_mode(True, database_path, waves)}
+
+
+def main() -> None:
+    if "--worker" in sys.argv:
+        import logging
+        
+        logging.disable(logging.WARNING)
+        waves = int(sys.argv[sys.argv.index("--worker") + 1])
+        print(json.dumps(asyncio.run(replay(waves))))
+        return
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    waves = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    results = run(rows, waves)
+    print(f"{rows} employees, {waves} waves of D identical searches")
+    print(f"{'D':>4} | {'coalescing off: req/s':>22} {'SQL/s':>8} {'SQL/wave':>9} | "
+          f"{'coalescing on: req/s':>21} {'SQL/s':>8} {'SQL/wave':>9} {'coalesced':>10}")
+    for duplicates in DUPLICATES:
+        off, on = results["off"][duplicates], results["on"][duplicates]
+        print(
+            f"{duplicates:>4} | {off['requests_per_s']:>22.1f} {off['statements_per_s']:>8.1f} "
+            f"{off['statements_per_wave']:>9.1f} | {on['requests_per_s']:>21.1f} "
+            f"{on['statements_per_s']:>8.1f} {on['statements_per_wave']:>9.1f} {on['coalesced']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,212 @@
-from sqlalchemy import create_engine
+import asyncio
+import threading
+from contextvars import ContextVar
+from fastapi import Request
+from sqlalchemy import create_engine, event, text, Delete, Insert, Update
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from config import settings
+from metrics import install_engine_hooks, TimedQueuePool, TimedAsyncAdaptedQueuePool
 
-# Create database engine with connection pooling
-# pool_pre_ping=True ensures connections are valid before use
-# pool_size and max_overflow control connection pool size
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,        # Number of connections to maintain
-    max_overflow=20,     # Maximum additional connections
-    echo=False           # Set to True for SQL query logging
+
+def _create_sync_engine(url: str):
+    # pool_pre_ping=True ensures connections are valid before use
+    # pool_size and max_overflow control connection pool size
+    engine = create_engine(
+        url,
+        poolclass=TimedQueuePool,  # Records pool checkout waits for /metrics
+        pool_pre_ping=True,  # Verify connections before using
+        pool_size=10,        # Number of connections to maintain
+        max_overflow=20,     # Maximum additional connections
+        echo=False           # Set to True for SQL query logging
+    )
+    # Per-request statement counts and SQL time for /metrics
+    install_engine_hooks(engine)
+    return engine
+
+
+def _create_async_engine(url: str):
+    # aiosqlite manages its own connections (NullPool), so pool sizing only
+    # applies to server databases
+    pool_options = (
+        {} if url.startswith("sqlite")
+        else {"poolclass": TimedAsyncAdaptedQueuePool, "pool_size": 10, "max_overflow": 20}
+    )
+    engine = create_async_engine(url, pool_pre_ping=True, echo=False, **pool_options)
+    install_engine_hooks(engine.sync_engine)
+    return engine
+
+
+class ReplicaSet:
+    """
+    Read replicas of the primary database, picked per session.
+    
+    "round_robin" cycles through the replicas; "least_connections" picks the
+    replica with the fewest connections currently checked out of its pool.
+    """
+    
+    def __init__(self, engines, strategy: str = "round_robin"):
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown replica strategy: {strategy}")
+        self.engines = list(engines)
+        self.strategy = strategy
+        self._next = 0
+        self._in_use = {id(engine): 0 for engine in self.engines}
+        self._lock = threading.Lock()
+        for engine in self.engines:
+            event.listen(engine, "checkout", self._make_counter(engine, 1))
+            event.listen(engine, "checkin", self._make_counter(engine, -1))
+    
+    def _make_counter(self, engine, delta: int):
+        key = id(engine)
+        
+        def count(*args):
+            with self._lock:
+                self._in_use[key] += delta
+        return count
+    
+    def choose(self):
+        """Return the replica engine for a new session, or None if there are no replicas."""
+        if not self.engines:
+            return None
+        with self._lock:
+            if self.strategy == "least_connections":
+                return min(self.engines, key=lambda engine: self._in_use[id(engine)])
+            engine = self.engines[self._next % len(self.engines)]
+            self._next += 1
+            return engine
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to a replica and writes to the primary.
+    
+    A session stays on the primary once it has written (flush or INSERT /
+    UPDATE / DELETE), so a request always reads its own writes. Sessions can
+    also be pinned to the primary up front with `session.info["use_primary"] = True`.
+    """
+    
+    primary = None
+    replicas = ReplicaSet([])
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["use_primary"] = True
+        if self.info.get("use_primary"):
+            return self.primary
+        if "replica" not in self.info:
+            self.info["replica"] = self.choose_replica()
+        return self.info["replica"]
+    
+    def choose_replica(self):
+        """Engine for this session's reads: the next replica, or the primary without replicas."""
+        return self.replicas.choose() or self.primary
+
+
+def _replica_urls():
+    return [url.strip() for url in settings.replica_database_urls.split(",") if url.strip()]
+
+
+# Primary engine: all writes, and every read when no replicas are configured
+engine = _create_sync_engine(settings.database_url)
+RoutingSession.primary = engine
+RoutingSession.replicas = ReplicaSet(
+    [_create_sync_engine(url) for url in _replica_urls()], settings.replica_strategy
 )
 
 # Session factory for database operations
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
+
+# Asyncio engine used by the API routes (aiomysql for MySQL, aiosqlite for SQLite)
+# so database I/O never blocks the event loop
+async_engine = _create_async_engine(settings.async_database_url_resolved)
+
+
+# Read engine of the current request, once pinned with pin_request_reads
+_request_read_bind: ContextVar = ContextVar("request_read_bind", default=None)
+
+
+class AsyncRoutingSession(RoutingSession):
+    """
+    RoutingSession over the async engines (binds are their sync facades).
+    
+    Sessions opened while handling a request whose reads are pinned read
+    from the pinned engine, so every session of the request sees the same
+    replica as the data version its HTTP validators came from.
+    """
+    
+    primary = async_engine.sync_engine
+    replicas = ReplicaSet(
+        [_create_async_engine(settings.to_async_url(url)).sync_engine for url in _replica_urls()],
+        settings.replica_strategy
+    )
+    
+    def choose_replica(self):
+        return _request_read_bind.get() or super().choose_replica()
+
+
+def pin_request_reads(db: AsyncSession):
+    """
+    Send the remaining reads of the current request to the engine `db` has read from.
+    
+    Returns:
+        Token for unpin_request_reads
+    """
+    return _request_read_bind.set(db.sync_session.info.get("replica"))
+
+
+def unpin_request_reads(token) -> None:
+    """Undo pin_request_reads."""
+    _request_read_bind.reset(token)
+
+
+# Async session factory; objects stay usable after commit for response serialization
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    sync_session_class=AsyncRoutingSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+async def warm_up_pool(connections: int) -> int:
+    """
+    Open pooled connections to the primary ahead of the first requests.
+    
+    The connections are opened concurrently, checked with SELECT 1 and returned
+    to the pool, so early requests skip the connect and TLS handshake. Nothing
+    is kept for SQLite, which does not pool connections.
+    
+    Args:
+        connections: Number of connections to open (capped at the pool size)
+        
+    Returns:
+        Number of connections opened
+    """
+    if connections <= 0 or settings.async_database_url_resolved.startswith("sqlite"):
+        return 0
+    connections = min(connections, async_engine.pool.size())
+    
+    async def open_and_ping(connection):
+        await connection.start()
+        await connection.execute(text("SELECT 1"))
+    
+    # Hold every connection until all are open, or the pool would hand the
+    # same one out again
+    opened = [async_engine.connect() for _ in range(connections)]
+    try:
+        await asyncio.gather(*(open_and_ping(connection) for connection in opened))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in opened), return_exceptions=True)
+    return connections
+
 
 # Base class for ORM models
 Base = declarative_base()
 
+READ_ONLY_METHODS = ("GET", "HEAD", "OPTIONS")
+
 
 def get_db():
     """
@@ -36,3 +223,32 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    """
+    Dependency function to get an async database session.
+    
+    Sessions for GET requests read from a replica; any other method is pinned
+    to the primary so its reads see the rows it is about to write.
+    
+    Usage in FastAPI:
+        @app.get("/endpoint")
+        async def endpoint(db: AsyncSession = Depends(get_async_db)):
+            # Use await db.execute(...) here
+    """
+    async with AsyncSessionLocal() as db:
+        if request.method not in READ_ONLY_METHODS:
+            db.sync_session.info["use_primary"] = True
+        yield db
+
+
+async def get_async_read_db():
+    """
+    Dependency function to get an async session for a read-only endpoint.
+    
+    For routes that use POST only to carry a large request body (batch-get):
+    like GET requests, their sessions read from a replica.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
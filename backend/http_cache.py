@@ -0,0 +1,128 @@
+"""
+Conditional GET for the employee API.
+
+Every representation under the configured path prefix is derived from the
+directory as a whole, so the directory data version (the change sequence
+counter in the database, see repositories.data_version) doubles as its
+validator:
+- responses carry `ETag: W/"<version>"`, `Last-Modified` and `Cache-Control`
+- a request whose If-None-Match (or, without it, If-Modified-Since) still
+  matches the current version gets a 304 before routing, after a single
+  primary key lookup
+
+Last-Modified is the time of the last write, in whole seconds, so two writes
+in one second share it. It is therefore only sent (and If-Modified-Since only
+answered with a 304) once that second is over; until then the ETag, which
+changes with every write, is the only validator.
+
+The version is read before the request is handled, from the database the
+request then reads from: the request's reads are pinned to that replica (or
+the primary), so the body is at least as new as its validator. If a write
+lands while a response is being built, the response carries the older
+validator and the next revalidation simply returns 200 again. Since the
+version lives in the database, validators agree across workers and hosts.
+"""
+import logging
+import time
+from email.utils import formatdate, parsedate_to_datetime
+
+from config import settings
+from database import AsyncSessionLocal, pin_request_reads, unpin_request_reads
+from repositories.data_version import data_version
+
+logger = logging.getLogger(__name__)
+
+
+def cache_control_header() -> str:
+    """Cache-Control value for API responses, from the http_cache_* settings."""
+    value = f"public, max-age={settings.http_cache_max_age_seconds}"
+    if settings.http_cache_stale_while_revalidate_seconds:
+        value += f", stale-while-revalidate={settings.http_cache_stale_while_revalidate_seconds}"
+    return value
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag."""
+    opaque = etag[2:]
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _settled(last_modified: int) -> bool:
+    """Whether the second of the last write is over, so no later write can share its Last-Modified."""
+    return last_modified < int(time.time())
+
+
+def _not_modified_since(if_modified_since: str, last_modified: int) -> bool:
+    if not _settled(last_modified):
+        return False
+    try:
+        return last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware adding validators to GET responses and answering 304s."""
+    
+    def __init__(self, app, path_prefix: str = "/api/employees"):
+        self.app = app
+        self.path_prefix = path_prefix
+    
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.path_prefix)
+        ):
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            async with AsyncSessionLocal() as db:
+                version, last_modified = await data_version.read(db)
+                read_token = pin_request_reads(db)
+        except Exception as e:
+            # Serve without validators; the route reports database errors itself
+            logger.error(f"Could not read the data version: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+        version_token = data_version.set_request_version((version, last_modified))
+        try:
+            await self._respond(scope, receive, send, version, last_modified)
+        finally:
+            data_version.reset_request_version(version_token)
+            unpin_request_reads(read_token)
+    
+    async def _respond(self, scope, receive, send, version: int, last_modified: int):
+        validators = [
+            (b"etag", f'W/"{version}"'.encode("latin-1")),
+            (b"cache-control", cache_control_header().encode("latin-1")),
+        ]
+        if _settled(last_modified):
+            validators.append((b"last-modified", formatdate(last_modified, usegmt=True).encode("latin-1")))
+        
+        headers = dict(scope["headers"])
+        if_none_match = headers.get(b"if-none-match")
+        if_modified_since = headers.get(b"if-modified-since")
+        if if_none_match is not None:
+            not_modified = _etag_matches(if_none_match.decode("latin-1"), f'W/"{version}"')
+        elif if_modified_since is not None:
+            not_modified = _not_modified_since(if_modified_since.decode("latin-1"), last_modified)
+        else:
+            not_modified = False
+        
+        if not_modified:
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        async def send_with_validators(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message["headers"] = list(message.get("headers", [])) + validators
+            await send(message)
+        
+        await self.app(scope, receive, send_with_validators)
@@ -0,0 +1,253 @@
+"""
+Streaming employee importer.
+
+Loads employees from a CSV or NDJSON file in constant memory:
+- rows are read lazily and grouped into batches
+- each batch is validated against schemas.EmployeeCreate in a process pool
+  (email validation is CPU heavy), with a bounded number of batches in flight
+- valid rows are bulk-inserted batch by batch in file order; rows whose email
+  already exists are skipped and counted as rejected
+- after every committed batch a checkpoint records how many rows are done, so
+  an interrupted import can continue with --resume
+
+It can also write synthetic datasets of any size using the seed_data generator.
+
+Usage:
+    python import_data.py employees.csv
+    python import_data.py employees.ndjson --batch-size 2000 --workers 4 --resume
+    python import_data.py --generate 1000000 --output employees.ndjson
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FIELDS = ["name", "email", "department", "designation", "date_of_joining"]
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """Return "csv" or "ndjson" from an explicit format or the file extension."""
+    if fmt:
+        return fmt
+    return "ndjson" if path.endswith((".ndjson", ".jsonl", ".json")) else "csv"
+
+
+def read_rows(path: str, fmt: str, skip: int = 0) -> Iterator[dict]:
+    """Stream raw rows from a CSV (with header) or NDJSON file, skipping the first `skip`."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        yield from islice(rows, skip, None)
+
+
+def read_batches(rows: Iterator[dict], batch_size: int) -> Iterator[List[dict]]:
+    """Group a row stream into lists of at most batch_size rows."""
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def validate_batch(rows: List[dict]) -> Tuple[List[dict], List[str]]:
+    """
+    Validate raw rows against EmployeeCreate (runs in a worker process).
+    
+    Returns:
+        Tuple of (valid employee dicts, error messages for rejected rows)
+    """
+    from schemas import EmployeeCreate
+    
+    valid = []
+    errors = []
+    for row in rows:
+        try:
+            employee = EmployeeCreate(**{field: row.get(field) for field in FIELDS})
+            valid.append(employee.model_dump())
+        except ValidationError as e:
+            errors.append(f"{row.get('email')}: {e.errors()[0]['msg']}")
+    return valid, errors
+
+
+def load_checkpoint(path: str, source: str) -> int:
+    """Return the number of rows already imported from `source`, or 0."""
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("source") != os.path.abspath(source):
+        logger.warning("Checkpoint belongs to a different file; starting from the beginning")
+        return 0
+    return checkpoint["rows_done"]
+
+
+def save_checkpoint(path: str, source: str, rows_done: int) -> None:
+    """Atomically record progress so a crash never leaves a partial checkpoint."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"source": os.path.abspath(source), "rows_done": rows_done}, f)
+    os.replace(tmp_path, path)
+
+
+def insert_batch(repository, employees: List[dict], batch_size: int) -> int:
+    """Insert validated rows, skipping emails that already exist or repeat. Returns rows inserted."""
+    existing = repository.get_existing_emails([e["email"] for e in employees])
+    to_insert = []
+    for employee in employees:
+        email = employee["email"].lower()
+        if email not in existing:
+            existing.add(email)
+            to_insert.append(employee)
+    repository.bulk_create_employees(to_insert, batch_size)
+    return len(to_insert)
+
+
+def import_file(
+    path: str,
+    fmt: Optional[str] = None,
+    batch_size: int = 1000,
+    workers: Optional[int] = None,
+    checkpoint_path: Optional[str] = None,
+    resume: bool = False,
+    progress_interval: float = 5.0
+) -> dict:
+    """
+    Import employees from a CSV or NDJSON file.
+    
+    Args:
+        path: Source file
+        fmt: "csv" or "ndjson" (detected from the extension if omitted)
+        batch_size: Rows per validation task and per insert transaction
+        workers: Validation processes (defaults to the CPU count)
+        checkpoint_path: Checkpoint file (defaults to `<path>.checkpoint`)
+        resume: Continue after the rows recorded in the checkpoint
+        progress_interval: Seconds between progress reports
+    
+    Returns:
+        Dict with rows read, inserted and rejected
+    """
+    from database import SessionLocal
+    from repositories.employee_repository import EmployeeRepository
+    
+    fmt = detect_format(path, fmt)
+    checkpoint_path = checkpoint_path or f"{path}.checkpoint"
+    rows_done = load_checkpoint(checkpoint_path, path) if resume else 0
+    if rows_done:
+        logger.info(f"Resuming after {rows_done} rows")
+    
+    stats = {"read": 0, "inserted": 0, "rejected": 0}
+    started = last_report = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    batches = read_batches(read_rows(path, fmt, skip=rows_done), batch_size)
+    db = SessionLocal()
+    # Duplicate checks must see rows this import has just written
+    db.info["use_primary"] = True
+    
+    try:
+        repository = EmployeeRepository(db)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded window of batches in flight so memory stays flat
+            in_flight = deque()
+            for batch in islice(batches, workers * 2):
+                in_flight.append((len(batch), pool.submit(validate_batch, batch)))
+            
+            while in_flight:
+                size, future = in_flight.popleft()
+                next_batch = next(batches, None)
+                if next_batch is not None:
+                    in_flight.append((len(next_batch), pool.submit(validate_batch, next_batch)))
+                
+                valid, errors = future.result()
+                inserted = insert_batch(repository, valid, batch_size)
+                rows_done += size
+                save_checkpoint(checkpoint_path, path, rows_done)
+                
+                stats["read"] += size
+                stats["inserted"] += inserted
+                stats["rejected"] += size - inserted
+                for error in errors[:3]:
+                    logger.warning(f"Rejected row {error}")
+                
+                now = time.perf_counter()
+                if now - last_report >= progress_interval:
+                    last_report = now
+                    rate = stats["read"] / (now - started)
+                    logger.info(
+                        f"{rows_done} rows done ({stats['inserted']} inserted, "
+                        f"{stats['rejected']} rejected) - {rate:,.0f} rows/sec"
+                    )
+    finally:
+        db.close()
+    
+    elapsed = time.perf_counter() - started
+    rate = stats["read"] / elapsed if elapsed else 0
+    logger.info(
+        f"✓ Imported {stats['inserted']} employees ({stats['rejected']} rejected) "
+        f"in {elapsed:.1f}s - {rate:,.0f} rows/sec"
+    )
+    return stats
+
+
+def generate_file(path: str, count: int, fmt: Optional[str] = None) -> None:
+    """Write `count` synthetic employees to a CSV or NDJSON file, streaming row by row."""
+    from seed_data import iter_sample_employees
+    
+    fmt = detect_format(path, fmt)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS) if fmt == "csv" else None
+        if writer:
+            writer.writeheader()
+        for employee in iter_sample_employees(count):
+            employee["date_of_joining"] = employee["date_of_joining"].isoformat()
+            if writer:
+                writer.writerow(employee)
+            else:
+                f.write(json.dumps(employee) + "\n")
+    logger.info(f"✓ Wrote {count} synthetic employees to {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import employees from CSV or NDJSON files.")
+    parser.add_argument("path", nargs="?", help="File to import (or to write with --generate)")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="File format (default: from extension)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batch (default: 1000)")
+    parser.add_argument("--workers", type=int, help="Validation processes (default: CPU count)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint)")
+    parser.add_argument("--resume", action="store_true", help="Resume from the checkpoint")
+    parser.add_argument("--generate", type=int, metavar="COUNT", help="Write COUNT synthetic employees instead of importing")
+    parser.add_argument("--output", help="Output file for --generate")
+    args = parser.parse_args(argv)
+    
+    if args.generate is not None:
+        output = args.output or args.path
+        if not output:
+            parser.error("--generate requires --output")
+        generate_file(output, args.generate, args.format)
+        return
+    if not args.path:
+        parser.error("a file to import is required")
+    import_file(
+        args.path,
+        fmt=args.format,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        resume=args.resume
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""In-memory index package for accelerating employee lookups."""
@@ -0,0 +1,69 @@
+"""
+Text comparison rules of the database, reproduced for the in-memory search paths.
+
+The trigram index and the directory snapshots answer searches that SQL would
+otherwise answer, so they must match and order rows exactly as the database
+does. On SQLite the rules are fixed and simple:
+- `ILIKE` compiles to `lower(x) LIKE lower(y)`; SQLite's lower() and LIKE
+  fold ASCII letters only, so "É" and "é" are different characters
+- `ORDER BY` and `=` use the BINARY collation: UTF-8 byte order, which is
+  code point order (Python's str ordering), and exact equality
+
+fold() reproduces the first rule; Python's own comparisons give the second.
+
+MySQL compares through the column collation (utf8mb4_0900_ai_ci or
+utf8mb4_unicode_ci): case and accent insensitive, with its own weights for
+ordering. Python has no equivalent short of ICU, so on MySQL the in-memory
+paths cannot answer a search themselves (see matches_database). They still
+narrow it: fold_broadly() erases at least every difference the collation
+ignores, so the rows it matches are a superset of the rows MySQL matches, and
+SQL only has to check those candidates.
+"""
+import string
+import unicodedata
+from typing import Callable
+
+from sqlalchemy.engine import make_url
+
+from config import settings
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Letters without a Unicode decomposition that accent-insensitive collations
+# still compare equal to plain letters (casefold() has already lowered them)
+_BROAD_LETTERS = str.maketrans({
+    "ø": "o", "đ": "d", "ð": "d", "ł": "l", "ħ": "h", "ı": "i", "æ": "ae", "œ": "oe", "þ": "th",
+})
+
+
+def fold(text: str) -> str:
+    """Lowercase ASCII letters only, as SQLite's lower() and LIKE do; the length never changes."""
+    return text.lower() if text.isascii() else text.translate(_ASCII_LOWER)
+
+
+def matches_database() -> bool:
+    """Whether fold() and Python ordering reproduce the database's comparisons (SQLite only)."""
+    return make_url(settings.database_url).get_backend_name() == "sqlite"
+
+
+def fold_broadly(text: str) -> str:
+    """
+    Fold case and accents at least as far as MySQL's _ai_ci collations do.
+
+    Case is casefold()ed, compatibility forms and accents are decomposed and
+    the marks dropped, format characters (which those collations ignore) are
+    removed, and the few letters without a decomposition are spelled plainly.
+    Folding more than the collation is safe, since callers only use it to
+    pick candidates for the database to check.
+    """
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(
+        c for c in decomposed if unicodedata.category(c) not in ("Mn", "Cf")
+    ).translate(_BROAD_LETTERS)
+
+
+def index_fold() -> Callable[[str], str]:
+    """The folding in-memory search indexes apply: fold() where it is exact, else fold_broadly()."""
+    return fold if matches_database() else fold_broadly
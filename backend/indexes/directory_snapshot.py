@@ -0,0 +1,618 @@
+import heapq
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, namedtuple
+from datetime import date
+from itertools import accumulate, islice
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from config import settings
+from indexes.collation import index_fold, matches_database
+from indexes.facet_counts import format_facets
+from indexes.trigram_index import LIKE_SPECIAL_CHARS
+
+# Separates values in a string column buffer; never part of a search term
+SEPARATOR = "\x00"
+
+# Terms containing control characters (the separator among them, which would
+# match across adjacent values) are left to the database
+CONTROL_CHARS = frozenset(map(chr, [*range(0x20), 0x7f]))
+
+# Batches larger than this re-sort the page order instead of inserting per row
+MERGE_THRESHOLD = 64
+
+# Equality-filtered pages walk the page order while the expected walk is at
+# most this many times the filter's match count; rarer filters sort their matches
+WALK_FACTOR = 4
+
+# Rows answer like Core rows of EMPLOYEE_COLUMNS: same fields, same order
+SnapshotRow = namedtuple("SnapshotRow", ("name", "email", "department", "designation", "date_of_joining", "id"))
+
+
+class _StringColumn:
+    """Strings in one contiguous buffer, separator-terminated, located by start offsets."""
+
+    def __init__(self, values: Sequence[str] = ()):
+        self.buffer = ""
+        self.offsets = array("q", [0])
+        self.extend(values)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, slot: int) -> str:
+        return self.buffer[self.offsets[slot]:self.offsets[slot + 1] - 1]
+
+    def extend(self, values: Sequence[str]) -> None:
+        if not values:
+            return
+        # One copy of the buffer per batch: writes are rare, reads are not
+        self.buffer += SEPARATOR.join(values) + SEPARATOR
+        ends = accumulate((len(value) + 1 for value in values), initial=self.offsets[-1])
+        self.offsets.extend(islice(ends, 1, None))
+
+    def find_all(self, term: str) -> List[int]:
+        """Slots whose value contains `term`, found with str.find over the whole buffer."""
+        buffer, offsets = self.buffer, self.offsets
+        slots = []
+        position = buffer.find(term)
+        while position != -1:
+            slot = bisect_right(offsets, position) - 1
+            slots.append(slot)
+            position = buffer.find(term, offsets[slot + 1])
+        return slots
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+
+class _InternedColumn:
+    """Values interned to integer codes, with the slots and live count of each code."""
+
+    def __init__(self):
+        self.values: List[str] = []
+        self.lowered: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.column = array("I")
+        self.slots: List[array] = []
+        self.live = array("q")
+
+    def extend(self, values: Sequence[str], first_slot: int) -> None:
+        """Append the values of consecutive slots starting at `first_slot`."""
+        codes = self.codes
+        fold = index_fold()
+        column = []
+        for value in values:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.values)
+                self.values.append(value)
+                self.lowered.append(fold(value))
+                self.slots.append(array("i"))
+                self.live.append(0)
+            column.append(code)
+        self.column.extend(column)
+        slots = self.slots
+        for slot, code in enumerate(column, first_slot):
+            slots[code].append(slot)
+        for code, count in Counter(column).items():
+            self.live[code] += count
+
+    def value(self, slot: int) -> str:
+        return self.values[self.column[slot]]
+
+    def nbytes(self) -> int:
+        size = self.column.itemsize * len(self.column) + self.live.itemsize * len(self.live)
+        size += sum(slots.itemsize * len(slots) for slots in self.slots)
+        return size + sum(sys.getsizeof(value) * 2 for value in self.values)
+
+
+class SnapshotReads:
+    """
+    Read side of a columnar directory snapshot.
+
+    Subclasses provide the columns (typed arrays or memory-mapped views):
+    _ids, _joined, _order, _rank, _names, _names_lower, _emails,
+    _departments, _designations, _year_counts, _sorted and _moved, plus
+    _lock. Searches page matches in (name, id) order with the same
+    semantics as `name ILIKE '%term%' OR department ILIKE '%term%'` plus
+    the structured filters, folding case and ordering names as the database
+    does (indexes.collation). Terms containing LIKE wildcards or control
+    characters are left to the database. On a database whose collation
+    Python cannot reproduce (MySQL) the snapshot is not `exact`: names are
+    folded broadly and it only supplies `candidates` for SQL to check.
+    """
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @property
+    def exact(self) -> bool:
+        """Whether searches match and order exactly as the database does; otherwise only candidates() applies."""
+        return matches_database()
+
+    def can_answer(self, term: str) -> bool:
+        """Check whether a (stripped) search term ("" for a listing) can be served from the snapshot."""
+        return not any(c in term for c in LIKE_SPECIAL_CHARS) and CONTROL_CHARS.isdisjoint(term)
+
+    def candidates(self, term: str) -> Optional[Set[int]]:
+        """
+        IDs of employees whose folded name or department contains the folded term.
+
+        On a snapshot that is not `exact` this is a superset of the database's
+        matches, for narrowing the SQL search to.
+
+        Returns:
+            The IDs, or None for a term that folds to nothing (every employee)
+        """
+        term_lower = index_fold()(term)
+        if not term_lower:
+            return None
+        with self._lock:
+            ids = self._ids
+            return {ids[slot] for slot in self._match(term_lower, None)}
+
+    def search(
+        self,
+        term: str,
+        limit: int,
+        offset: int,
+        after: Optional[Tuple[str, int]] = None,
+        facet_fields: Sequence[str] = (),
+        filters=None
+    ) -> Tuple[List[SnapshotRow], int, Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Page employees whose name or department contains the term, in (name, id) order.
+
+        Args:
+            term: Stripped search term ("" for every employee)
+            limit: Maximum number of rows to return
+            offset: Number of matches to skip
+            after: Optional (name, id) keyset; only matches sorting after it are paged
+            facet_fields: Facets to count over all matches (not just the page)
+            filters: Optional EmployeeFilters every match must also satisfy
+
+        Returns:
+            Tuple of (page of rows, total match count, facet counts or None
+            if no facets were requested)
+        """
+        with self._lock:
+            if not term and filters and not facet_fields and filters.joined_from is None and filters.joined_to is None:
+                walked = self._walk(filters, limit, offset, after)
+                if walked is not None:
+                    page, total = walked
+                    return [self._row(slot) for slot in page], total, None
+            matches = self._match(index_fold()(term), filters)
+            if matches is None:
+                # Every employee: page straight from the order
+                start = bisect_right(self._order, after, key=self._sort_key) if after is not None else 0
+                page = self._order[start + offset:start + offset + limit]
+                total = len(self._order)
+                facets = self._all_facets(facet_fields) if facet_fields else None
+            else:
+                rank = self._rank
+                candidates = matches
+                if after is not None:
+                    threshold = bisect_right(self._order, after, key=self._sort_key)
+                    candidates = [slot for slot in matches if rank[slot] >= threshold]
+                page = heapq.nsmallest(offset + limit, candidates, key=rank.__getitem__)[offset:]
+                total = len(matches)
+                facets = self._tally(matches, facet_fields) if facet_fields else None
+            return [self._row(slot) for slot in page], total, facets
+
+    def get_rows(self, employee_ids: Sequence[int]) -> List[SnapshotRow]:
+        """Rows for the given IDs in the same order; missing IDs are skipped, repeats repeated."""
+        with self._lock:
+            slots = (self._slot(employee_id) for employee_id in employee_ids)
+            return [self._row(slot) for slot in slots if slot is not None]
+
+    def _walk(
+        self,
+        filters,
+        limit: int,
+        offset: int,
+        after: Optional[Tuple[str, int]]
+    ) -> Optional[Tuple[List[int], int]]:
+        """
+        Page department / designation equality filters by walking the page order.
+
+        This is what idx_department_name does for the SQL path: frequent values
+        fill a page after a short walk, with the total taken from the live
+        counts. Returns None when sorting the filter's matches is cheaper.
+        """
+        departments, designations = self._departments, self._designations
+        department_code = designation_code = None
+        if filters.department is not None:
+            department_code = departments.codes.get(filters.department, -1)
+        if filters.designation is not None:
+            designation_code = designations.codes.get(filters.designation, -1)
+        if department_code == -1 or designation_code == -1:
+            return [], 0
+
+        if designation_code is None:
+            total = departments.live[department_code]
+        elif department_code is None:
+            total = designations.live[designation_code]
+        else:
+            total = len(self._match("", filters))
+        order = self._order
+        if not total or (offset + limit) * len(order) > WALK_FACTOR * total * total:
+            return None if total else ([], 0)
+
+        department_column, designation_column = departments.column, designations.column
+        start = bisect_right(order, after, key=self._sort_key) if after is not None else 0
+        page = []
+        for position in range(start, len(order)):
+            slot = order[position]
+            if (
+                (department_code is None or department_column[slot] == department_code)
+                and (designation_code is None or designation_column[slot] == designation_code)
+            ):
+                if offset:
+                    offset -= 1
+                    continue
+                page.append(slot)
+                if len(page) == limit:
+                    break
+        return page, total
+
+    def _match(self, term_lower: str, filters) -> Optional[List[int]]:
+        """Live slots matching the term and filters; None when that is every employee."""
+        departments, designations = self._departments, self._designations
+        department_code = designation_code = None
+        if filters:
+            if filters.department is not None:
+                department_code = departments.codes.get(filters.department, -1)
+            if filters.designation is not None:
+                designation_code = designations.codes.get(filters.designation, -1)
+
+        if term_lower:
+            candidates = set(self._names_lower.find_all(term_lower))
+            for code, value in enumerate(departments.lowered):
+                if term_lower in value:
+                    candidates.update(departments.slots[code])
+        elif department_code is not None or designation_code is not None:
+            # The smaller posting list drives; the other filter is checked per slot
+            postings = [
+                column.slots[code] if code >= 0 else ()
+                for column, code in ((departments, department_code), (designations, designation_code))
+                if code is not None
+            ]
+            candidates = min(postings, key=len)
+        elif filters:
+            candidates = range(len(self._ids))
+        else:
+            return None
+
+        rank = self._rank
+        first = filters.joined_from.toordinal() if filters and filters.joined_from else None
+        last = filters.joined_to.toordinal() if filters and filters.joined_to else None
+        department_column, designation_column, joined = departments.column, designations.column, self._joined
+        return [
+            slot for slot in candidates
+            if rank[slot] != -1
+            and (department_code is None or department_column[slot] == department_code)
+            and (designation_code is None or designation_column[slot] == designation_code)
+            and (first is None or joined[slot] >= first)
+            and (last is None or joined[slot] <= last)
+        ]
+
+    def _tally(self, slots: Sequence[int], facet_fields: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        departments, designations = self._departments, self._designations
+        years = Counter()
+        for ordinal, count in Counter(self._joined[slot] for slot in slots).items():
+            years[str(date.fromordinal(ordinal).year)] += count
+        counts = {
+            "department": Counter({
+                departments.values[code]: count
+                for code, count in Counter(departments.column[slot] for slot in slots).items()
+            }),
+            "designation": Counter({
+                designations.values[code]: count
+                for code, count in Counter(designations.column[slot] for slot in slots).items()
+            }),
+            "year": years,
+        }
+        return format_facets(counts, facet_fields)
+
+    def _all_facets(self, facet_fields: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        counts = {
+            field: Counter({value: count for value, count in zip(column.values, column.live) if count})
+            for field, column in (("department", self._departments), ("designation", self._designations))
+        }
+        counts["year"] = Counter({str(year): count for year, count in self._year_counts.items() if count})
+        return format_facets(counts, facet_fields)
+
+    def _slot(self, employee_id: int) -> Optional[int]:
+        slot = self._moved.get(employee_id)
+        if slot is None:
+            position = bisect_left(self._ids, employee_id, 0, self._sorted)
+            if position == self._sorted or self._ids[position] != employee_id:
+                return None
+            slot = position
+        return slot if self._rank[slot] != -1 else None
+
+    def _sort_key(self, slot: int) -> Tuple[str, int]:
+        return self._names[slot], self._ids[slot]
+
+    def _row(self, slot: int) -> SnapshotRow:
+        return SnapshotRow(
+            self._names[slot], self._emails[slot], self._departments.value(slot),
+            self._designations.value(slot), date.fromordinal(self._joined[slot]), self._ids[slot]
+        )
+
+
+class DirectorySnapshot(SnapshotReads):
+    """
+    Compact columnar copy of the employees table that answers reads from memory.
+
+    One slot per employee row, stored column by column:
+    - IDs, last change sequences and joining dates (as ordinals) in typed arrays
+    - departments and designations interned to 4-byte codes, with the slots
+      of each code as a ready-made filter index
+    - names, case-folded names and emails each in one contiguous string buffer;
+      a substring search is str.find over the folded name buffer
+    - the live slots in (name, id) order, and each slot's position in it, so
+      matches are paged by sorting integers
+
+    Updated employees get a new slot; the old one and deleted employees' slots
+    are marked dead. Once dead slots and slots out of ID order make up a
+    quarter of the table, the columns are rebuilt without them. Every row
+    carries the change sequence it was loaded at, and older versions never
+    overwrite newer ones, so concurrent refreshes and local write
+    notifications can be applied in any order.
+
+    Each worker process keeps its own copy, built on first use, unless the
+    workers share one published by snapshot_builder.py (indexes.snapshot_file).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clear()
+        self.ready = False
+        self.stale = False
+        self.refreshed_at = 0.0
+
+    def _clear(self) -> None:
+        self._ids = array("q")
+        self._seqs = array("q")
+        self._joined = array("i")
+        self._names = _StringColumn()
+        self._names_lower = _StringColumn()
+        self._emails = _StringColumn()
+        self._departments = _InternedColumn()
+        self._designations = _InternedColumn()
+        self._year_counts: Counter = Counter()
+        # Live slots in (name, id) order, and each slot's position in it (-1: dead)
+        self._order = array("i")
+        self._rank = array("i")
+        # Slots 0.._sorted - 1 are in ascending ID order and found by bisection;
+        # IDs loaded out of order are found through _moved
+        self._sorted = 0
+        self._moved: Dict[int, int] = {}
+        # Sequence of the delete for each deleted ID, so stale upserts stay deleted
+        self._deleted: Dict[int, int] = {}
+        self._dead = 0
+        self.seq = 0
+
+    def needs_refresh(self) -> bool:
+        """Whether another process wrote since the last delta, or the periodic delta is due."""
+        return self.stale or time.monotonic() - self.refreshed_at >= settings.snapshot_refresh_seconds
+
+    def build(self, rows: Iterable[tuple]) -> None:
+        """
+        Rebuild the snapshot from (change_seq, name, email, department, designation, date_of_joining, id) rows.
+
+        Args:
+            rows: Every employee, in any order, typically from one database query
+        """
+        rows = sorted(rows, key=lambda row: row[6])
+        with self._lock:
+            self._clear()
+            self._append(rows)
+            self._reorder()
+            self.seq = max((row[0] for row in rows), default=0)
+            self.ready = True
+            self.stale = False
+            self.refreshed_at = time.monotonic()
+
+    def apply_changes(self, rows: Iterable[tuple], tombstones: Iterable[Tuple[int, int]]) -> None:
+        """
+        Apply a change feed delta and advance the snapshot's sequence.
+
+        Args:
+            rows: (change_seq, name, email, department, designation, date_of_joining, id)
+                rows of employees written after `seq`
+            tombstones: (change_seq, employee_id) deletions after `seq`
+        """
+        rows, tombstones = list(rows), list(tombstones)
+        with self._lock:
+            if not self.ready:
+                return
+            self._apply(rows, tombstones)
+            self.seq = max([self.seq] + [row[0] for row in rows] + [row[0] for row in tombstones])
+            self.stale = False
+            self.refreshed_at = time.monotonic()
+
+    def on_employees_created(self, employees) -> None:
+        """Write listener: add this process's new employees without waiting for the next delta."""
+        if not self.ready:
+            return
+        rows = sorted(
+            (
+                (
+                    employee.change_seq, employee.name, employee.email, employee.department,
+                    employee.designation, employee.date_of_joining, employee.id
+                )
+                for employee in employees
+            ),
+            key=lambda row: row[0]
+        )
+        with self._lock:
+            self._apply(rows, [])
+            # Only advance past an unbroken run, or the next delta could skip
+            # another process's earlier writes
+            for row in rows:
+                if row[0] == self.seq + 1:
+                    self.seq = row[0]
+
+    def mark_stale(self) -> None:
+        """External change listener: apply a delta before the next read."""
+        self.stale = True
+
+    def reset(self) -> None:
+        """Drop the snapshot so the next read rebuilds it from the database."""
+        with self._lock:
+            self._clear()
+            self.ready = False
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the columns, buffers and indexes."""
+        arrays = (self._ids, self._seqs, self._joined, self._order, self._rank)
+        size = sum(column.itemsize * len(column) for column in arrays)
+        size += self._names.nbytes() + self._names_lower.nbytes() + self._emails.nbytes()
+        return size + self._departments.nbytes() + self._designations.nbytes()
+
+    def stats(self) -> dict:
+        """Snapshot state for monitoring."""
+        return {
+            "enabled": settings.snapshot_serving_enabled,
+            "ready": self.ready,
+            "employees": len(self),
+            "seq": self.seq,
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    def columns(self) -> dict:
+        """
+        The snapshot's columns, compacted first, for writing a snapshot file.
+
+        After compaction every slot is live and slots are in ascending ID
+        order. The returned objects are the snapshot's own: write them out
+        before applying further changes.
+        """
+        with self._lock:
+            if self._dead or self._moved:
+                self._compact()
+            return {
+                "seq": self.seq,
+                "ids": self._ids,
+                "seqs": self._seqs,
+                "joined": self._joined,
+                "order": self._order,
+                "rank": self._rank,
+                "names": self._names,
+                "names_lower": self._names_lower,
+                "emails": self._emails,
+                "departments": self._departments,
+                "designations": self._designations,
+                "year_counts": self._year_counts,
+            }
+
+    def _append(self, rows: Sequence[tuple]) -> List[int]:
+        """Append rows as new slots (not yet placed in the page order)."""
+        first = len(self._ids)
+        ids = [row[6] for row in rows]
+        previous = self._ids[-1] if self._ids else None
+        for slot, employee_id in enumerate(ids, first):
+            if self._sorted == slot and (previous is None or employee_id > previous):
+                self._sorted += 1
+            else:
+                self._moved[employee_id] = slot
+            previous = employee_id
+        joined = [row[5] for row in rows]
+        self._ids.extend(ids)
+        self._seqs.extend(row[0] for row in rows)
+        self._joined.extend(map(date.toordinal, joined))
+        self._year_counts.update(map(attrgetter("year"), joined))
+        self._departments.extend([row[3] for row in rows], first)
+        self._designations.extend([row[4] for row in rows], first)
+        self._rank.extend(array("i", [-2]) * len(rows))
+        self._names.extend([row[1] for row in rows])
+        fold = index_fold()
+        self._names_lower.extend([fold(row[1]) for row in rows])
+        self._emails.extend([row[2] for row in rows])
+        return list(range(first, len(self._ids)))
+
+    def _kill(self, slot: int) -> None:
+        self._rank[slot] = -1
+        self._departments.live[self._departments.column[slot]] -= 1
+        self._designations.live[self._designations.column[slot]] -= 1
+        self._year_counts[date.fromordinal(self._joined[slot]).year] -= 1
+        self._moved.pop(self._ids[slot], None)
+        self._dead += 1
+
+    def _apply(self, rows: Sequence[tuple], tombstones: Sequence[Tuple[int, int]]) -> None:
+        killed = False
+        for seq, employee_id in tombstones:
+            if seq <= self._deleted.get(employee_id, 0):
+                continue
+            self._deleted[employee_id] = seq
+            slot = self._slot(employee_id)
+            if slot is not None and self._seqs[slot] < seq:
+                self._kill(slot)
+                killed = True
+
+        fresh = []
+        for row in rows:
+            seq, employee_id = row[0], row[6]
+            if seq <= self._deleted.get(employee_id, 0):
+                continue
+            slot = self._slot(employee_id)
+            if slot is not None:
+                if self._seqs[slot] >= seq:
+                    continue
+                self._kill(slot)
+                killed = True
+            fresh.append(row)
+        if not fresh and not killed:
+            return
+
+        new_slots = self._append(fresh)
+        if (self._dead + len(self._moved)) * 4 > len(self._ids):
+            self._compact()
+        elif len(new_slots) > MERGE_THRESHOLD:
+            self._reorder()
+        else:
+            rank = self._rank
+            order = [slot for slot in self._order if rank[slot] != -1] if killed else list(self._order)
+            for slot in new_slots:
+                insort(order, slot, key=self._sort_key)
+            self._set_order(order)
+
+    def _compact(self) -> None:
+        """Rebuild the columns from the live slots, dropping dead ones."""
+        rank = self._rank
+        rows = sorted(
+            (self._raw_row(slot) for slot in range(len(rank)) if rank[slot] != -1),
+            key=lambda row: row[6]
+        )
+        seq, deleted = self.seq, self._deleted
+        self._clear()
+        self.seq, self._deleted = seq, deleted
+        self._append(rows)
+        self._reorder()
+
+    def _reorder(self) -> None:
+        rank = self._rank
+        self._set_order(sorted((slot for slot in range(len(rank)) if rank[slot] != -1), key=self._sort_key))
+
+    def _set_order(self, order: List[int]) -> None:
+        """Install the page order of every live slot and renumber their positions."""
+        self._order = array("i", order)
+        rank = self._rank
+        for position, slot in enumerate(order):
+            rank[slot] = position
+
+    def _raw_row(self, slot: int) -> tuple:
+        return (
+            self._seqs[slot], self._names[slot], self._emails[slot], self._departments.value(slot),
+            self._designations.value(slot), date.fromordinal(self._joined[slot]), self._ids[slot]
+        )
+
+# Shared snapshot for this worker process
+directory_snapshot = DirectorySnapshot()
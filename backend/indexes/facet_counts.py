@@ -0,0 +1,120 @@
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+# Facets offered by /api/employees?facets=..., in the order of facet_values()
+FACET_FIELDS = ("department", "designation", "year")
+
+FacetValues = Tuple[str, str, str]
+
+
+def facet_values(department: str, designation: str, date_of_joining) -> FacetValues:
+    """Return an employee's value for each of FACET_FIELDS (the year as a string key)."""
+    return department, designation, str(date_of_joining.year)
+
+
+def tally_values(values: Iterable[FacetValues]) -> Dict[str, Counter]:
+    """Count facet values for a set of employees."""
+    counts = {field: Counter() for field in FACET_FIELDS}
+    department, designation, year = (counts[field] for field in FACET_FIELDS)
+    for department_value, designation_value, year_value in values:
+        department[department_value] += 1
+        designation[designation_value] += 1
+        year[year_value] += 1
+    return counts
+
+
+def tally_grouped(rows: Iterable[Tuple[str, str, int, int]]) -> Tuple[Dict[str, Counter], int]:
+    """
+    Fold (department, designation, year, count) GROUP BY rows into facet counts.
+
+    Returns:
+        Tuple of (counts per facet field, total number of employees)
+    """
+    counts = {field: Counter() for field in FACET_FIELDS}
+    total = 0
+    for department, designation, year, count in rows:
+        counts["department"][department] += count
+        counts["designation"][designation] += count
+        counts["year"][str(int(year))] += count
+        total += count
+    return counts, total
+
+
+def format_facets(counts: Dict[str, Counter], fields: Sequence[str]) -> Dict[str, Dict[str, int]]:
+    """Render the requested facets as {field: {value: count}}, largest count first."""
+    return {
+        field: dict(sorted(counts[field].items(), key=lambda item: (-item[1], item[0])))
+        for field in fields
+    }
+
+
+class FacetCounts:
+    """
+    Directory-wide employee counts per department, designation and joining year.
+
+    Built once from a single GROUP BY query, then kept current by the write
+    listener, so unfiltered facet requests never touch the database. Each
+    worker process keeps its own copy; `generation` counts writes and resets,
+    so a build whose query overlapped one is discarded instead of missing the
+    written rows.
+    """
+
+    def __init__(self):
+        self._counts = {field: Counter() for field in FACET_FIELDS}
+        self._lock = threading.Lock()
+        self.total = 0
+        self.ready = False
+        self.generation = 0
+
+    def build(self, grouped_rows: Iterable[Tuple[str, str, int, int]], generation: Optional[int] = None) -> None:
+        """
+        Rebuild from (department, designation, year, count) rows.
+
+        Args:
+            grouped_rows: Rows of facet_group_query() over the whole directory
+            generation: `generation` read before the rows were queried; if a
+                write or reset happened since, the build is discarded and the
+                aggregates stay unbuilt
+        """
+        counts, total = tally_grouped(grouped_rows)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._counts = counts
+            self.total = total
+            self.ready = True
+
+    def snapshot(self, fields: Sequence[str]) -> Dict[str, Dict[str, int]]:
+        """Return the current counts for the requested facets."""
+        with self._lock:
+            return format_facets(self._counts, fields)
+
+    def value_counts(self, field: str) -> Dict[str, int]:
+        """Return a copy of the counts for one facet field."""
+        with self._lock:
+            return dict(self._counts[field])
+
+    def on_employees_created(self, employees) -> None:
+        """Write listener: count new employees once the aggregates have been built."""
+        with self._lock:
+            self.generation += 1
+            if not self.ready:
+                return
+            for employee in employees:
+                values = facet_values(employee.department, employee.designation, employee.date_of_joining)
+                for field, value in zip(FACET_FIELDS, values):
+                    self._counts[field][value] += 1
+                self.total += 1
+
+    def reset(self) -> None:
+        """Drop the aggregates so the next facet request rebuilds them."""
+        with self._lock:
+            self._counts = {field: Counter() for field in FACET_FIELDS}
+            self.total = 0
+            self.ready = False
+            self.generation += 1
+
+
+# Shared aggregates for this worker process
+facet_counts = FacetCounts()
@@ -0,0 +1,283 @@
+import heapq
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from config import settings
+
+# Deletes are generated from this many leading characters only (SymSpell's
+# prefix length): it bounds the entries per token, and candidates are verified
+# against the full token anyway
+PREFIX_LENGTH = 7
+
+
+def tokenize(text: str) -> List[str]:
+    """Split into lowercased words."""
+    return text.lower().split()
+
+
+def allowed_distance(token: str, max_distance: int) -> int:
+    """
+    Edit distance tolerated for a query token of this length.
+
+    Short tokens get less slack: a 2-edit match on a 3-letter word matches
+    almost anything.
+    """
+    if len(token) < 3:
+        return 0
+    if len(token) < 6:
+        return min(1, max_distance)
+    return max_distance
+
+
+def _deletes(token: str, distance: int) -> Set[str]:
+    """All strings reachable from token by deleting up to `distance` characters."""
+    results = {token}
+    frontier = {token}
+    for _ in range(distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        results |= frontier
+    return results
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions).
+
+    Returns max_distance + 1 as soon as the distance is known to exceed it.
+    Common prefixes and suffixes are trimmed first and only the diagonal band
+    of width max_distance is computed, which is what keeps verifying a few
+    hundred candidates per query cheap.
+    """
+    if a == b:
+        return 0
+    over = max_distance + 1
+    if abs(len(a) - len(b)) > max_distance:
+        return over
+    start = 0
+    shortest = min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    len_a, len_b = len(a), len(b)
+    if not len_a or not len_b:
+        return len_a + len_b
+
+    previous_previous = None
+    previous = [j if j <= max_distance else over for j in range(len_b + 1)]
+    for i in range(1, len_a + 1):
+        char_a = a[i - 1]
+        current = [over] * (len_b + 1)
+        current[0] = i if i <= max_distance else over
+        row_min = current[0]
+        for j in range(max(1, i - max_distance), min(len_b, i + max_distance) + 1):
+            value = previous[j - 1] if char_a == b[j - 1] else previous[j - 1] + 1
+            if previous[j] + 1 < value:
+                value = previous[j] + 1
+            if current[j - 1] + 1 < value:
+                value = current[j - 1] + 1
+            if (
+                previous_previous is not None and j > 1
+                and char_a == b[j - 2] and a[i - 2] == b[j - 1]
+                and previous_previous[j - 2] + 1 < value
+            ):
+                value = previous_previous[j - 2] + 1
+            current[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min > max_distance:
+            return over
+        previous_previous, previous = previous, current
+    return min(previous[-1], over)
+
+
+class FuzzyIndex:
+    """
+    Typo-tolerant token index over employee names and departments.
+
+    Uses a SymSpell deletion dictionary: every distinct token is stored under
+    each string obtained by deleting up to `max_distance` of its characters.
+    A query token generates its own deletes, looks them up, and verifies the
+    few candidate tokens with an exact edit-distance check, so a lookup never
+    compares against the whole vocabulary.
+
+    Memory: deletes come from the first PREFIX_LENGTH characters only and are
+    keyed by their hash (a collision merely adds a candidate that fails
+    verification); a key shared by a single token stores the bare string, and
+    postings are plain lists of IDs.
+
+    An employee matches when every query token is within its allowed distance
+    of some token of the employee's name or department. Matches are ranked by
+    the summed distance, then by name. Matches are grouped by distance level
+    with set operations, so even a department-sized match set (hundreds of
+    thousands of IDs) is ranked without a per-ID Python loop.
+
+    Each worker process keeps its own copy, built on the first fuzzy search;
+    `generation` counts writes and resets, so a build that overlapped one is
+    discarded instead of missing the written rows.
+    """
+
+    def __init__(self, max_distance: int = 2):
+        self.max_distance = max_distance
+        self._deletes: Dict[int, Union[str, List[str]]] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.ready = False
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def build(self, rows: Iterable[Tuple[int, str, str]], generation: Optional[int] = None) -> "FuzzyIndex":
+        """
+        Rebuild the index from (id, name, department) rows.
+
+        The rows are indexed without holding the lock (safe in a worker
+        thread) and swapped in at the end.
+
+        Args:
+            rows: Iterable of employee rows, typically streamed from the database
+            generation: `generation` read before the rows were queried; if a
+                write or reset happened since, the build is discarded and the
+                index stays unbuilt
+
+        Returns:
+            This index once published; if the build was discarded, the fresh
+            index it built instead, which is complete as of the rows but not
+            kept current by writes
+        """
+        fresh = FuzzyIndex(self.max_distance)
+        for employee_id, name, department in rows:
+            fresh._add(employee_id, name, department)
+        with self._lock:
+            fresh.ready = True
+            if generation is not None and generation != self.generation:
+                return fresh
+            self._deletes, self._postings, self._names = fresh._deletes, fresh._postings, fresh._names
+            self.ready = True
+            return self
+
+    def on_employees_created(self, employees) -> None:
+        """Write listener: index new employees once the index has been built."""
+        with self._lock:
+            self.generation += 1
+            if not self.ready:
+                return
+            for employee in employees:
+                self._add(employee.id, employee.name, employee.department)
+
+    def reset(self) -> None:
+        """Drop the index so the next fuzzy search rebuilds it from the database."""
+        with self._lock:
+            self._deletes = {}
+            self._postings = {}
+            self._names = {}
+            self.ready = False
+            self.generation += 1
+
+    def _add(self, employee_id: int, name: str, department: str) -> None:
+        self._names[employee_id] = name
+        for token in set(tokenize(name) + tokenize(department)):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = []
+                self._add_deletes(token)
+            postings.append(employee_id)
+
+    def _add_deletes(self, token: str) -> None:
+        deletes = self._deletes
+        for deleted in _deletes(token[:PREFIX_LENGTH], self.max_distance):
+            key = hash(deleted)
+            entry = deletes.get(key)
+            if entry is None:
+                deletes[key] = token
+            elif type(entry) is str:
+                deletes[key] = [entry, token]
+            else:
+                entry.append(token)
+
+    def _token_levels(self, query_token: str) -> List[Set[int]]:
+        """Employee IDs per edit distance (index = distance) for one query token."""
+        distance = allowed_distance(query_token, self.max_distance)
+        candidates = set()
+        for deleted in _deletes(query_token[:PREFIX_LENGTH], distance):
+            entry = self._deletes.get(hash(deleted))
+            if entry is None:
+                continue
+            if type(entry) is str:
+                candidates.add(entry)
+            else:
+                candidates.update(entry)
+
+        levels: List[Set[int]] = [set() for _ in range(distance + 1)]
+        for token in candidates:
+            token_distance = edit_distance(query_token, token, distance)
+            if token_distance <= distance:
+                levels[token_distance].update(self._postings[token])
+        # Keep each ID only at its best distance
+        seen: Set[int] = set()
+        for level in levels:
+            level -= seen
+            seen |= level
+        return levels
+
+    def search(self, term: str, limit: int, offset: int) -> Tuple[List[Tuple[int, int]], int]:
+        """
+        Find employees within edit distance of every token of the term.
+
+        Args:
+            term: Search term, possibly misspelled
+            limit: Maximum number of results to return
+            offset: Number of ranked matches to skip
+
+        Returns:
+            Tuple of (page of (employee ID, total distance) ranked by distance
+            then name, total match count)
+        """
+        tokens = tokenize(term)
+        if not tokens:
+            return [], 0
+        with self._lock:
+            # Fold tokens in one at a time: distance total -> IDs matching every
+            # token so far. Levels are disjoint per token, so each ID lands in
+            # exactly one bucket, at its summed distance.
+            groups: Dict[int, Set[int]] = {
+                distance: ids for distance, ids in enumerate(self._token_levels(tokens[0])) if ids
+            }
+            for token in tokens[1:]:
+                if not groups:
+                    break
+                levels = self._token_levels(token)
+                combined: Dict[int, Set[int]] = defaultdict(set)
+                for distance, ids in groups.items():
+                    for token_distance, token_ids in enumerate(levels):
+                        both = ids & token_ids
+                        if both:
+                            combined[distance + token_distance] |= both
+                groups = combined
+
+            total = sum(len(ids) for ids in groups.values())
+            page: List[Tuple[int, int]] = []
+            skip = offset
+            names = self._names
+            for distance in sorted(groups):
+                ids = groups[distance]
+                if skip >= len(ids):
+                    skip -= len(ids)
+                    continue
+                wanted = skip + limit - len(page)
+                ranked = heapq.nsmallest(wanted, ids, key=lambda i: (names[i], i))
+                page.extend((employee_id, distance) for employee_id in ranked[skip:])
+                skip = 0
+                if len(page) >= limit:
+                    break
+        return page, total
+
+
+# Shared index instance for this worker process
+fuzzy_index = FuzzyIndex(settings.fuzzy_max_edit_distance)
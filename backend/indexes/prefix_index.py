@@ -0,0 +1,216 @@
+import threading
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Batches larger than this are merged with one sort (or one filtering pass)
+# instead of per-row insort / delete
+MERGE_THRESHOLD = 64
+
+NAME = "name"
+DEPARTMENT = "department"
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace, the form both keys and queries are compared in."""
+    return " ".join(text.lower().split())
+
+
+def _name_keys(name: str) -> List[str]:
+    """Keys under which a name completes: the full name and every later word onwards."""
+    words = normalize(name).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def _department_keys(department: str) -> List[str]:
+    return [normalize(department)]
+
+
+class _SortedKeys:
+    """
+    (key, display text) pairs with per-text occurrence counts.
+
+    The pairs are kept in one sorted array per count, so a key range can be
+    read most frequent text first: each count's array from the highest count
+    down, in key order within one.
+    """
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.levels: Dict[int, List[Tuple[str, str]]] = {}
+        # Counts that have an array, ascending
+        self.level_counts: List[int] = []
+
+    def __len__(self) -> int:
+        return sum(map(len, self.levels.values()))
+
+    def add_many(self, texts: Iterable[str], keys_for) -> None:
+        before: Dict[str, int] = {}
+        for text in texts:
+            count = self.counts.get(text, 0)
+            before.setdefault(text, count)
+            self.counts[text] = count + 1
+        # Each text's pairs move from the array of its old count to its new one
+        removed: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+        added: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+        for text, count in before.items():
+            entries = [(key, text) for key in keys_for(text)]
+            if count:
+                removed[count].extend(entries)
+            added[self.counts[text]].extend(entries)
+        for count, entries in removed.items():
+            level = self.levels[count]
+            if len(entries) > MERGE_THRESHOLD:
+                gone = set(entries)
+                level[:] = [entry for entry in level if entry not in gone]
+            else:
+                for entry in entries:
+                    del level[bisect_left(level, entry)]
+            if not level:
+                del self.levels[count]
+                self.level_counts.remove(count)
+        for count, entries in added.items():
+            level = self.levels.get(count)
+            if level is None:
+                level = self.levels[count] = []
+                insort(self.level_counts, count)
+            if len(entries) > MERGE_THRESHOLD:
+                level.extend(entries)
+                level.sort()
+            else:
+                for entry in entries:
+                    insort(level, entry)
+
+    def complete(self, prefix: str, limit: int) -> List[str]:
+        """The `limit` most frequent distinct display texts with a key starting with prefix; ties in key order."""
+        results: List[str] = []
+        seen = set()
+        for count in reversed(self.level_counts):
+            level = self.levels[count]
+            for i in range(bisect_left(level, (prefix,)), len(level)):
+                key, text = level[i]
+                if not key.startswith(prefix):
+                    break
+                if text not in seen:
+                    seen.add(text)
+                    results.append(text)
+                    if len(results) == limit:
+                        return results
+        return results
+
+
+class PrefixIndex:
+    """
+    In-memory sorted index of employee names and departments for autocomplete.
+
+    Each distinct name is stored once per word position ("rahul kumar" and
+    "kumar" both point at "Rahul Kumar"), each distinct department once. A
+    lookup is a binary search to the first key >= the normalized prefix
+    followed by a short forward scan in each occurrence count's array, highest
+    count first, so it costs O(c log n + limit) for c distinct counts no
+    matter how many employees match.
+
+    Performance:
+    - Suggestions rank by how many employees share the text; on equal counts
+      departments come first (there are few of them), then names in key order
+    - New employees are inserted with bisect.insort; large batches are merged
+      with one sort (Timsort is linear on the concatenated sorted runs)
+    - Each worker process keeps its own copy, built at startup or on first
+      use; `generation` counts writes and resets, so a build that overlapped
+      one is discarded instead of missing the written rows
+    """
+
+    def __init__(self):
+        self._names = _SortedKeys()
+        self._departments = _SortedKeys()
+        self._lock = threading.Lock()
+        self.ready = False
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._names) + len(self._departments)
+
+    def build(self, rows: Iterable[Tuple[str, str]], generation: Optional[int] = None) -> "PrefixIndex":
+        """
+        Rebuild the index from (name, department) rows.
+
+        The rows are indexed without holding the lock (safe in a worker
+        thread) and swapped in at the end.
+
+        Args:
+            rows: Iterable of employee rows, typically streamed from the database
+            generation: `generation` read before the rows were queried; if a
+                write or reset happened since, the build is discarded and the
+                index stays unbuilt
+
+        Returns:
+            This index once published; if the build was discarded, the fresh
+            index it built instead, which is complete as of the rows but not
+            kept current by writes
+        """
+        names = _SortedKeys()
+        departments = _SortedKeys()
+        name_batch: List[str] = []
+        department_batch: List[str] = []
+        for name, department in rows:
+            name_batch.append(name)
+            department_batch.append(department)
+        names.add_many(name_batch, _name_keys)
+        departments.add_many(department_batch, _department_keys)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                fresh = PrefixIndex()
+                fresh._names, fresh._departments = names, departments
+                fresh.ready = True
+                return fresh
+            self._names = names
+            self._departments = departments
+            self.ready = True
+            return self
+
+    def on_employees_created(self, employees) -> None:
+        """Write listener: add new names and departments once the index has been built."""
+        with self._lock:
+            self.generation += 1
+            if not self.ready:
+                return
+            self._names.add_many([employee.name for employee in employees], _name_keys)
+            self._departments.add_many([employee.department for employee in employees], _department_keys)
+
+    def reset(self) -> None:
+        """Drop the index so the next lookup rebuilds it from the database."""
+        with self._lock:
+            self._names = _SortedKeys()
+            self._departments = _SortedKeys()
+            self.ready = False
+            self.generation += 1
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, object]]:
+        """
+        Return up to `limit` completions for a prefix.
+
+        Args:
+            query: Raw user input; compared case-insensitively
+            limit: Maximum number of suggestions
+
+        Returns:
+            List of {"text", "type", "count"} dicts, highest count first
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        with self._lock:
+            suggestions = [
+                {"text": text, "type": DEPARTMENT, "count": self._departments.counts[text]}
+                for text in self._departments.complete(prefix, limit)
+            ] + [
+                {"text": text, "type": NAME, "count": self._names.counts[text]}
+                for text in self._names.complete(prefix, limit)
+            ]
+        # Stable: equal counts keep departments first and each kind in its order
+        suggestions.sort(key=lambda suggestion: -suggestion["count"])
+        return suggestions[:limit]
+
+
+# Shared index instance for this worker process
+prefix_index = PrefixIndex()
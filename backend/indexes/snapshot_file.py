@@ -0,0 +1,286 @@
+import json
+import logging
+import mmap
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from indexes.collation import index_fold
+from indexes.directory_snapshot import DirectorySnapshot, SnapshotReads
+
+logger = logging.getLogger(__name__)
+
+# File layout: MAGIC, the JSON header's length (8 bytes, little endian), the
+# header, then the sections at 8-byte aligned offsets relative to the first one
+MAGIC = b"EMPSNAP1"
+# 2: names_lower holds names folded by indexes.collation.index_fold()
+FORMAT_VERSION = 2
+ALIGNMENT = 8
+
+# String columns: UTF-8 buffer and byte offsets of each value
+STRING_COLUMNS = ("names", "names_lower", "emails")
+# Interned columns: per-slot codes, then every code's slots back to back
+INTERNED_COLUMNS = ("departments", "designations")
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _encode_strings(column) -> Tuple[bytes, array]:
+    """UTF-8 buffer of a string column and the byte offset of each value."""
+    data = column.buffer.encode("utf-8")
+    if len(data) == len(column.buffer):
+        # ASCII: character offsets are byte offsets
+        return data, column.offsets
+    values = column.buffer.split("\x00")[:-1]
+    return data, array("q", accumulate((len(value.encode("utf-8")) + 1 for value in values), initial=0))
+
+
+def write_snapshot_file(path: str, snapshot: DirectorySnapshot) -> int:
+    """
+    Publish a snapshot for other processes to map.
+
+    The file is written next to `path`, synced and renamed over it, so readers
+    see either the previous complete version or this one.
+
+    Args:
+        path: Snapshot file path shared with the workers
+        snapshot: A built snapshot (compacted by this call)
+
+    Returns:
+        Size of the written file in bytes
+    """
+    columns = snapshot.columns()
+    sections: List[Tuple[str, object]] = [
+        (name, columns[name]) for name in ("ids", "seqs", "joined", "order", "rank")
+    ]
+    interned = {}
+    for name in INTERNED_COLUMNS:
+        column = columns[name]
+        postings = array("i")
+        for slots in column.slots:
+            postings.extend(slots)
+        sections.append((f"{name}.codes", column.column))
+        sections.append((f"{name}.postings", postings))
+        interned[name] = {
+            "values": column.values,
+            "live": list(column.live),
+            "postings": list(accumulate((len(slots) for slots in column.slots), initial=0)),
+        }
+    for name in STRING_COLUMNS:
+        data, offsets = _encode_strings(columns[name])
+        sections.append((f"{name}.data", data))
+        sections.append((f"{name}.offsets", offsets))
+
+    table = {}
+    position = 0
+    for name, section in sections:
+        size = len(memoryview(section).cast("B"))
+        table[name] = [position, size, getattr(section, "typecode", "B")]
+        position = _aligned(position + size)
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "seq": columns["seq"],
+        "employees": len(columns["ids"]),
+        "built_at": time.time(),
+        "year_counts": {str(year): count for year, count in columns["year_counts"].items() if count},
+        "interned": interned,
+        "sections": table,
+    }).encode("utf-8")
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(MAGIC + len(header).to_bytes(8, "little") + header)
+            f.write(b"\x00" * (_aligned(f.tell()) - f.tell()))
+            start = f.tell()
+            for name, section in sections:
+                f.write(b"\x00" * (start + table[name][0] - f.tell()))
+                f.write(memoryview(section).cast("B"))
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    return size
+
+
+class _MappedStringColumn:
+    """A string column read in place from the map: a UTF-8 buffer and byte offsets."""
+
+    def __init__(self, mapped: mmap.mmap, start: int, end: int, offsets: memoryview):
+        self.mapped = mapped
+        self.start = start
+        self.end = end
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, slot: int) -> str:
+        start = self.start
+        return self.mapped[start + self.offsets[slot]:start + self.offsets[slot + 1] - 1].decode("utf-8")
+
+    def find_all(self, term: str) -> List[int]:
+        """Slots whose value contains `term` (UTF-8 byte search, same matches as str.find)."""
+        mapped, start, end, offsets = self.mapped, self.start, self.end, self.offsets
+        needle = term.encode("utf-8")
+        slots = []
+        position = mapped.find(needle, start, end)
+        while position != -1:
+            slot = bisect_right(offsets, position - start) - 1
+            slots.append(slot)
+            position = mapped.find(needle, start + offsets[slot + 1], end)
+        return slots
+
+
+class _MappedInternedColumn:
+    """An interned column with its codes and per-code slots read in place from the map."""
+
+    def __init__(self, values: List[str], live: List[int], column: memoryview, postings: memoryview, bounds: List[int]):
+        self.values = values
+        fold = index_fold()
+        self.lowered = [fold(value) for value in values]
+        self.codes: Dict[str, int] = {value: code for code, value in enumerate(values)}
+        self.column = column
+        self.slots = [postings[bounds[code]:bounds[code + 1]] for code in range(len(values))]
+        self.live = live
+
+    def value(self, slot: int) -> str:
+        return self.values[self.column[slot]]
+
+
+class MappedSnapshot(SnapshotReads):
+    """
+    Read-only directory snapshot served from a file published by snapshot_builder.py.
+
+    Every worker maps the same file, so the columns live once in the page
+    cache however many workers there are, and a freshly started worker serves
+    as soon as it has mapped the file: nothing is loaded from the database.
+    Only the small per-value tables (departments, designations, year counts)
+    are copied into each process.
+
+    The file holds what snapshot searches use: the folded name buffer and the
+    department and designation postings. The trigram, fuzzy and autocomplete
+    indexes are not in it; a worker still builds its own copy of each on
+    first use, so those grow with the number of workers.
+
+    The builder publishes new versions by renaming a complete file over the
+    old one. refresh() notices the new file and swaps every column at once;
+    searches in progress keep the previous map, which is unmapped once
+    nothing references it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._identity: Optional[Tuple[int, int, int]] = None
+        self.ready = False
+        self.seq = 0
+        self.file_bytes = 0
+        self.built_at = 0.0
+        self.mapped_at = 0.0
+
+    def refresh(self) -> bool:
+        """
+        Map the published file if it changed since the last call.
+
+        Returns:
+            True if a snapshot is mapped (possibly from an earlier version of the file)
+        """
+        try:
+            status = os.stat(self.path)
+        except FileNotFoundError:
+            return self.ready
+        if (status.st_ino, status.st_mtime_ns, status.st_size) != self._identity:
+            try:
+                self._load()
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not map snapshot file {self.path}: {str(e)}")
+                # Don't retry the same broken file on every request
+                self._identity = (status.st_ino, status.st_mtime_ns, status.st_size)
+        return self.ready
+
+    def _load(self) -> None:
+        with open(self.path, "rb") as f:
+            status = os.fstat(f.fileno())
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a snapshot file")
+        header_size = int.from_bytes(mapped[len(MAGIC):len(MAGIC) + 8], "little")
+        header_end = len(MAGIC) + 8 + header_size
+        header = json.loads(mapped[len(MAGIC) + 8:header_end])
+        if header["format"] != FORMAT_VERSION or header["byteorder"] != sys.byteorder:
+            raise ValueError(f"unsupported format {header['format']} ({header['byteorder']} endian)")
+
+        start = _aligned(header_end)
+        view = memoryview(mapped)
+        sections = {}
+        for name, (offset, size, typecode) in header["sections"].items():
+            section = view[start + offset:start + offset + size]
+            sections[name] = section if typecode == "B" else section.cast(typecode)
+
+        def strings(name: str) -> _MappedStringColumn:
+            offset, size, _ = header["sections"][f"{name}.data"]
+            return _MappedStringColumn(mapped, start + offset, start + offset + size, sections[f"{name}.offsets"])
+
+        def interned(name: str) -> _MappedInternedColumn:
+            table = header["interned"][name]
+            return _MappedInternedColumn(
+                table["values"], table["live"], sections[f"{name}.codes"],
+                sections[f"{name}.postings"], table["postings"]
+            )
+
+        names, names_lower, emails = (strings(name) for name in STRING_COLUMNS)
+        departments, designations = (interned(name) for name in INTERNED_COLUMNS)
+        year_counts = Counter({int(year): count for year, count in header["year_counts"].items()})
+        with self._lock:
+            self._ids = sections["ids"]
+            self._seqs = sections["seqs"]
+            self._joined = sections["joined"]
+            self._order = sections["order"]
+            self._rank = sections["rank"]
+            self._names, self._names_lower, self._emails = names, names_lower, emails
+            self._departments, self._designations = departments, designations
+            self._year_counts = year_counts
+            # A published file is compacted: every slot live, in ID order
+            self._sorted = len(self._ids)
+            self._moved: Dict[int, int] = {}
+            self._identity = (status.st_ino, status.st_mtime_ns, status.st_size)
+            self.seq = header["seq"]
+            self.file_bytes = status.st_size
+            self.built_at = header["built_at"]
+            self.mapped_at = time.time()
+            self.ready = True
+        logger.info(f"✓ Mapped snapshot file {self.path} (seq {self.seq}, {len(self._ids)} employees)")
+
+    def __len__(self) -> int:
+        return len(self._order) if self.ready else 0
+
+    def stats(self) -> dict:
+        """Snapshot state for monitoring."""
+        return {
+            "enabled": settings.snapshot_serving_enabled,
+            "shared_file": self.path,
+            "ready": self.ready,
+            "employees": len(self),
+            "seq": self.seq,
+            "file_bytes": self.file_bytes,
+            "age_seconds": round(time.time() - self.built_at, 3) if self.ready else None,
+        }
+
+
+# Snapshot file shared by the worker processes of this host (snapshot_file_path)
+mapped_snapshot = MappedSnapshot(settings.snapshot_file_path)
@@ -0,0 +1,224 @@
+import heapq
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from indexes.collation import fold, index_fold
+from indexes.facet_counts import FacetValues, facet_values, format_facets, tally_values
+
+# Characters with a special meaning inside a LIKE pattern. Terms containing
+# them are left to the database so wildcard semantics stay unchanged.
+LIKE_SPECIAL_CHARS = ("%", "_", "\\")
+
+GRAM_SIZE = 3
+
+
+def _grams(text: str) -> Set[str]:
+    """Return the set of trigrams contained in an already case-folded string."""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """
+    In-memory trigram inverted index over employee name and department.
+
+    Every trigram of the case-folded name and department maps to the set of
+    employee IDs containing it. A search intersects the posting sets for the
+    trigrams of the term (smallest first) to get a small candidate set, then
+    verifies each candidate with a substring check. The verification step makes
+    the result set identical to `name ILIKE '%term%' OR department ILIKE '%term%'`:
+    case folding and name order follow the database (indexes.collation).
+    Where Python cannot reproduce the database's collation (MySQL) the index
+    is not `exact`: it folds broadly and only supplies `candidates`, a
+    superset of the matches, for SQL to check.
+
+    Performance:
+    - Lookup cost depends on the number of candidates, not on the table size
+    - Only terms of 3+ characters without LIKE wildcards are answered here;
+      anything else falls back to the SQL path
+    - Each worker process keeps its own copy, built lazily on first search;
+      `generation` counts writes and resets, so a build that overlapped one
+      is discarded instead of missing the written rows
+    - Structured filters are checked on the matches in memory; joining dates
+      are interned, so keeping them costs one pointer per employee
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        # id -> (name, folded name, folded department, facet values, date of joining)
+        self._rows: Dict[int, Tuple[str, str, str, FacetValues, date]] = {}
+        self._dates: Dict[date, date] = {}
+        self._fold = index_fold()
+        self._lock = threading.Lock()
+        self.ready = False
+        self.generation = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def exact(self) -> bool:
+        """Whether searches match exactly as the database does; otherwise only candidates() applies."""
+        return self._fold is fold
+
+    def can_answer(self, term: str) -> bool:
+        """Check whether a (stripped) search term can be served by the index."""
+        return len(term) >= GRAM_SIZE and not any(c in term for c in LIKE_SPECIAL_CHARS)
+
+    def build(self, rows: Iterable[tuple], generation: Optional[int] = None) -> "TrigramIndex":
+        """
+        Rebuild the index from (id, name, department, designation, date_of_joining) rows.
+
+        The rows are indexed without holding the lock (safe in a worker
+        thread) and swapped in at the end.
+
+        Args:
+            rows: Iterable of employee rows, typically streamed from the database
+            generation: `generation` read before the rows were queried; if a
+                write or reset happened since, the build is discarded and the
+                index stays unbuilt
+
+        Returns:
+            This index once published; if the build was discarded, the fresh
+            index it built instead, which is complete as of the rows but not
+            kept current by writes
+        """
+        fresh = TrigramIndex()
+        for row in rows:
+            fresh._add(*row)
+        with self._lock:
+            fresh.ready = True
+            if generation is not None and generation != self.generation:
+                return fresh
+            self._postings, self._rows, self._dates = fresh._postings, fresh._rows, fresh._dates
+            self._fold = fresh._fold
+            self.ready = True
+            return self
+
+    def add(self, employee_id: int, name: str, department: str, designation: str, date_of_joining) -> None:
+        """Add a newly created employee to the index."""
+        with self._lock:
+            self._add(employee_id, name, department, designation, date_of_joining)
+
+    def on_employees_created(self, employees) -> None:
+        """Write listener: index new employees once the index has been built."""
+        with self._lock:
+            self.generation += 1
+            if not self.ready:
+                return
+            for employee in employees:
+                self._add(
+                    employee.id,
+                    employee.name,
+                    employee.department,
+                    employee.designation,
+                    employee.date_of_joining
+                )
+
+    def reset(self) -> None:
+        """Drop the index so the next search rebuilds it from the database."""
+        with self._lock:
+            self._postings = defaultdict(set)
+            self._rows = {}
+            self._dates = {}
+            self._fold = index_fold()
+            self.ready = False
+            self.generation += 1
+
+    def _add(self, employee_id: int, name: str, department: str, designation: str, date_of_joining) -> None:
+        name_lower = self._fold(name)
+        department_lower = self._fold(department)
+        date_of_joining = self._dates.setdefault(date_of_joining, date_of_joining)
+        self._rows[employee_id] = (
+            name,
+            name_lower,
+            department_lower,
+            facet_values(department, designation, date_of_joining),
+            date_of_joining
+        )
+        for gram in _grams(name_lower) | _grams(department_lower):
+            self._postings[gram].add(employee_id)
+
+    def search(
+        self,
+        term: str,
+        limit: int,
+        offset: int,
+        after: Optional[Tuple[str, int]] = None,
+        facet_fields: Sequence[str] = (),
+        where: Optional[Callable[[str, str, date], bool]] = None
+    ) -> Tuple[List[int], int, Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Find employees whose name or department contains the term.
+
+        Args:
+            term: Search term (stripped, at least 3 characters)
+            limit: Maximum number of IDs to return
+            offset: Number of matches to skip
+            after: Optional (name, id) keyset; only matches sorting after it are paged
+            facet_fields: Facets to count over all matches (not just the page)
+            where: Optional (department, designation, date_of_joining) predicate
+                every match must also satisfy
+
+        Returns:
+            Tuple of (page of employee IDs ordered by name, total match count,
+            facet counts or None if no facets were requested)
+        """
+        term_lower = self._fold(term)
+        with self._lock:
+            rows = self._rows
+            matches = self._matches(term_lower)
+            if not matches:
+                return [], 0, format_facets(tally_values(()), facet_fields) if facet_fields else None
+            if where is not None:
+                matches = [
+                    employee_id for employee_id in matches
+                    if where(rows[employee_id][3][0], rows[employee_id][3][1], rows[employee_id][4])
+                ]
+
+            def sort_key(employee_id: int) -> Tuple[str, int]:
+                return rows[employee_id][0], employee_id
+
+            page_candidates = matches
+            if after is not None:
+                page_candidates = [i for i in matches if sort_key(i) > after]
+            page = heapq.nsmallest(offset + limit, page_candidates, key=sort_key)
+
+            facets = None
+            if facet_fields:
+                facets = format_facets(tally_values(rows[i][3] for i in matches), facet_fields)
+        return page[offset:], len(matches), facets
+
+    def candidates(self, term: str) -> Optional[Set[int]]:
+        """
+        IDs of employees whose folded name or department contains the folded term.
+
+        On an index that is not `exact` this is a superset of the database's
+        matches, for narrowing the SQL search to.
+
+        Returns:
+            The IDs, or None if the folded term is too short to look up
+            (accents dropped by fold_broadly can shorten it)
+        """
+        term_lower = self._fold(term)
+        if len(term_lower) < GRAM_SIZE:
+            return None
+        with self._lock:
+            return set(self._matches(term_lower))
+
+    def _matches(self, term_lower: str) -> List[int]:
+        """IDs whose folded name or department contains a folded term of 3+ characters; hold the lock."""
+        postings = [self._postings.get(gram) for gram in _grams(term_lower)]
+        if not postings or any(not p for p in postings):
+            return []
+        postings.sort(key=len)
+        rows = self._rows
+        return [
+            employee_id for employee_id in postings[0].intersection(*postings[1:])
+            if term_lower in rows[employee_id][1] or term_lower in rows[employee_id][2]
+        ]
+
+
+# Shared index instance for this worker process
+trigram_index = TrigramIndex()
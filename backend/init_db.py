@@ -2,13 +2,36 @@
 Database initialization script.
 Creates all tables defined in models.py
 """
+from sqlalchemy import Column, Index, MetaData, String, Table, inspect
 from database import engine, Base
 from models import Employee
+from repositories.change_feed import ensure_change_feed
+from repositories.fulltext_search import ensure_fulltext_index
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Indexes models.py used to declare, with their columns: idx_department is a
+# prefix of idx_department_name, which serves every department lookup it did
+RETIRED_INDEXES = {"idx_department": ("department",)}
+
+
+def drop_retired_indexes(connection) -> list:
+    """
+    Drop RETIRED_INDEXES from a database created before they were retired.
+    
+    Returns:
+        Names of the indexes dropped
+    """
+    existing = {index["name"] for index in inspect(connection).get_indexes(Employee.__tablename__)}
+    dropped = [name for name in RETIRED_INDEXES if name in existing]
+    for name in dropped:
+        columns = RETIRED_INDEXES[name]
+        table = Table(Employee.__tablename__, MetaData(), *(Column(column, String) for column in columns))
+        Index(name, *(table.c[column] for column in columns)).drop(bind=connection)
+    return dropped
+
 
 def init_db():
     """Create all database tables."""
@@ -16,7 +39,21 @@ def init_db():
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
         logger.info("✓ Database tables created successfully!")
+        # Change sequence column for tables created before the change feed
+        with engine.begin() as connection:
+            if ensure_change_feed(connection):
+                logger.info("✓ Change sequence added to existing employees")
+        # create_all skips existing tables, so add indexes introduced since
+        for index in Employee.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
         logger.info("✓ Indexes created for optimized search performance")
+        with engine.begin() as connection:
+            for name in drop_retired_indexes(connection):
+                logger.info(f"✓ Dropped retired index {name}")
+        # Full-text index for search_backend="fulltext" (no-op for "like")
+        with engine.begin() as connection:
+            if ensure_fulltext_index(connection):
+                logger.info("✓ Full-text search index created")
         return True
     except Exception as e:
         logger.error(f"✗ Failed to create database tables: {str(e)}")
@@ -1,8 +1,12 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from routers import employees
 from config import settings
+from metrics import MetricsMiddleware, TimedORJSONResponse, render_metrics
+from http_cache import ConditionalGetMiddleware
+from compression import CompressionMiddleware
+import asyncio
 import logging
 
 # Configure logging
@@ -15,106 +19,71 @@ app = FastAPI(
     description="API for searching and managing employee information",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=TimedORJSONResponse
 )
 
 
+STARTUP_MODES = ("full", "lean")
+
+
+def initialize_database() -> None:
+    """Create tables, seed an empty database and build the autocomplete index."""
+    # Imported here so lean boots never load the seeding code
+    from database import SessionLocal
+    from init_db import init_db
+    from seed_data import seed_if_empty
+    from repositories.employee_repository import EmployeeRepository
+    
+    logger.info("Initializing database...")
+    if not init_db():
+        return
+    seed_if_empty(50)
+    
+    db = SessionLocal()
+    db.info["use_primary"] = True
+    try:
+        # Autocomplete is answered from memory; build it before the first keystroke
+        EmployeeRepository(db).ensure_prefix_index()
+        logger.info("✓ Autocomplete index ready")
+    finally:
+        db.close()
+
+
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup."""
-    try:
-        from database import engine, Base, SessionLocal
-        from models import Employee
-        import random
-        from datetime import date, timedelta
-        
-        logger.info("Initializing database...")
-        
-        # Create tables if they don't exist
-        Base.metadata.create_all(bind=engine)
-        logger.info("✓ Database tables ready")
-        
-        # Check if database has data
-        db = SessionLocal()
+    """
+    Prepare this worker according to STARTUP_MODE.
+    
+    "lean" (the default) does no database work (run init_db.py and
+    seed_data.py --if-empty at deploy time; in-memory indexes are built on
+    first use), so a cold start only pays for imports and the optional pool
+    warm-up. "full" initializes the database on every boot, which is
+    convenient locally; it runs in a worker thread, as its queries and the
+    autocomplete index build are blocking.
+    """
+    if settings.startup_mode not in STARTUP_MODES:
+        raise ValueError(f"Unknown startup mode: {settings.startup_mode}")
+    
+    if settings.startup_mode == "full":
         try:
-            employee_count = db.query(Employee).count()
-            
-            if employee_count == 0:
-                logger.info("No employees found. Seeding database with 50 sample employees...")
-                
-                # Sample data arrays
-                first_names = ["Rahul", "Priya", "Amit", "Sneha", "Vikram", "Anjali", "Rohan", "Neha", 
-                              "Arjun", "Pooja", "Karan", "Divya", "Sanjay", "Riya", "Aditya", "Kavya",
-                              "Rajesh", "Meera", "Suresh", "Ananya", "Nikhil", "Shreya", "Varun", "Ishita"]
-                
-                last_names = ["Kumar", "Sharma", "Singh", "Patel", "Gupta", "Reddy", "Rao", "Verma",
-                             "Mehta", "Joshi", "Shah", "Desai", "Nair", "Iyer", "Agarwal", "Chopra"]
-                
-                departments = ["Engineering", "Product", "Design", "Marketing", "Sales", "HR", 
-                              "Finance", "Operations", "Customer Success", "Data Science"]
-                
-                designations = {
-                    "Engineering": ["Software Engineer", "Senior Software Engineer", "Tech Lead", "Engineering Manager"],
-                    "Product": ["Product Manager", "Senior Product Manager", "Product Owner"],
-                    "Design": ["UI/UX Designer", "Senior Designer", "Design Lead"],
-                    "Marketing": ["Marketing Manager", "Content Writer", "SEO Specialist"],
-                    "Sales": ["Sales Executive", "Account Manager", "Sales Manager"],
-                    "HR": ["HR Manager", "HR Executive", "Recruiter"],
-                    "Finance": ["Accountant", "Finance Manager", "Financial Analyst"],
-                    "Operations": ["Operations Manager", "Operations Executive"],
-                    "Customer Success": ["Customer Success Manager", "Support Engineer"],
-                    "Data Science": ["Data Scientist", "Data Analyst", "ML Engineer"]
-                }
-                
-                # Generate 50 employees
-                employees_data = []
-                used_emails = set()
-                
-                for i in range(50):
-                    first_name = random.choice(first_names)
-                    last_name = random.choice(last_names)
-                    name = f"{first_name} {last_name}"
-                    
-                    # Generate unique email
-                    email_base = f"{first_name.lower()}.{last_name.lower()}"
-                    email = f"{email_base}@company.com"
-                    counter = 1
-                    while email in used_emails:
-                        email = f"{email_base}{counter}@company.com"
-                        counter += 1
-                    used_emails.add(email)
-                    
-                    department = random.choice(departments)
-                    designation = random.choice(designations[department])
-                    
-                    # Random date in the last 5 years
-                    days_ago = random.randint(0, 365 * 5)
-                    date_of_joining = date.today() - timedelta(days=days_ago)
-                    
-                    employees_data.append({
-                        "name": name,
-                        "email": email,
-                        "department": department,
-                        "designation": designation,
-                        "date_of_joining": date_of_joining
-                    })
-                
-                # Insert all employees
-                for emp_data in employees_data:
-                    employee = Employee(**emp_data)
-                    db.add(employee)
-                
-                db.commit()
-                logger.info(f"✓ Added {len(employees_data)} sample employees")
-            else:
-                logger.info(f"✓ Database already has {employee_count} employees")
-                
-        finally:
-            db.close()
-            
-    except Exception as e:
-        logger.error(f"Database initialization failed: {str(e)}")
-        # Don't crash the app, just log the error
+            await asyncio.to_thread(initialize_database)
+        except Exception as e:
+            logger.error(f"Database initialization failed: {str(e)}")
+            # Don't crash the app, just log the error
+    
+    if settings.startup_pool_warmup > 0:
+        from database import warm_up_pool
+        try:
+            opened = await warm_up_pool(settings.startup_pool_warmup)
+            if opened:
+                logger.info(f"✓ Opened {opened} pooled database connections")
+        except Exception as e:
+            logger.error(f"Connection pool warm-up failed: {str(e)}")
+
+# ETag / Last-Modified validators and 304s for employee reads; added before
+# CORS so 304 responses still get CORS headers
+app.add_middleware(ConditionalGetMiddleware, path_prefix="/api/employees")
 
 # Configure CORS
 app.add_middleware(
@@ -125,6 +94,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip / brotli for large enough bodies, including streamed exports
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_bytes)
+
+# Outermost middleware so latency covers CORS handling and compression as well
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(employees.router)
 
@@ -145,15 +120,26 @@ async def health_check():
     """Health check endpoint."""
     try:
         # Try to import database to verify configuration
-        from database import engine
+        from database import async_engine
+        from sqlalchemy import text
         
-        # Test database connection
-        with engine.connect() as connection:
-            connection.execute("SELECT 1")
+        # Test database connection with a pooled connection, without blocking the event loop
+        async with async_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        
+        from services.search_cache import search_result_cache
+        from services.single_flight import search_flights
+        from indexes.directory_snapshot import directory_snapshot
+        from indexes.snapshot_file import mapped_snapshot
         
         return {
             "status": "healthy",
-            "database": "connected"
+            "database": "connected",
+            "search_cache": search_result_cache.stats(),
+            "search_coalescing": search_flights.stats(),
+            "directory_snapshot": (
+                mapped_snapshot if settings.snapshot_file_path else directory_snapshot
+            ).stats()
         }
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -167,6 +153,12 @@ async def health_check():
         )
 
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: per-route latency, SQL time, pool waits and serialization."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Custom HTTP exception handler."""
@@ -0,0 +1,265 @@
+"""
+Request and database metrics with a Prometheus text exposition.
+
+- MetricsMiddleware times every request and labels it with the route template
+- SQLAlchemy cursor events count statements and add up SQL time, and log
+  statements slower than settings.slow_query_threshold_ms
+- Timed pool classes record how long a request waited for a pooled connection
+- TimedORJSONResponse records the time spent encoding response bodies
+
+Per-request numbers are collected on a RequestStats object held in a context
+variable, then folded into per-route counters and histograms when the request
+finishes. Recording is a handful of additions per request, cheap enough to stay
+on in production.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+class RequestStats:
+    """Database and serialization measurements for one request."""
+    
+    __slots__ = ("queries", "slow_queries", "sql_seconds", "pool_wait_seconds", "serialization_seconds")
+    
+    def __init__(self):
+        self.queries = 0
+        self.slow_queries = 0
+        self.sql_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+        self.serialization_seconds = 0.0
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, keyed by label values."""
+    
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+    
+    def observe(self, label_values: Tuple[str, ...], value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+    
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            labels = _format_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{labels}}} {series[-1]}")
+        return "\n".join(lines)
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+    
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, label_values: Tuple[str, ...], amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+    
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{{{_format_labels(self.labels, label_values)}}} {value}")
+        return "\n".join(lines)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for value in values)
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, escaped))
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status.", ("method", "route", "status"))
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Total request latency.", ("method", "route"), LATENCY_BUCKETS
+)
+SQL_DURATION = Histogram(
+    "db_sql_duration_seconds", "Time spent executing SQL per request.", ("route",), LATENCY_BUCKETS
+)
+QUERY_COUNT = Histogram(
+    "db_queries_per_request", "SQL statements executed per request.", ("route",), QUERY_COUNT_BUCKETS
+)
+POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection per request.", ("route",), LATENCY_BUCKETS
+)
+SERIALIZATION = Histogram(
+    "response_serialization_seconds", "Time spent encoding the response body.", ("route",), LATENCY_BUCKETS
+)
+SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than slow_query_threshold_ms.", ("route",))
+
+_registry = (REQUESTS, REQUEST_DURATION, SQL_DURATION, QUERY_COUNT, POOL_WAIT, SERIALIZATION, SLOW_QUERIES)
+_registry_lock = threading.Lock()
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and database usage."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+        
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_stats.reset(token)
+            route = scope.get("route")
+            route_path = route.path if route is not None else "unmatched"
+            _record_request(scope["method"], route_path, status_code, elapsed, stats)
+
+
+def _record_request(method: str, route: str, status_code: int, elapsed: float, stats: RequestStats) -> None:
+    with _registry_lock:
+        REQUESTS.inc((method, route, str(status_code)))
+        REQUEST_DURATION.observe((method, route), elapsed)
+        QUERY_COUNT.observe((route,), stats.queries)
+        if stats.queries:
+            SQL_DURATION.observe((route,), stats.sql_seconds)
+            POOL_WAIT.observe((route,), stats.pool_wait_seconds)
+        if stats.slow_queries:
+            SLOW_QUERIES.inc((route,), stats.slow_queries)
+        if stats.serialization_seconds:
+            SERIALIZATION.observe((route,), stats.serialization_seconds)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.sql_seconds += elapsed
+    threshold_ms = settings.slow_query_threshold_ms
+    if threshold_ms and elapsed * 1000 >= threshold_ms:
+        logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())[:500]}")
+        if stats is not None:
+            stats.slow_queries += 1
+
+
+def install_engine_hooks(sync_engine) -> None:
+    """Attach SQL timing hooks to an Engine (use `async_engine.sync_engine` for async engines)."""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _record_pool_wait(started: float) -> None:
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.pool_wait_seconds += time.perf_counter() - started
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited."""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _record_pool_wait(started)
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited."""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _record_pool_wait(started)
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse that records body encoding time on the current request."""
+    
+    def render(self, content) -> bytes:
+        started = time.perf_counter()
+        body = super().render(content)
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.serialization_seconds += time.perf_counter() - started
+        return body
+
+
+def render_metrics() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    from services.search_cache import search_result_cache
+    from services.single_flight import search_flights
+    
+    with _registry_lock:
+        sections = [metric.render() for metric in _registry]
+    cache = search_result_cache.stats()
+    flights = search_flights.stats()
+    sections.append(
+        "# HELP search_cache_hits_total Search result cache hits.\n"
+        "# TYPE search_cache_hits_total counter\n"
+        f"search_cache_hits_total {cache['hits']}\n"
+        "# HELP search_cache_misses_total Search result cache misses.\n"
+        "# TYPE search_cache_misses_total counter\n"
+        f"search_cache_misses_total {cache['misses']}"
+    )
+    sections.append(
+        "# HELP search_executions_total Searches run by the coalescer (no identical search was in flight).\n"
+        "# TYPE search_executions_total counter\n"
+        f"search_executions_total {flights['executions']}\n"
+        "# HELP search_coalesced_total Searches that joined an identical search already in flight.\n"
+        "# TYPE search_coalesced_total counter\n"
+        f"search_coalesced_total {flights['coalesced']}"
+    )
+    return "\n".join(sections) + "\n"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Index
+from sqlalchemy import BigInteger, Column, Date, DateTime, Index, Integer, String
 from database import Base
 
 
@@ -8,8 +8,16 @@ class Employee(Base):
     
     Indexes:
     - idx_name: For fast name searches
-    - idx_department: For fast department searches
     - idx_name_department: Composite index for searches on both fields
+    - idx_department_name, idx_designation_name, idx_department_designation_name:
+      Exact department / designation filters; the trailing name column (plus
+      the primary key InnoDB appends) returns matches already in page order
+    - idx_date_of_joining: Joining date ranges
+    - idx_change_seq: Change feed range scans (GET /api/employees/changes)
+    
+    repositories.employee_filters chooses among the filter indexes per query.
+    change_seq is the sequence number of the last write to the row, allocated
+    by repositories.change_feed; every insert and update must set it.
     """
     __tablename__ = "employees"
     
@@ -19,12 +27,17 @@ class Employee(Base):
     department = Column(String(100), nullable=False)
     designation = Column(String(100), nullable=False)
     date_of_joining = Column(Date, nullable=False)
+    change_seq = Column(BigInteger, nullable=False)
     
     # Define indexes for optimized search performance
     __table_args__ = (
         Index('idx_name', 'name'),
-        Index('idx_department', 'department'),
         Index('idx_name_department', 'name', 'department'),
+        Index('idx_department_name', 'department', 'name'),
+        Index('idx_designation_name', 'designation', 'name'),
+        Index('idx_department_designation_name', 'department', 'designation', 'name'),
+        Index('idx_date_of_joining', 'date_of_joining'),
+        Index('idx_change_seq', 'change_seq', unique=True),
     )
     
     def to_dict(self):
@@ -37,3 +50,32 @@ class Employee(Base):
             "designation": self.designation,
             "date_of_joining": self.date_of_joining.isoformat() if self.date_of_joining else None
         }
+
+
+class EmployeeTombstone(Base):
+    """
+    Change feed entry for a deleted employee.
+    
+    Deleting a row would drop its change_seq from the feed, so delete paths
+    record the deletion here under a newly allocated sequence number.
+    """
+    __tablename__ = "employee_tombstones"
+    
+    change_seq = Column(BigInteger, primary_key=True, autoincrement=False)
+    employee_id = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, nullable=False)
+
+
+class ChangeSequence(Base):
+    """
+    Named monotonic counters; the "employees" row hands out change_seq values.
+    
+    Its value is also the directory data version behind the HTTP validators,
+    and modified_at (Unix seconds, strictly increasing per allocation) the
+    time of the last change.
+    """
+    __tablename__ = "change_sequences"
+    
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False)
+    modified_at = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,32 @@
+"""
+Opaque cursor helpers for keyset pagination.
+
+A cursor encodes the sort key (name, id) of the last employee on a page so the
+next page can seek past it with an index range scan instead of an OFFSET.
+"""
+import base64
+import json
+from typing import Tuple
+
+
+def encode_cursor(name: str, employee_id: int) -> str:
+    """Encode the (name, id) sort key of the last row into an opaque cursor."""
+    payload = json.dumps([name, employee_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode an opaque cursor back into its (name, id) sort key.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, employee_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(name, str) or not isinstance(employee_id, int):
+        raise ValueError("Invalid cursor")
+    return name, employee_id
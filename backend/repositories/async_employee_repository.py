@@ -0,0 +1,472 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, insert
+from sqlalchemy.engine import Row
+from models import Employee
+from config import settings
+from database import AsyncSessionLocal
+from indexes.trigram_index import TrigramIndex, trigram_index
+from indexes.facet_counts import facet_counts, format_facets, tally_grouped
+from indexes.prefix_index import PrefixIndex, prefix_index
+from indexes.fuzzy_index import FuzzyIndex, fuzzy_index
+from indexes.directory_snapshot import SnapshotReads, directory_snapshot
+from indexes.snapshot_file import mapped_snapshot
+from repositories.change_feed import allocate_change_seqs, changed_employees_query, stamp_change_seqs, tombstones_query
+from repositories.count_cache import search_count_cache
+from repositories.data_version import data_version
+from repositories.write_hooks import notify_employees_created
+from repositories.employee_filters import EmployeeFilters, apply_filters
+from repositories.fulltext_search import FulltextMatch, fulltext_match
+from repositories.identity_map import IdentityMap
+from repositories.employee_repository import search_filter, after_keyset, facet_group_query, EMPLOYEE_COLUMNS
+from services.single_flight import SingleFlight
+from typing import AsyncIterator, Dict, List, Tuple, Optional, Set, Sequence, TypeVar
+
+# Rows fetched per round trip while loading an in-memory index
+INDEX_BUILD_BATCH_SIZE = 10000
+
+# Largest candidate set (trigram index or snapshot) a search is narrowed to
+# (`id IN (...)`) when they cannot answer it themselves (MySQL); broader terms
+# are left to SQL alone
+MAX_NARROWED_CANDIDATES = 5000
+
+# Builds a request runs while writes keep discarding them; after the last it
+# answers from its own unpublished build
+INDEX_BUILD_ATTEMPTS = 3
+
+# In-memory index builds in flight in this worker, keyed by index; concurrent
+# first requests await the one build instead of each loading the table
+index_builds = SingleFlight()
+
+IndexT = TypeVar("IndexT", TrigramIndex, FuzzyIndex, PrefixIndex)
+
+
+class AsyncEmployeeRepository:
+    """
+    Repository layer for employee database operations.
+    Every query is awaited on an AsyncSession so the event loop stays free
+    while the database works.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        # Rows loaded by ID during this request (the repository is per request)
+        self.identity_map = IdentityMap()
+    
+    async def search_employees(
+        self,
+        search_term: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Tuple[str, int]] = None,
+        include_total: bool = True,
+        facet_fields: Sequence[str] = (),
+        filters: Optional[EmployeeFilters] = None,
+        columns: Tuple = EMPLOYEE_COLUMNS
+    ) -> Tuple[List[Row], Optional[int], Optional[Dict[str, Dict[str, int]]]]:
+        """
+        Search employees by name or department with pagination.
+        
+        Args:
+            search_term: Search query for name or department (case-insensitive)
+            limit: Maximum number of results to return
+            offset: Number of results to skip (for pagination)
+            after: Optional (name, id) keyset; only rows sorting after it are returned
+            include_total: Whether to compute the total match count
+            facet_fields: Facets (see indexes.facet_counts.FACET_FIELDS) to count
+                over all matches
+            filters: Exact department / designation and joining date range,
+                combined with the search term
+            columns: EMPLOYEE_COLUMNS, or a sparse fieldset from select_columns
+        
+        Returns:
+            Tuple of (employee rows, total count or None if not requested,
+            facet counts or None if not requested)
+        
+        Performance:
+        - Uses LIKE with indexes for fast searches
+        - With search_backend="fulltext", terms go to MySQL FULLTEXT / SQLite
+          FTS5 instead and come back ranked by relevance (see
+          repositories.fulltext_search)
+        - In snapshot serving mode the in-memory directory snapshot answers
+          without SQL (on MySQL it narrows the LIKE, as the trigram index does)
+        - Terms of 3+ characters are narrowed through the in-memory trigram
+          index first, so the leading-wildcard LIKE never scans the table; on
+          MySQL, whose collation Python cannot reproduce, the LIKE still runs
+          but only over the index's candidate IDs (up to
+          MAX_NARROWED_CANDIDATES)
+        - Totals are cached per normalized term (invalidated on writes), so
+          repeat searches and further pages skip the COUNT(*) entirely
+        - Facets never cost an extra query: unfiltered counts come from the
+          in-memory aggregates, filtered ones from the trigram match set or
+          from a GROUP BY that also replaces the COUNT(*)
+        - Structured filters are planned by repositories.employee_filters so
+          the most selective filter index drives the query; on the trigram
+          path they are checked against the in-memory match set
+        - Employees are Core rows rather than ORM instances, which skips
+          identity-map bookkeeping and object hydration
+        """
+        term = search_term.strip() if search_term else ""
+        ranked = fulltext_match(term)
+        narrowed = None
+        if ranked is None and settings.snapshot_serving_enabled and directory_snapshot.can_answer(term):
+            snapshot = await self._serving_snapshot()
+            if snapshot is not None:
+                if snapshot.exact:
+                    return snapshot.search(term, limit, offset, after, facet_fields, filters)
+                narrowed = snapshot.candidates(term)
+        if (
+            narrowed is None and ranked is None and term and settings.search_index_enabled
+            and trigram_index.can_answer(term)
+        ):
+            index = await self._ensure_trigram_index()
+            if index.exact:
+                employee_ids, total, facets = index.search(
+                    term, limit, offset, after, facet_fields, filters.matches if filters else None
+                )
+                return await self.get_employee_rows_by_ids(employee_ids, columns), total, facets
+            narrowed = index.candidates(term)
+        if narrowed is not None and len(narrowed) > MAX_NARROWED_CANDIDATES:
+            narrowed = None
+        
+        # Structured filters first, so the driving index leads the WHERE clause
+        # (a full-text match brings its own index and takes no hint)
+        query = apply_filters(select(*columns), filters, hint=ranked is None)
+        if ranked is not None:
+            query = ranked.apply(query)
+        elif term:
+            query = query.where(search_filter(term))
+            if narrowed is not None:
+                query = query.where(Employee.id.in_(narrowed))
+        
+        count_key = search_count_cache.normalize(term, filters.key() if filters else "")
+        if facet_fields:
+            generation = search_count_cache.generation
+            total, facets = await self._facets(term, facet_fields, filters, ranked, narrowed)
+            search_count_cache.set(count_key, total, generation)
+            employees, _ = await self._paginate(query, limit, offset, after, False, count_key, ranked)
+            return employees, total, facets
+        employees, total = await self._paginate(query, limit, offset, after, include_total, count_key, ranked)
+        return employees, total, None
+    
+    async def _facets(
+        self,
+        term: str,
+        facet_fields: Sequence[str],
+        filters: Optional[EmployeeFilters] = None,
+        ranked: Optional[FulltextMatch] = None,
+        narrowed: Optional[Set[int]] = None
+    ) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """
+        Return (total, facet counts) for a stripped term and filters; neither means the whole directory.
+        
+        `narrowed` is a superset of the term's matches from the trigram index, as in search_employees.
+        """
+        whole_directory = not term and not filters
+        if whole_directory and facet_counts.ready:
+            return facet_counts.total, facet_counts.snapshot(facet_fields)
+        generation = facet_counts.generation
+        rows = (await self.db.execute(facet_group_query(term, filters, ranked, narrowed))).all()
+        if whole_directory:
+            # Discarded if a write landed while the query ran; this request still answers from its rows
+            facet_counts.build(rows, generation)
+        counts, total = tally_grouped(rows)
+        return total, format_facets(counts, facet_fields)
+    
+    async def _paginate(
+        self,
+        query,
+        limit: int,
+        offset: int,
+        after: Optional[Tuple[str, int]],
+        include_total: bool,
+        count_key: str,
+        ranked: Optional[FulltextMatch] = None
+    ) -> Tuple[List[Row], Optional[int]]:
+        """Apply ordering (relevance first for full-text matches), pagination and the cached total."""
+        total = None
+        if include_total:
+            generation = search_count_cache.generation
+            total = search_count_cache.get(count_key)
+            if total is None:
+                total = await self.db.scalar(
+                    select(func.count()).select_from(query.subquery())
+                )
+                search_count_cache.set(count_key, total, generation)
+        
+        if after is not None:
+            query = query.where(after_keyset(after))
+        order = ranked.order_by() if ranked is not None else (Employee.name, Employee.id)
+        query = query.order_by(*order).limit(limit).offset(offset)
+        employees = (await self.db.execute(query)).all()
+        return list(employees), total
+    
+    async def _ensure_trigram_index(self) -> TrigramIndex:
+        """Build the trigram index from the employees table on first use; returns the index to search."""
+        return await _build_index(
+            "trigram",
+            trigram_index,
+            select(Employee.id, Employee.name, Employee.department, Employee.designation, Employee.date_of_joining),
+        )
+    
+    async def _ensure_snapshot(self) -> None:
+        """
+        Build the directory snapshot on first use, then keep it current.
+        
+        The first build runs like the index builds (see _build_index): shared
+        by concurrent first requests, in a session of its own, streamed in
+        batches and indexed in a worker thread. Writes during it need no
+        generation check, since the catch-up below follows it.
+        
+        A snapshot behind the request's data version, stale (another process
+        wrote) or older than settings.snapshot_refresh_seconds catches up with
+        a change feed delta: two index range scans instead of a reload.
+        """
+        if not directory_snapshot.ready:
+            await index_builds.do("snapshot", _build_snapshot)
+        if (
+            directory_snapshot.needs_refresh()
+            or directory_snapshot.seq < await data_version.for_request(self.db)
+        ):
+            employees, tombstones = await self.get_changes(directory_snapshot.seq, None)
+            await asyncio.to_thread(directory_snapshot.apply_changes, employees, tombstones)
+    
+    async def _serving_snapshot(self) -> Optional[SnapshotReads]:
+        """
+        The snapshot to serve from in snapshot serving mode, or None for SQL.
+        
+        With settings.snapshot_file_path the workers share the file published
+        by snapshot_builder.py. It is only used while it holds every change up
+        to the request's data version: after a write, reads go to the database
+        until the builder has published the change. Otherwise this worker's
+        own snapshot is built or brought up to date.
+        """
+        if not settings.snapshot_serving_enabled:
+            return None
+        if settings.snapshot_file_path:
+            if mapped_snapshot.refresh() and mapped_snapshot.seq >= await data_version.for_request(self.db):
+                return mapped_snapshot
+            return None
+        await self._ensure_snapshot()
+        return directory_snapshot
+    
+    async def fuzzy_search_employees(
+        self,
+        search_term: str,
+        limit: int = 50,
+        offset: int = 0,
+        columns: Tuple = EMPLOYEE_COLUMNS
+    ) -> Tuple[List[Row], int]:
+        """
+        Typo-tolerant search over name and department words.
+        
+        Args:
+            search_term: Search query, possibly misspelled
+            limit: Maximum number of results to return
+            offset: Number of ranked results to skip
+            columns: EMPLOYEE_COLUMNS, or a sparse fieldset from select_columns
+        
+        Returns:
+            Tuple of (employee rows ranked by edit distance then name, total matches)
+        
+        Performance:
+        - Answered by the in-memory SymSpell index; SQL only fetches the page
+          by primary key
+        """
+        index = await self._ensure_fuzzy_index()
+        ranked, total = index.search(search_term, limit, offset)
+        return await self.get_employee_rows_by_ids([employee_id for employee_id, _ in ranked], columns), total
+    
+    async def _ensure_fuzzy_index(self) -> FuzzyIndex:
+        """Build the fuzzy index from the employees table on first use; returns the index to search."""
+        return await _build_index("fuzzy", fuzzy_index, select(Employee.id, Employee.name, Employee.department))
+    
+    async def ensure_prefix_index(self) -> PrefixIndex:
+        """Build the autocomplete prefix index from the employees table if needed; returns the index to ask."""
+        return await _build_index("prefix", prefix_index, select(Employee.name, Employee.department))
+    
+    async def get_employee_rows_by_ids(
+        self,
+        employee_ids: List[int],
+        columns: Tuple = EMPLOYEE_COLUMNS
+    ) -> List[Row]:
+        """
+        Fetch employee rows by ID, preserving the order of the given IDs.
+        
+        IDs already looked up in this request come from the identity map; the
+        rest are fetched with a single IN query. Missing IDs are skipped and
+        repeated IDs repeat their row. Sparse rows (other `columns`) bypass the
+        identity map, which only holds complete rows. In snapshot serving mode
+        complete rows come from memory whatever `columns` asks for.
+        """
+        snapshot = await self._serving_snapshot()
+        if snapshot is not None:
+            return snapshot.get_rows(employee_ids)
+        if columns is not EMPLOYEE_COLUMNS:
+            if not employee_ids:
+                return []
+            result = await self.db.execute(select(*columns).where(Employee.id.in_(set(employee_ids))))
+            by_id = {row.id: row for row in result}
+            return [by_id[employee_id] for employee_id in employee_ids if employee_id in by_id]
+        unloaded = self.identity_map.unloaded(employee_ids)
+        queried = [employee_id for employee_id in unloaded if employee_id > 0]
+        rows = []
+        if queried:
+            result = await self.db.execute(select(*EMPLOYEE_COLUMNS).where(Employee.id.in_(queried)))
+            rows = result.all()
+        self.identity_map.load(unloaded, rows)
+        found = (self.identity_map.get(employee_id) for employee_id in employee_ids)
+        return [row for row in found if row is not None]
+    
+    async def get_changes(self, since: int, limit: Optional[int]) -> Tuple[List[Row], List[Row]]:
+        """
+        Employees written and deleted after change sequence `since`.
+        
+        Each list holds at most `limit` rows (None: all) ordered by change_seq and comes
+        from a range scan on its sequence index; the caller merges them.
+        
+        Returns:
+            Tuple of (rows of change_seq plus EMPLOYEE_COLUMNS, tombstone rows)
+        """
+        employees = (await self.db.execute(changed_employees_query(since, limit, EMPLOYEE_COLUMNS))).all()
+        tombstones = (await self.db.execute(tombstones_query(since, limit))).all()
+        return employees, tombstones
+    
+    async def get_employee_by_id(self, employee_id: int) -> Optional[Employee]:
+        """Get a single employee by ID."""
+        return await self.db.get(Employee, employee_id)
+    
+    async def get_employee_by_email(self, email: str) -> Optional[Employee]:
+        """Get a single employee by email."""
+        return await self.db.scalar(select(Employee).where(Employee.email == email).limit(1))
+    
+    async def create_employee(self, employee_data: dict) -> Employee:
+        """Create a new employee."""
+        employee = Employee(**employee_data)
+        employee.change_seq = (await self.db.run_sync(allocate_change_seqs, 1))[0]
+        self.db.add(employee)
+        await self.db.commit()
+        await self.db.refresh(employee)
+        notify_employees_created([employee])
+        return employee
+    
+    async def get_existing_emails(self, emails: Sequence[str]) -> Set[str]:
+        """Return the lowercased emails among `emails` that already exist, in one query."""
+        if not emails:
+            return set()
+        rows = await self.db.execute(select(Employee.email).where(Employee.email.in_(emails)))
+        return {email.lower() for (email,) in rows}
+    
+    async def bulk_create_employees(self, employees_data: List[dict], batch_size: int = 1000) -> List[int]:
+        """
+        Insert many employees in one transaction.
+        
+        Rows are sent as executemany batches of `batch_size`; the generated IDs
+        are then read back with a single query on the unique email index.
+        
+        Args:
+            employees_data: Validated employee dicts with unique emails
+            batch_size: Rows per executemany round trip
+        
+        Returns:
+            List of new employee IDs in the order of `employees_data`
+        """
+        if not employees_data:
+            return []
+        try:
+            rows = await self.db.run_sync(stamp_change_seqs, employees_data)
+            for start in range(0, len(employees_data), batch_size):
+                await self.db.execute(insert(Employee), rows[start:start + batch_size])
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        
+        emails = [row["email"] for row in employees_data]
+        created = (await self.db.execute(
+            select(Employee.__table__).where(Employee.email.in_(emails))
+        )).all()
+        notify_employees_created(created)
+        ids_by_email = {row.email.lower(): row.id for row in created}
+        return [ids_by_email[email.lower()] for email in emails]
+    
+    async def stream_employee_rows(
+        self,
+        search_term: Optional[str] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[tuple]]:
+        """
+        Stream matching employees as batches of plain column tuples.
+        
+        Uses a server-side cursor (`stream` with `yield_per`) and selects the
+        columns directly instead of hydrating Employee instances, so memory
+        stays flat regardless of how many rows match. Rows come out in ID order.
+        """
+        query = select(
+            Employee.id,
+            Employee.name,
+            Employee.email,
+            Employee.department,
+            Employee.designation,
+            Employee.date_of_joining
+        )
+        term = search_term.strip() if search_term else ""
+        if term:
+            query = query.where(search_filter(term))
+        query = query.order_by(Employee.id).execution_options(yield_per=batch_size)
+        
+        result = await self.db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
+
+async def _build_index(name: str, index: IndexT, query) -> IndexT:
+    """
+    Build an in-memory index (trigram, fuzzy or prefix) from `query` unless it is ready.
+    
+    Concurrent first requests share one build (index_builds). It reads in a
+    session of its own, since it can outlive the request that started it,
+    streaming the rows in batches; indexing them runs in a worker thread so
+    the event loop keeps serving meanwhile. A write or reset during the build
+    moves the index's generation and the build is discarded rather than
+    published without the new rows; the request then builds again, up to
+    INDEX_BUILD_ATTEMPTS times, so a steady stream of writes cannot hold it
+    forever. After the last attempt it answers from that build's unpublished
+    index, whose rows were read after the request began (only the first
+    attempt can have joined a build already in flight).
+    
+    Args:
+        name: Index name, the build's single-flight key
+        index: trigram_index, fuzzy_index or prefix_index
+        query: Select of the rows index.build takes
+    
+    Returns:
+        `index` once ready, else the last discarded build's index
+    """
+    async def build() -> IndexT:
+        generation = index.generation
+        rows = []
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query.execution_options(yield_per=INDEX_BUILD_BATCH_SIZE))
+            async for batch in result.partitions():
+                rows.extend(batch)
+        return await asyncio.to_thread(index.build, rows, generation)
+    
+    built = index
+    for _ in range(INDEX_BUILD_ATTEMPTS):
+        if index.ready:
+            return index
+        built = await index_builds.do(name, build)
+    return built
+
+
+async def _build_snapshot() -> None:
+    """Build the directory snapshot from every employee (see _ensure_snapshot)."""
+    rows = []
+    async with AsyncSessionLocal() as db:
+        query = select(Employee.change_seq, *EMPLOYEE_COLUMNS).order_by(Employee.id)
+        result = await db.stream(query.execution_options(yield_per=INDEX_BUILD_BATCH_SIZE))
+        async for batch in result.partitions():
+            rows.extend(batch)
+    await asyncio.to_thread(directory_snapshot.build, rows)
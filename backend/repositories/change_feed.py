@@ -0,0 +1,172 @@
+"""
+Monotonic change sequence behind GET /api/employees/changes.
+
+Every write stamps the rows it touches with the next values of one counter:
+- inserts and updates set `Employee.change_seq`
+- deletes add an `EmployeeTombstone` carrying the employee's ID
+
+so "what changed since N" is two range scans on indexed sequence columns,
+returning each changed employee once, in its latest state.
+
+Sequence numbers are allocated by incrementing the counter row, which locks
+it until the writing transaction ends. Writers therefore commit in sequence
+order, and a reader that has seen N can never later find a change numbered
+below N appear: consumers can resume from the last sequence they processed.
+The price is that writes are serialized from allocation to commit, so
+allocate right before writing, not at the start of a long transaction.
+
+The counter row doubles as the directory data version (see
+repositories.data_version): its value moves with every committed write, and
+each allocation also sets its modified_at to the time of the write.
+
+Usage in a write path, before the commit:
+    employee.change_seq = allocate_change_seqs(db, 1)[0]       # update
+    record_deletions(db, [employee.id]); db.delete(employee)   # delete
+"""
+import time
+from datetime import datetime
+from typing import List, Optional, Sequence, Union
+
+from sqlalchemy import case, func, insert, inspect, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models import ChangeSequence, Employee, EmployeeTombstone
+
+EMPLOYEE_SEQUENCE = "employees"
+
+Executor = Union[Session, Connection]
+
+
+def _highest_change_seq(executor: Executor) -> int:
+    """Highest sequence number in use, for initializing the counter."""
+    return max(
+        executor.execute(select(func.max(Employee.change_seq))).scalar() or 0,
+        executor.execute(select(func.max(EmployeeTombstone.change_seq))).scalar() or 0,
+    )
+
+
+def allocate_change_seqs(executor: Executor, count: int) -> range:
+    """
+    Allocate `count` consecutive sequence numbers in the current transaction.
+    
+    The counter row stays locked until the transaction commits or rolls back;
+    a rollback returns the numbers.
+    
+    Args:
+        executor: Session or Connection of the writing transaction (primary database)
+        count: Number of sequence numbers needed
+    
+    Returns:
+        The allocated numbers, ascending
+    """
+    now = int(time.time())
+    increment = (
+        update(ChangeSequence)
+        .where(ChangeSequence.name == EMPLOYEE_SEQUENCE)
+        .values(
+            value=ChangeSequence.value + count,
+            # The write's own time (never moving back when hosts' clocks
+            # disagree); changes within one second are told apart by the value
+            modified_at=case((ChangeSequence.modified_at > now, ChangeSequence.modified_at), else_=now)
+        )
+    )
+    if executor.execute(increment).rowcount == 0:
+        # First write to a database whose counter init_db.py never created.
+        # Concurrent first writers can all get here: the row is inserted
+        # unless one exists by now (another writer's insert waits on the key
+        # and is then ignored), and each writer increments it in turn
+        executor.execute(
+            insert(ChangeSequence)
+            .prefix_with("OR IGNORE", dialect="sqlite")
+            .prefix_with("IGNORE", dialect="mysql")
+            .values(name=EMPLOYEE_SEQUENCE, value=_highest_change_seq(executor), modified_at=0)
+        )
+        executor.execute(increment)
+    last = executor.execute(
+        select(ChangeSequence.value).where(ChangeSequence.name == EMPLOYEE_SEQUENCE)
+    ).scalar_one()
+    return range(last - count + 1, last + 1)
+
+
+def stamp_change_seqs(executor: Executor, rows: Sequence[dict]) -> List[dict]:
+    """Copies of employee insert rows with newly allocated change_seq values, in order."""
+    return [
+        dict(row, change_seq=seq)
+        for row, seq in zip(rows, allocate_change_seqs(executor, len(rows)))
+    ]
+
+
+def record_deletions(executor: Executor, employee_ids: Sequence[int]) -> None:
+    """Write tombstones for employees deleted in the current transaction."""
+    if not employee_ids:
+        return
+    deleted_at = datetime.utcnow()
+    executor.execute(insert(EmployeeTombstone), [
+        {"change_seq": seq, "employee_id": employee_id, "deleted_at": deleted_at}
+        for employee_id, seq in zip(employee_ids, allocate_change_seqs(executor, len(employee_ids)))
+    ])
+
+
+def data_version_query():
+    """The employees counter and its modified_at: the directory data version and its last change."""
+    return select(ChangeSequence.value, ChangeSequence.modified_at).where(ChangeSequence.name == EMPLOYEE_SEQUENCE)
+
+
+def changed_employees_query(since: int, limit: Optional[int], columns: tuple):
+    """Employees written after `since`, oldest change first (range scan on idx_change_seq)."""
+    return (
+        select(Employee.change_seq, *columns)
+        .where(Employee.change_seq > since)
+        .order_by(Employee.change_seq)
+        .limit(limit)
+    )
+
+
+def tombstones_query(since: int, limit: Optional[int]):
+    """Deletions recorded after `since`, oldest first (range scan on the primary key)."""
+    return (
+        select(EmployeeTombstone.change_seq, EmployeeTombstone.employee_id)
+        .where(EmployeeTombstone.change_seq > since)
+        .order_by(EmployeeTombstone.change_seq)
+        .limit(limit)
+    )
+
+
+def ensure_change_feed(connection: Connection) -> bool:
+    """
+    Add change_seq to an employees table created before the change feed existed.
+    
+    Existing rows are numbered by ID, so a consumer starting from 0 receives
+    every employee. Also initializes the counter, adding its modified_at
+    column where the table predates it. Run before creating the employees
+    indexes (idx_change_seq needs the column).
+    
+    Args:
+        connection: Connection to the primary database (committed by the caller)
+    
+    Returns:
+        True if the column was added, False if it existed
+    """
+    columns = {column["name"] for column in inspect(connection).get_columns("employees")}
+    added = "change_seq" not in columns
+    if added:
+        connection.execute(text("ALTER TABLE employees ADD COLUMN change_seq BIGINT NOT NULL DEFAULT 0"))
+        connection.execute(text("UPDATE employees SET change_seq = id"))
+    
+    now = int(time.time())
+    counter_columns = {column["name"] for column in inspect(connection).get_columns("change_sequences")}
+    if "modified_at" not in counter_columns:
+        connection.execute(text("ALTER TABLE change_sequences ADD COLUMN modified_at BIGINT NOT NULL DEFAULT 0"))
+        connection.execute(update(ChangeSequence).values(modified_at=now))
+    
+    exists = connection.execute(
+        select(ChangeSequence.value).where(ChangeSequence.name == EMPLOYEE_SEQUENCE)
+    ).first()
+    if not exists:
+        connection.execute(
+            insert(ChangeSequence).values(
+                name=EMPLOYEE_SEQUENCE, value=_highest_change_seq(connection), modified_at=now
+            )
+        )
+    return added
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from indexes.collation import fold
+
+
+class SearchCountCache:
+    """
+    Bounded LRU cache of total match counts keyed by normalized search term.
+    
+    Paging through a result set or re-typing a popular prefix repeats the same
+    COUNT(*) over the same predicate. Caching the count means only the page
+    query runs on repeat requests. Any write invalidates the whole cache, since
+    a new employee can change the count of arbitrarily many terms.
+    
+    Invalidation also advances `generation`. A caller reads it before running
+    its COUNT and passes it back to set(), so a count taken before a write that
+    finished while the query ran is dropped instead of cached.
+    """
+    
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+    
+    @staticmethod
+    def normalize(search_term: Optional[str], filters_key: str = "") -> str:
+        """
+        Normalize a search term the same way the LIKE predicate treats it
+        (indexes.collation.fold), plus any structured filters.
+        """
+        term = fold(search_term.strip()) if search_term else ""
+        return f"{term}|{filters_key}" if filters_key else term
+    
+    def get(self, key: str) -> Optional[int]:
+        """Return the cached count for a normalized term, if any."""
+        with self._lock:
+            count = self._counts.get(key)
+            if count is not None:
+                self._counts.move_to_end(key)
+            return count
+    
+    def set(self, key: str, count: int, generation: int) -> None:
+        """
+        Store the count for a normalized term, evicting the least recently used.
+        
+        Args:
+            key: Normalized term from normalize()
+            count: Total match count
+            generation: Value of `generation` read before the count was taken;
+                if the cache was invalidated since, the count is not stored
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+    
+    def invalidate(self) -> None:
+        """Drop all cached counts (called on every write)."""
+        with self._lock:
+            self._counts.clear()
+            self.generation += 1
+    
+    def on_employees_created(self, employees) -> None:
+        """Write listener: any new employee may change any cached count."""
+        self.invalidate()
+
+
+# Shared count cache for this worker process
+search_count_cache = SearchCountCache()
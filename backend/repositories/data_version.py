@@ -0,0 +1,125 @@
+"""
+Directory data version, read from the database.
+
+The version is the employees change sequence counter (repositories.change_feed):
+every committed write advances it, whichever process or host made it, and the
+counter row replicates together with the rows it numbers. Its modified_at
+column is the time of the last change. Both come from one primary key lookup,
+cheap enough to derive HTTP validators (ETag / Last-Modified) for every request.
+
+The version a request was validated against is kept for the rest of the
+request, and its session reads from the same database it was read from
+(database.pin_request_reads), so the data a request serves is never older
+than the version it is tagged and cached with.
+
+Each process also remembers the highest version it has accounted for. Its own
+writes advance it (the write listener sees the change_seq values they were
+given); a higher version that this process did not write means another
+process or host changed the data, and the registered external change
+listeners run so per-process caches and indexes drop their stale state.
+"""
+import logging
+import threading
+from contextvars import ContextVar
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from repositories.change_feed import data_version_query
+from repositories.write_hooks import register_write_listener
+
+logger = logging.getLogger(__name__)
+
+ExternalChangeListener = Callable[[], None]
+
+# (version, last modified Unix seconds) the current request was validated against
+_request_version: ContextVar[Optional[Tuple[int, int]]] = ContextVar("request_data_version", default=None)
+
+
+class DataVersion:
+    """This process's view of the database change counter."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners: List[ExternalChangeListener] = []
+        # Highest version accounted for; None until the first read or write
+        self._seen: Optional[int] = None
+    
+    async def read(self, db: AsyncSession) -> Tuple[int, int]:
+        """
+        Read (version, last modified Unix seconds) through `db`.
+        
+        Runs the external change listeners first if the version moved past
+        what this process has written or seen.
+        """
+        row = (await db.execute(data_version_query())).first()
+        version, last_modified = (row.value, row.modified_at) if row else (0, 0)
+        self.observe(version)
+        return version, last_modified
+    
+    async def for_request(self, db: AsyncSession) -> int:
+        """
+        Version the current request reads at.
+        
+        The version its validators were derived from (http_cache), or for
+        requests without validators, read through `db` on first use.
+        """
+        state = _request_version.get()
+        if state is None:
+            state = await self.read(db)
+            _request_version.set(state)
+        return state[0]
+    
+    @staticmethod
+    def set_request_version(state: Tuple[int, int]):
+        """Record the version the current request is validated against; returns a reset token."""
+        return _request_version.set(state)
+    
+    @staticmethod
+    def reset_request_version(token) -> None:
+        """Restore the version recorded before set_request_version."""
+        _request_version.reset(token)
+    
+    def observe(self, version: int) -> None:
+        """Account for a version read from the database."""
+        with self._lock:
+            if self._seen is not None and version <= self._seen:
+                return
+            external = self._seen is not None
+            self._seen = version
+        if external:
+            self._handle_external_change()
+    
+    def on_employees_created(self, employees) -> None:
+        """
+        Write listener: account for this process's own write.
+        
+        Sequence numbers right after the last version seen mean nobody else
+        wrote in between; a gap means another process did.
+        """
+        seqs = [employee.change_seq for employee in employees]
+        if not seqs:
+            return
+        with self._lock:
+            external = self._seen is not None and min(seqs) > self._seen + 1
+            self._seen = max(self._seen or 0, max(seqs))
+        if external:
+            self._handle_external_change()
+    
+    def _handle_external_change(self) -> None:
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"External change listener {listener.__name__} failed: {str(e)}")
+    
+    def register_external_change_listener(self, listener: ExternalChangeListener) -> ExternalChangeListener:
+        """Register a callable run when another process has changed the data."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+        return listener
+
+
+# This worker process's view of the directory version
+data_version = DataVersion()
+register_write_listener(data_version.on_employees_created)
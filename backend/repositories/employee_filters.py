@@ -0,0 +1,163 @@
+"""
+Structured employee filters and the index-aware query builder behind them.
+
+GET /api/employees combines the free-text search with exact department and
+designation filters and a date_of_joining range. Each filter has an index in
+models.Employee; department and designation indexes end in `name`, so filtered
+rows come out of the index already in page order. The builder picks the index
+expected to match the fewest rows as the driver:
+- its predicates are emitted first, then the remaining filters
+- on MySQL the statement carries USE INDEX for it, so a small LIMIT cannot
+  tempt the optimizer into walking idx_name and filtering row by row
+
+Selectivity comes from the in-memory facet aggregates when they have been
+built (department, designation and per-year counts), and from a fixed ranking
+(both columns, designation, department, then the date range) otherwise.
+"""
+from datetime import date
+from typing import List, NamedTuple, Optional
+
+from indexes.facet_counts import facet_counts
+from models import Employee
+
+# A driver expected to match more than this share of the table gets no hint:
+# walking idx_name in page order and filtering is then cheaper than sorting
+MAX_DRIVER_FRACTION = 0.2
+
+
+class EmployeeFilters(NamedTuple):
+    """Exact department / designation and inclusive joining date bounds; None means unset."""
+    
+    department: Optional[str] = None
+    designation: Optional[str] = None
+    joined_from: Optional[date] = None
+    joined_to: Optional[date] = None
+    
+    def __bool__(self) -> bool:
+        return any(value is not None for value in self)
+    
+    def key(self) -> str:
+        """Stable text form for cache keys ("" when no filter is set)."""
+        if not self:
+            return ""
+        return "|".join("" if value is None else str(value) for value in self)
+    
+    def matches(self, department: str, designation: str, date_of_joining: date) -> bool:
+        """
+        Evaluate the filters against one employee, as the SQL predicates would.
+        
+        Department and designation compare with ==, which is what `=` does
+        under SQLite's BINARY collation. MySQL's `_ci` collations also equate
+        other cases, accents and trailing spaces; the in-memory paths that call
+        this only answer where indexes.collation.matches_database(), and on
+        MySQL leave the filters to SQL.
+        """
+        return (
+            (self.department is None or department == self.department)
+            and (self.designation is None or designation == self.designation)
+            and (self.joined_from is None or date_of_joining >= self.joined_from)
+            and (self.joined_to is None or date_of_joining <= self.joined_to)
+        )
+
+
+class FilterPlan(NamedTuple):
+    """Predicates in evaluation order and the index chosen to drive them (None: no hint)."""
+    
+    predicates: List
+    index: Optional[str]
+
+
+def _year_fraction(filters: EmployeeFilters, total: int) -> float:
+    """Estimated share of employees who joined within the date range, from per-year counts."""
+    matching = 0.0
+    for year, count in facet_counts.value_counts("year").items():
+        year_start, year_end = date(int(year), 1, 1), date(int(year), 12, 31)
+        start = max(year_start, filters.joined_from or year_start)
+        end = min(year_end, filters.joined_to or year_end)
+        if start <= end:
+            matching += count * ((end - start).days + 1) / ((year_end - year_start).days + 1)
+    return matching / total
+
+
+def _estimate(index: str, filters: EmployeeFilters) -> Optional[float]:
+    """Estimated share of the table matched by an index's predicates, if aggregates exist."""
+    if not facet_counts.ready or not facet_counts.total:
+        return None
+    total = facet_counts.total
+    if index == "idx_date_of_joining":
+        return _year_fraction(filters, total)
+    counts = []
+    if index in ("idx_department_designation_name", "idx_department_name"):
+        counts.append(facet_counts.value_counts("department").get(filters.department, 0))
+    if index in ("idx_department_designation_name", "idx_designation_name"):
+        counts.append(facet_counts.value_counts("designation").get(filters.designation, 0))
+    # The pair matches no more rows than its rarer column
+    return min(counts) / total
+
+
+def plan_filters(filters: Optional[EmployeeFilters]) -> FilterPlan:
+    """
+    Order filter predicates so the most selective indexed condition leads.
+    
+    Args:
+        filters: Filters to apply; None or an empty EmployeeFilters plans nothing
+    
+    Returns:
+        FilterPlan with the predicates (driver first) and the driving index
+    """
+    if not filters:
+        return FilterPlan([], None)
+    
+    department = Employee.department == filters.department if filters.department is not None else None
+    designation = Employee.designation == filters.designation if filters.designation is not None else None
+    joined = []
+    if filters.joined_from is not None:
+        joined.append(Employee.date_of_joining >= filters.joined_from)
+    if filters.joined_to is not None:
+        joined.append(Employee.date_of_joining <= filters.joined_to)
+    
+    # Candidate drivers in fixed-ranking order
+    candidates = []
+    if department is not None and designation is not None:
+        candidates.append(("idx_department_designation_name", [department, designation]))
+    if designation is not None:
+        candidates.append(("idx_designation_name", [designation]))
+    if department is not None:
+        candidates.append(("idx_department_name", [department]))
+    if joined:
+        candidates.append(("idx_date_of_joining", joined))
+    
+    estimates = [_estimate(index, filters) for index, _ in candidates]
+    if None in estimates:
+        # No statistics: trust equality over a range of unknown width
+        chosen = 0
+        index = candidates[0][0] if candidates[0][0] != "idx_date_of_joining" else None
+    else:
+        chosen = min(range(len(candidates)), key=lambda i: estimates[i])
+        index = candidates[chosen][0] if estimates[chosen] <= MAX_DRIVER_FRACTION else None
+    
+    leading = candidates[chosen][1]
+    rest = [predicate for predicate in (department, designation, *joined) if predicate is not None]
+    predicates = leading + [predicate for predicate in rest if not any(predicate is p for p in leading)]
+    return FilterPlan(predicates, index)
+
+
+def apply_filters(query, filters: Optional[EmployeeFilters], hint: bool = True):
+    """
+    Add planned filter predicates (and the MySQL index hint) to a Select or ORM Query.
+    
+    Args:
+        query: Statement over the employees table
+        filters: Filters to apply; None or an empty EmployeeFilters returns the query unchanged
+        hint: Whether to pin the driving index; pass False when another index
+            (the full-text index) should drive the query
+    
+    Returns:
+        The filtered statement
+    """
+    plan = plan_filters(filters)
+    if plan.predicates:
+        query = query.where(*plan.predicates)
+    if plan.index and hint:
+        query = query.with_hint(Employee, f"USE INDEX ({plan.index})", dialect_name="mysql")
+    return query
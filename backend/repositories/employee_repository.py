@@ -1,79 +1,169 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import or_, and_, func, insert, select
+from sqlalchemy.engine import Row
 from models import Employee
-from typing import List, Tuple, Optional
+from indexes.trigram_index import trigram_index
+from indexes.facet_counts import facet_counts
+from indexes.prefix_index import prefix_index
+from indexes.fuzzy_index import fuzzy_index
+from indexes.directory_snapshot import directory_snapshot
+from repositories.change_feed import changed_employees_query, stamp_change_seqs, tombstones_query
+from repositories.count_cache import search_count_cache
+from repositories.data_version import data_version
+from repositories.employee_filters import EmployeeFilters, apply_filters
+from repositories.fulltext_search import FulltextMatch
+from repositories.write_hooks import notify_employees_created, register_write_listener
+from typing import List, Tuple, Optional, Set, Sequence
+
+# Keep derived search structures in step with every committed write
+register_write_listener(trigram_index.on_employees_created)
+register_write_listener(search_count_cache.on_employees_created)
+register_write_listener(facet_counts.on_employees_created)
+register_write_listener(prefix_index.on_employees_created)
+register_write_listener(fuzzy_index.on_employees_created)
+register_write_listener(directory_snapshot.on_employees_created)
+
+# Writes made by other processes (other workers, the importer) show up as a
+# data version change; rebuild from the database instead of serving stale data
+data_version.register_external_change_listener(trigram_index.reset)
+data_version.register_external_change_listener(search_count_cache.invalidate)
+data_version.register_external_change_listener(facet_counts.reset)
+data_version.register_external_change_listener(prefix_index.reset)
+data_version.register_external_change_listener(fuzzy_index.reset)
+# The snapshot catches up with a change feed delta instead of rebuilding
+data_version.register_external_change_listener(directory_snapshot.mark_stale)
+
+# Columns of EmployeeResponse, in schema field order, for row-based (non-ORM) reads
+EMPLOYEE_COLUMNS = (
+    Employee.name,
+    Employee.email,
+    Employee.department,
+    Employee.designation,
+    Employee.date_of_joining,
+    Employee.id,
+)
+
+# Response field names, in schema order
+EMPLOYEE_FIELDS = tuple(column.key for column in EMPLOYEE_COLUMNS)
+
+
+def select_columns(fields: Sequence[str] = (), sort_keys: bool = True) -> Tuple:
+    """
+    Columns to SELECT for a sparse fieldset (EMPLOYEE_COLUMNS when empty).
+    `id` is always read, and `name` as well with sort_keys, since keyset
+    cursors are built from (name, id).
+    """
+    if not fields:
+        return EMPLOYEE_COLUMNS
+    needed = {*fields, "id", "name"} if sort_keys else {*fields, "id"}
+    return tuple(column for column in EMPLOYEE_COLUMNS if column.key in needed)
+
+
+def search_filter(search_term: str):
+    """Build the case-insensitive name-or-department match for a stripped search term."""
+    search_pattern = f"%{search_term}%"
+    return or_(
+        Employee.name.ilike(search_pattern),
+        Employee.department.ilike(search_pattern)
+    )
+
+
+def facet_group_query(
+    search_term: Optional[str] = None,
+    filters: Optional[EmployeeFilters] = None,
+    ranked: Optional[FulltextMatch] = None,
+    narrowed: Optional[Set[int]] = None
+):
+    """
+    Count employees per (department, designation, joining year), optionally
+    restricted to a stripped search term (matched through `ranked` when the
+    full-text backend answers it, and among the `narrowed` IDs when given)
+    and structured filters. The groups add up to the total match count, so
+    one scan yields the total and every facet.
+    """
+    year = func.extract("year", Employee.date_of_joining)
+    query = select(Employee.department, Employee.designation, year, func.count()).group_by(
+        Employee.department, Employee.designation, year
+    )
+    query = apply_filters(query, filters, hint=ranked is None)
+    if ranked is not None:
+        query = ranked.apply(query)
+    elif search_term:
+        query = query.where(search_filter(search_term))
+        if narrowed is not None:
+            query = query.where(Employee.id.in_(narrowed))
+    return query
+
+
+def after_keyset(after: Tuple[str, int]):
+    """
+    Build the seek predicate `(name, id) > after`.
+    
+    The leading `name >= :name` conjunct gives the optimizer a plain range
+    on idx_name (InnoDB secondary indexes carry the primary key, so the
+    index is ordered by (name, id)).
+    """
+    name, employee_id = after
+    return and_(
+        Employee.name >= name,
+        or_(
+            Employee.name > name,
+            and_(Employee.name == name, Employee.id > employee_id)
+        )
+    )
 
 
 class EmployeeRepository:
     """
-    Repository layer for employee database operations.
-    Separates data access logic from business logic.
+    Blocking employee repository for command-line scripts.
+    
+    The API serves every request through AsyncEmployeeRepository; this class
+    keeps only what the importer, the snapshot builder and startup need, with
+    the same write semantics (change sequences and write listeners).
     """
     
     def __init__(self, db: Session):
         self.db = db
     
-    def search_employees(
-        self, 
-        search_term: Optional[str] = None, 
-        limit: int = 50, 
-        offset: int = 0
-    ) -> Tuple[List[Employee], int]:
-        """
-        Search employees by name or department with pagination.
-        
-        Args:
-            search_term: Search query for name or department (case-insensitive)
-            limit: Maximum number of results to return
-            offset: Number of results to skip (for pagination)
-            
-        Returns:
-            Tuple of (list of employees, total count)
-            
-        Performance:
-        - Uses LIKE with indexes for fast searches
-        - For very large datasets (100K+), consider Full-Text Search
-        - Composite index on (name, department) optimizes OR queries
-        """
-        query = self.db.query(Employee)
-        
-        # Apply search filter if provided
-        if search_term and search_term.strip():
-            search_pattern = f"%{search_term.strip()}%"
-            query = query.filter(
-                or_(
-                    Employee.name.ilike(search_pattern),
-                    Employee.department.ilike(search_pattern)
-                )
-            )
-        
-        # Get total count before pagination
-        total = query.count()
-        
-        # Apply pagination and ordering
-        employees = query.order_by(Employee.name).limit(limit).offset(offset).all()
-        
-        return employees, total
-    
-    def get_employee_by_id(self, employee_id: int) -> Optional[Employee]:
-        """Get a single employee by ID."""
-        return self.db.query(Employee).filter(Employee.id == employee_id).first()
+    def ensure_prefix_index(self) -> None:
+        """Build the autocomplete prefix index from the employees table if needed."""
+        if prefix_index.ready:
+            return
+        prefix_index.build(self.db.query(Employee.name, Employee.department).yield_per(10000))
     
-    def get_employee_by_email(self, email: str) -> Optional[Employee]:
-        """Get a single employee by email."""
-        return self.db.query(Employee).filter(Employee.email == email).first()
+    def get_changes(self, since: int, limit: Optional[int]) -> Tuple[List[Row], List[Row]]:
+        """Employees written and deleted after `since`; see AsyncEmployeeRepository.get_changes."""
+        employees = self.db.execute(changed_employees_query(since, limit, EMPLOYEE_COLUMNS)).all()
+        tombstones = self.db.execute(tombstones_query(since, limit)).all()
+        return employees, tombstones
     
-    def create_employee(self, employee_data: dict) -> Employee:
-        """Create a new employee."""
-        employee = Employee(**employee_data)
-        self.db.add(employee)
-        self.db.commit()
-        self.db.refresh(employee)
-        return employee
+    def get_existing_emails(self, emails: Sequence[str]) -> Set[str]:
+        """Return the lowercased emails among `emails` that already exist, in one query."""
+        if not emails:
+            return set()
+        rows = self.db.execute(select(Employee.email).where(Employee.email.in_(emails)))
+        return {email.lower() for (email,) in rows}
     
-    def get_all_employees(self, limit: int = 100, offset: int = 0) -> Tuple[List[Employee], int]:
-        """Get all employees with pagination."""
-        query = self.db.query(Employee)
-        total = query.count()
-        employees = query.order_by(Employee.name).limit(limit).offset(offset).all()
-        return employees, total
+    def bulk_create_employees(self, employees_data: List[dict], batch_size: int = 1000) -> List[int]:
+        """
+        Insert many employees in one transaction with executemany batches.
+        See AsyncEmployeeRepository.bulk_create_employees.
+        """
+        if not employees_data:
+            return []
+        try:
+            rows = stamp_change_seqs(self.db, employees_data)
+            for start in range(0, len(employees_data), batch_size):
+                self.db.execute(insert(Employee), rows[start:start + batch_size])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        
+        emails = [row["email"] for row in employees_data]
+        created = self.db.execute(
+            select(Employee.__table__).where(Employee.email.in_(emails))
+        ).all()
+        notify_employees_created(created)
+        ids_by_email = {row.email.lower(): row.id for row in created}
+        return [ids_by_email[email.lower()] for email in emails]
@@ -0,0 +1,171 @@
+"""
+Native full-text search backend, selected with settings.search_backend.
+
+- "like" (default): the trigram index for terms of 3+ characters, ILIKE otherwise
+- "fulltext": the database's own full-text engine, results ranked by relevance
+  - MySQL: MATCH ... AGAINST in boolean mode over a FULLTEXT index on
+    (name, department); InnoDB keeps it in sync with every insert
+  - SQLite: an FTS5 external-content table over employees, kept in sync by
+    insert / update / delete triggers
+
+Every word of the search term must match the start of a name or department word
+(`kum` finds "Rahul Kumar"). Results are ordered by relevance, then name.
+Whatever the full-text index cannot answer falls back to the LIKE path:
+- words shorter than MIN_WORD_LENGTH (InnoDB's default innodb_ft_min_token_size)
+- terms without any word characters
+- databases without a native full-text engine
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, literal_column, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.engine import Connection, make_url
+
+from config import settings
+from models import Employee
+
+SEARCH_BACKENDS = ("like", "fulltext")
+FULLTEXT_DIALECTS = ("mysql", "sqlite")
+
+# Shorter words are not indexed by InnoDB FULLTEXT by default
+MIN_WORD_LENGTH = 3
+
+MYSQL_FULLTEXT_INDEX = "ft_employees_name_department"
+SQLITE_FTS_TABLE = "employees_fts"
+
+_WORD = re.compile(r"\w+")
+
+# FTS5 exposes the matched row as `rowid` and its bm25 score as `rank`
+_fts = table(SQLITE_FTS_TABLE, column("rowid"), column("rank"))
+
+_SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE {SQLITE_FTS_TABLE} USING fts5("
+    "name, department, content='employees', content_rowid='id', prefix='3')",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_ai AFTER INSERT ON employees BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, name, department) VALUES (new.id, new.name, new.department); "
+    "END",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_ad AFTER DELETE ON employees BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}, rowid, name, department) "
+    "VALUES ('delete', old.id, old.name, old.department); "
+    "END",
+    f"CREATE TRIGGER {SQLITE_FTS_TABLE}_au AFTER UPDATE OF name, department ON employees BEGIN "
+    f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}, rowid, name, department) "
+    "VALUES ('delete', old.id, old.name, old.department); "
+    f"INSERT INTO {SQLITE_FTS_TABLE} (rowid, name, department) VALUES (new.id, new.name, new.department); "
+    "END",
+    # Index the rows that existed before the table was created
+    f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+)
+
+
+def _configured_dialect() -> Optional[str]:
+    """Full-text dialect in use, or None when the LIKE backend is selected or unsupported."""
+    backend = settings.search_backend.lower()
+    if backend not in SEARCH_BACKENDS:
+        raise ValueError(f"Unknown search backend: {settings.search_backend}")
+    dialect = make_url(settings.database_url).get_backend_name()
+    if backend == "fulltext" and dialect in FULLTEXT_DIALECTS:
+        return dialect
+    return None
+
+
+_dialect = _configured_dialect()
+
+
+class FulltextMatch:
+    """A parsed full-text query for one dialect: filters a statement and ranks its rows."""
+    
+    def __init__(self, dialect: str, words: List[str]):
+        self.dialect = dialect
+        self.words = words
+        if dialect == "mysql":
+            # Boolean mode: every word required, as a prefix
+            self._match = match(
+                Employee.name, Employee.department,
+                against=" ".join(f"+{word}*" for word in words)
+            ).in_boolean_mode()
+        else:
+            self._match = literal_column(SQLITE_FTS_TABLE).op("MATCH")(
+                " AND ".join(f'"{word}"*' for word in words)
+            )
+    
+    def apply(self, query):
+        """Restrict a Select or ORM Query over employees to the rows matching every word."""
+        if self.dialect == "mysql":
+            return query.where(self._match)
+        return query.join(_fts, _fts.c.rowid == Employee.id).where(self._match)
+    
+    def order_by(self) -> Tuple:
+        """Ordering for a statement passed through apply(): best match first, then name."""
+        if self.dialect == "mysql":
+            return self._match.desc(), Employee.name, Employee.id
+        # bm25 scores are negative; lower is better
+        return _fts.c.rank, Employee.name, Employee.id
+
+
+def fulltext_match(search_term: Optional[str]) -> Optional[FulltextMatch]:
+    """
+    Plan a full-text query for a search term.
+    
+    Args:
+        search_term: Raw search term
+    
+    Returns:
+        FulltextMatch when the full-text backend is selected and can answer the
+        term, None when the term should go through the LIKE path
+    """
+    if not search_term or _dialect is None:
+        return None
+    words = _WORD.findall(search_term.lower())
+    if not words or any(len(word) < MIN_WORD_LENGTH for word in words):
+        return None
+    return FulltextMatch(_dialect, words)
+
+
+def ensure_fulltext_index(connection: Connection) -> bool:
+    """
+    Create the full-text index if the full-text backend is selected and the index does not exist.
+    
+    Args:
+        connection: Connection to the primary database (committed by the caller)
+    
+    Returns:
+        True if the index was created, False if it existed or is not needed
+    """
+    if _dialect is None:
+        return False
+    return create_fulltext_index(connection)
+
+
+def create_fulltext_index(connection: Connection) -> bool:
+    """
+    Create the MySQL FULLTEXT index or the SQLite FTS5 table and its triggers, unless present.
+    
+    Args:
+        connection: Connection to a MySQL or SQLite database (committed by the caller)
+    
+    Returns:
+        True if the index was created, False if it already existed
+    """
+    if connection.dialect.name == "mysql":
+        exists = connection.execute(
+            text(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = 'employees' AND index_name = :name LIMIT 1"
+            ),
+            {"name": MYSQL_FULLTEXT_INDEX}
+        ).first()
+        if not exists:
+            connection.execute(
+                text(f"ALTER TABLE employees ADD FULLTEXT INDEX {MYSQL_FULLTEXT_INDEX} (name, department)")
+            )
+        return not exists
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": SQLITE_FTS_TABLE}
+    ).first()
+    if not exists:
+        for statement in _SQLITE_FTS_DDL:
+            connection.execute(text(statement))
+    return not exists
+
@@ -0,0 +1,36 @@
+"""
+Per-request identity map for employees loaded by ID.
+
+A repository owns one map and lives for a single request, so every ID is
+fetched from the database at most once per request however often it is asked
+for. IDs the database did not return are remembered as absent, so repeating a
+missing ID does not query again either.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class IdentityMap:
+    """Objects (rows or ORM instances with an `id`) keyed by ID; None marks a known-missing ID."""
+    
+    def __init__(self):
+        self._entries: Dict[int, Optional[Any]] = {}
+    
+    def unloaded(self, ids: Iterable[int]) -> List[int]:
+        """Distinct IDs not looked up yet, in first-seen order."""
+        return [employee_id for employee_id in dict.fromkeys(ids) if employee_id not in self._entries]
+    
+    def load(self, ids: Iterable[int], objects: Iterable[Any]) -> None:
+        """Record the objects fetched for `ids`; IDs without an object are remembered as missing."""
+        for obj in objects:
+            self._entries[obj.id] = obj
+        for employee_id in ids:
+            self._entries.setdefault(employee_id, None)
+    
+    def get(self, employee_id: int) -> Optional[Any]:
+        return self._entries.get(employee_id)
+    
+    def __contains__(self, employee_id: int) -> bool:
+        return employee_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,38 @@
+"""
+Write listeners for derived data.
+
+In-memory indexes and caches built from the employees table register a
+listener here; repositories call `notify_employees_created` after every
+successful commit so derived data never goes stale within the process.
+"""
+import logging
+from typing import Callable, List, Sequence
+
+from models import Employee
+
+logger = logging.getLogger(__name__)
+
+WriteListener = Callable[[Sequence[Employee]], None]
+
+_listeners: List[WriteListener] = []
+
+
+def register_write_listener(listener: WriteListener) -> WriteListener:
+    """Register a callable invoked with the employees created by each write."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+
+def notify_employees_created(employees: Sequence[Employee]) -> None:
+    """
+    Notify all listeners about committed employees.
+    
+    A failing listener is logged and skipped so it can never fail a write
+    that has already been committed.
+    """
+    for listener in _listeners:
+        try:
+            listener(employees)
+        except Exception as e:
+            logger.error(f"Write listener {listener.__name__} failed: {str(e)}")
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Optional
-from database import get_db
-from services.employee_service import EmployeeService
-from schemas import EmployeeListResponse, EmployeeResponse, EmployeeCreate, ErrorResponse
+from fastapi import APIRouter, Body, Depends, Query, HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Optional
+from database import get_async_db, get_async_read_db, AsyncSessionLocal
+from metrics import TimedORJSONResponse
+from services.async_employee_service import AsyncEmployeeService
+from services.employee_requests import validate_search_term
+from schemas import (
+    EmployeeListResponse, EmployeeResponse, EmployeeCreate, EmployeeBulkCreateResponse, ErrorResponse,
+    SuggestResponse, EmployeeBatchGetRequest, EmployeeBatchGetResponse, EmployeeChangesResponse
+)
 
 router = APIRouter(prefix="/api", tags=["employees"])
 
@@ -19,9 +26,24 @@ router = APIRouter(prefix="/api", tags=["employees"])
     description="""
     Search for employees by name or department with pagination support.
     
-    - **search**: Optional search term (min 2 chars, searches name and department)
+    - **search**: Optional search term (min 2 chars, searches name and department;
+      relevance-ranked and paged with `offset` when `SEARCH_BACKEND=fulltext`)
     - **limit**: Number of results per page (1-100, default: 50)
     - **offset**: Number of results to skip (default: 0)
+    - **cursor**: Opaque cursor from a previous response's `next_cursor`; seeks
+      directly to the next page instead of skipping `offset` rows
+    - **include_total**: Set to false to skip computing `total` (returned as null)
+    - **facets**: Comma-separated facets to count over all matches
+      (`department`, `designation`, `year`), returned as `facets`
+    - **fuzzy**: Typo-tolerant matching of name and department words (up to
+      2 edits), ranked by edit distance then name; page with `offset`
+    - **department** / **designation**: Exact-match filters
+    - **joined_from** / **joined_to**: Inclusive `date_of_joining` range (YYYY-MM-DD)
+    - **fields**: Comma-separated sparse fieldset, e.g. `name,department`;
+      only these columns (plus `id`) are selected and returned
+    
+    Filters combine with each other and with `search`; the most selective
+    filter index drives the query.
     
     Returns a list of employees matching the search criteria with pagination metadata.
     """
@@ -44,7 +66,34 @@ async def search_employees(
         ge=0, 
         description="Number of results to skip for pagination"
     ),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset cursor returned as `next_cursor` by the previous page",
+        max_length=512
+    ),
+    include_total: bool = Query(
+        True,
+        description="Compute the total number of matches; disable for faster paging"
+    ),
+    facets: Optional[str] = Query(
+        None,
+        description="Comma-separated facets to count: department, designation, year",
+        max_length=100
+    ),
+    fuzzy: bool = Query(
+        False,
+        description="Tolerate misspellings (ranked by edit distance; requires search)"
+    ),
+    department: Optional[str] = Query(None, description="Exact department", max_length=100),
+    designation: Optional[str] = Query(None, description="Exact designation", max_length=100),
+    joined_from: Optional[date] = Query(None, description="Joined on or after this date"),
+    joined_to: Optional[date] = Query(None, description="Joined on or before this date"),
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (id is always included)",
+        max_length=100
+    ),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search employees endpoint.
@@ -53,9 +102,173 @@ async def search_employees(
     - Database indexes on name and department columns
     - Pagination to limit data transfer
     - Connection pooling for efficient database access
+    - Async session, so a slow query never blocks other requests on the worker
+    - Column rows encoded straight to JSON with orjson (no ORM hydration or
+      response-model re-validation)
+    - Keyset pagination via `cursor` for constant-cost deep pages
+    - Sparse `fields` narrow the SELECT, and large bodies are gzip/brotli compressed
+    """
+    service = AsyncEmployeeService(db)
+    result = await service.search_employees(
+        search=search,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total,
+        facets=facets,
+        fuzzy=fuzzy,
+        department=department,
+        designation=designation,
+        joined_from=joined_from,
+        joined_to=joined_to,
+        fields=fields
+    )
+    # Encode directly; the rows come from the database and already match the schema
+    return TimedORJSONResponse(result)
+
+
+@router.get(
+    "/employees/export",
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "Streamed employee rows"
+        },
+        400: {"model": ErrorResponse, "description": "Invalid request parameters"}
+    },
+    summary="Export Employees",
+    description="""
+    Stream every employee (optionally filtered by `search`) as NDJSON or CSV.
+    
+    Rows are read through a server-side cursor as plain column tuples and
+    written to the response batch by batch, so memory use is the same for
+    1k or 10M rows. Rows are ordered by ID.
+    """
+)
+async def export_employees(
+    format: str = Query(
+        "ndjson",
+        pattern="^(ndjson|csv)$",
+        description="Output format: ndjson or csv"
+    ),
+    search: Optional[str] = Query(
+        None,
+        description="Search term for name or department (case-insensitive)",
+        min_length=2,
+        max_length=100
+    )
+):
+    """
+    Export employees endpoint.
+    
+    The stream opens its own session: dependency-managed sessions are closed
+    before a streaming body finishes sending.
+    """
+    validate_search_term(search)
+    
+    async def body():
+        async with AsyncSessionLocal() as db:
+            async for chunk in AsyncEmployeeService(db).export_employees(search, format):
+                yield chunk
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="employees.{format}"'}
+    )
+
+
+@router.get(
+    "/employees/suggest",
+    response_model=SuggestResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid request parameters"}
+    },
+    summary="Autocomplete Names and Departments",
+    description="""
+    Suggest employee names and departments starting with `q`, for typeahead.
+    
+    Answered from an in-memory sorted prefix index (binary search plus a short
+    scan), so no SQL runs once the index is built. A name also completes from
+    any of its later words, e.g. `kum` suggests "Rahul Kumar". Suggestions
+    come most frequent first (employees sharing the name or department); on
+    equal counts departments come before names.
     """
-    service = EmployeeService(db)
-    return service.search_employees(search=search, limit=limit, offset=offset)
+)
+async def suggest_employees(
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed so far"),
+    limit: int = Query(10, ge=1, le=20, description="Maximum number of suggestions"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Autocomplete endpoint; suggestions most frequent first."""
+    service = AsyncEmployeeService(db)
+    return TimedORJSONResponse(await service.suggest_employees(q, limit))
+
+
+@router.get(
+    "/employees/changes",
+    response_model=EmployeeChangesResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Invalid since or limit"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    },
+    summary="Employee Change Feed",
+    description="""
+    Employees created, updated or deleted after the change sequence `since`,
+    oldest first, so consumers can sync incrementally instead of re-reading
+    the listing.
+    
+    - **since**: Last `seq` processed (0 for a full initial sync)
+    - **limit**: Maximum number of changes (1-1000, default: 100)
+    
+    Each employee appears once, in its current state, under the sequence of
+    its latest write; deletions appear as `op: "delete"` tombstones. Resume
+    from `next_since`; while `has_more` is true, more changes are waiting.
+    """
+)
+async def get_employee_changes(
+    since: int = Query(0, ge=0, description="Last change sequence processed"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of changes to return"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Change feed endpoint.
+    
+    Performance optimizations:
+    - Two range scans on indexed sequence columns (employees.change_seq and
+      the tombstones' primary key); cost depends on the page, not the table
+    - Sequences commit in order, so no change is skipped by resuming from
+      `next_since`
+    """
+    service = AsyncEmployeeService(db)
+    return TimedORJSONResponse(await service.get_changes(since, limit))
+
+
+@router.post(
+    "/employees/batch-get",
+    response_model=EmployeeBatchGetResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Empty or oversized request"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    },
+    summary="Get Employees by ID",
+    description="""
+    Resolve many employee IDs in one request (at most `batch_get_max_ids`, default 500).
+    
+    All IDs are fetched with a single `IN` query. Employees come back in the
+    order of `ids`, and IDs that do not exist are listed in `missing`. A
+    request-scoped identity map fetches each distinct ID once, however often
+    it repeats. POST only carries the ID list; like GET, it reads from a replica.
+    """
+)
+async def batch_get_employees(
+    request: EmployeeBatchGetRequest,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Batch get employees endpoint."""
+    service = AsyncEmployeeService(db)
+    return TimedORJSONResponse(await service.batch_get_employees(request.ids))
 
 
 @router.get(
@@ -67,15 +280,20 @@ async def search_employees(
         500: {"model": ErrorResponse, "description": "Internal server error"}
     },
     summary="Get Employee by ID",
-    description="Retrieve a single employee by their ID."
+    description="Retrieve a single employee by their ID; `fields` selects a sparse fieldset."
 )
 async def get_employee(
     employee_id: int,
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields to return (id is always included)",
+        max_length=100
+    ),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get employee by ID endpoint."""
-    service = EmployeeService(db)
-    return service.get_employee_by_id(employee_id)
+    service = AsyncEmployeeService(db)
+    return TimedORJSONResponse(await service.get_employee_by_id(employee_id, fields))
 
 
 @router.post(
@@ -91,8 +309,34 @@ async def get_employee(
 )
 async def create_employee(
     employee: EmployeeCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create employee endpoint."""
-    service = EmployeeService(db)
-    return service.create_employee(employee)
+    service = AsyncEmployeeService(db)
+    return await service.create_employee(employee)
+
+
+@router.post(
+    "/employees/bulk",
+    response_model=EmployeeBulkCreateResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Empty or oversized request"},
+        409: {"model": ErrorResponse, "description": "Concurrent conflicting insert; nothing was created"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    },
+    summary="Bulk Create Employees",
+    description="""
+    Create many employees in a single transaction.
+    
+    Email uniqueness is checked with one query for the whole batch; rows whose
+    email already exists or repeats within the request are reported per row
+    and skipped, the rest are inserted in batched round trips.
+    """
+)
+async def bulk_create_employees(
+    employees: List[EmployeeCreate] = Body(..., description="Employees to create"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Bulk create employees endpoint."""
+    service = AsyncEmployeeService(db)
+    return await service.bulk_create_employees(employees)
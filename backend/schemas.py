@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 class EmployeeBase(BaseModel):
@@ -28,9 +28,81 @@ class EmployeeResponse(EmployeeBase):
 class EmployeeListResponse(BaseModel):
     """Schema for paginated employee list response."""
     employees: List[EmployeeResponse]
-    total: int = Field(..., description="Total number of employees matching the search")
+    total: Optional[int] = Field(
+        ...,
+        description="Total number of employees matching the search (null when include_total=false)"
+    )
     limit: int = Field(..., description="Number of results per page")
     offset: int = Field(..., description="Offset for pagination")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (pass as `cursor`); null on the last page"
+    )
+    facets: Optional[Dict[str, Dict[str, int]]] = Field(
+        None,
+        description="Counts per facet value over all matches, when requested with `facets`"
+    )
+
+
+class Suggestion(BaseModel):
+    """A single autocomplete suggestion."""
+    text: str = Field(..., description="Employee name or department to complete to")
+    type: str = Field(..., description="'name' or 'department'")
+    count: int = Field(..., description="Number of employees with this name or in this department")
+
+
+class SuggestResponse(BaseModel):
+    """Schema for autocomplete response."""
+    query: str
+    suggestions: List[Suggestion] = Field(..., description="Completions, most frequent first")
+
+
+class BulkCreateRowResult(BaseModel):
+    """Outcome of a single row in a bulk create request."""
+    index: int = Field(..., description="Position of the row in the request body")
+    email: str = Field(..., description="Email of the submitted employee")
+    status: str = Field(..., description="'created' or 'error'")
+    id: Optional[int] = Field(None, description="ID of the created employee")
+    error: Optional[str] = Field(None, description="Reason the row was rejected")
+
+
+class EmployeeBulkCreateResponse(BaseModel):
+    """Schema for bulk create response with per-row results."""
+    created: int = Field(..., description="Number of employees created")
+    failed: int = Field(..., description="Number of rows rejected")
+    results: List[BulkCreateRowResult]
+
+
+class EmployeeBatchGetRequest(BaseModel):
+    """Schema for a batch-get request."""
+    ids: List[int] = Field(..., description="Employee IDs to resolve, in the order results should follow")
+
+
+class EmployeeBatchGetResponse(BaseModel):
+    """Schema for batch-get response."""
+    employees: List[EmployeeResponse] = Field(
+        ...,
+        description="Found employees in request order; a repeated ID repeats its employee"
+    )
+    missing: List[int] = Field(..., description="Requested IDs that do not exist, in request order")
+
+
+class EmployeeChange(BaseModel):
+    """One entry of the change feed."""
+    seq: int = Field(..., description="Change sequence number; pass the last one seen as `since`")
+    op: str = Field(..., description="'upsert' (created or updated) or 'delete'")
+    id: int = Field(..., description="Employee ID")
+    employee: Optional[EmployeeResponse] = Field(
+        None,
+        description="Current state of the employee; null for deletions"
+    )
+
+
+class EmployeeChangesResponse(BaseModel):
+    """Schema for a page of the change feed."""
+    changes: List[EmployeeChange] = Field(..., description="Changes after `since`, oldest first")
+    next_since: int = Field(..., description="Sequence to pass as `since` for the next page")
+    has_more: bool = Field(..., description="Whether more changes are already available")
 
 
 class ErrorResponse(BaseModel):
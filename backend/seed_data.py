@@ -1,11 +1,20 @@
 """
 Script to seed the database with sample employee data.
 Run this after init_db.py to populate the database with test data.
+
+Usage:
+    python seed_data.py [count]
+    python seed_data.py --if-empty     # deploy step: seed only an empty table, no prompt
 """
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from database import SessionLocal, engine
 from models import Employee, Base
+from config import settings
+from repositories.change_feed import stamp_change_seqs
 from datetime import date, timedelta
+from itertools import islice
+import argparse
 import random
 import logging
 
@@ -37,10 +46,14 @@ DESIGNATIONS = {
 }
 
 
-def generate_sample_employees(count: int = 50) -> list:
-    """Generate sample employee data."""
-    employees = []
-    used_emails = set()
+def iter_sample_employees(count: int = 50):
+    """
+    Yield sample employee dicts one at a time.
+    
+    Emails stay unique by numbering repeats of the same first/last name pair,
+    so arbitrarily large datasets can be generated in constant time per row.
+    """
+    used_counts = {}
     
     for i in range(count):
         first_name = random.choice(FIRST_NAMES)
@@ -49,12 +62,12 @@ def generate_sample_employees(count: int = 50) -> list:
         
         # Generate unique email
         email_base = f"{first_name.lower()}.{last_name.lower()}"
-        email = f"{email_base}@company.com"
-        counter = 1
-        while email in used_emails:
+        counter = used_counts.get(email_base, 0)
+        if counter == 0:
+            email = f"{email_base}@company.com"
+        else:
             email = f"{email_base}{counter}@restaverse.com"
-            counter += 1
-        used_emails.add(email)
+        used_counts[email_base] = counter + 1
         
         department = random.choice(DEPARTMENTS)
         designation = random.choice(DESIGNATIONS[department])
@@ -63,20 +76,66 @@ def generate_sample_employees(count: int = 50) -> list:
         days_ago = random.randint(0, 365 * 5)
         date_of_joining = date.today() - timedelta(days=days_ago)
         
-        employees.append({
+        yield {
             "name": name,
             "email": email,
             "department": department,
             "designation": designation,
             "date_of_joining": date_of_joining
-        })
+        }
+
+
+def generate_sample_employees(count: int = 50) -> list:
+    """Generate sample employee data."""
+    return list(iter_sample_employees(count))
+
+
+def insert_sample_employees(db: Session, count: int) -> None:
+    """Insert `count` generated employees with multi-row INSERTs and commit."""
+    rows = iter_sample_employees(count)
+    while True:
+        batch = list(islice(rows, settings.bulk_insert_batch_size))
+        if not batch:
+            break
+        db.execute(insert(Employee), stamp_change_seqs(db, batch))
+    db.commit()
+
+
+def seed_if_empty(count: int = 50) -> int:
+    """
+    Seed sample employees only when the employees table is empty.
+    
+    Never prompts, so it can run as a deploy or release step.
+    
+    Args:
+        count: Number of employees to generate
+        
+    Returns:
+        Number of employees inserted (0 if the table already had rows)
+    """
+    db = SessionLocal()
+    db.info["use_primary"] = True  # The emptiness check must not read a lagging replica
     
-    return employees
+    try:
+        # An existence probe instead of COUNT(*), which scans the table on InnoDB
+        if db.query(Employee.id).limit(1).first() is not None:
+            logger.info("✓ Database already has employees, skipping seed")
+            return 0
+        
+        insert_sample_employees(db, count)
+        logger.info(f"✓ Added {count} sample employees")
+        return count
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
 
 
 def seed_database(count: int = 50):
     """Seed the database with sample data."""
     db = SessionLocal()
+    db.info["use_primary"] = True  # The emptiness check must not read a lagging replica
     
     try:
         # Check if data already exists
@@ -88,15 +147,8 @@ def seed_database(count: int = 50):
                 logger.info("Skipping data seeding.")
                 return
         
-        logger.info(f"Generating {count} sample employees...")
-        employees_data = generate_sample_employees(count)
-        
-        logger.info("Inserting employees into database...")
-        for emp_data in employees_data:
-            employee = Employee(**emp_data)
-            db.add(employee)
-        
-        db.commit()
+        logger.info(f"Generating and inserting {count} sample employees...")
+        insert_sample_employees(db, count)
         logger.info(f"✓ Successfully added {count} employees to the database!")
         
         # Show some stats
@@ -112,14 +164,20 @@ def seed_database(count: int = 50):
         db.close()
 
 
-if __name__ == "__main__":
-    import sys
-    
-    count = 50
-    if len(sys.argv) > 1:
-        try:
-            count = int(sys.argv[1])
-        except ValueError:
-            logger.warning(f"Invalid count argument. Using default: {count}")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the database with sample employees.")
+    parser.add_argument("count", nargs="?", type=int, default=50, help="Employees to generate (default: 50)")
+    parser.add_argument(
+        "--if-empty", action="store_true",
+        help="Seed only when the employees table is empty, without prompting"
+    )
+    args = parser.parse_args(argv)
     
-    seed_database(count)
+    if args.if_empty:
+        seed_if_empty(args.count)
+    else:
+        seed_database(args.count)
+
+
+if __name__ == "__main__":
+    main()
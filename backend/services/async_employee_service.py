@@ -0,0 +1,317 @@
+import csv
+import io
+import json
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from repositories.async_employee_repository import AsyncEmployeeRepository
+from repositories.data_version import data_version
+from repositories.employee_repository import select_columns
+from services.employee_requests import (
+    batch_result, build_filters, bulk_result, changes_result, is_relevance_ranked, page_result, parse_cursor,
+    parse_facets, parse_fields, plan_bulk_create, validate_batch_ids, validate_bulk_size, validate_changes_params,
+    validate_employee_id, validate_fuzzy_params, validate_search_params, validate_suggest_params
+)
+from services.search_cache import search_result_cache
+from services.single_flight import search_flights
+from database import AsyncSessionLocal
+from repositories.employee_filters import EmployeeFilters
+from schemas import EmployeeCreate, EmployeeResponse
+from config import settings
+from datetime import date
+from typing import AsyncIterator, List, Optional, Tuple
+from fastapi import HTTPException, status
+
+
+class AsyncEmployeeService:
+    """
+    Service layer for employee business logic, used by the API routes.
+    Validates and shapes responses with services.employee_requests and
+    awaits an AsyncEmployeeRepository for all data access.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.repository = AsyncEmployeeRepository(db)
+    
+    async def search_employees(
+        self,
+        search: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        facets: Optional[str] = None,
+        fuzzy: bool = False,
+        department: Optional[str] = None,
+        designation: Optional[str] = None,
+        joined_from: Optional[date] = None,
+        joined_to: Optional[date] = None,
+        fields: Optional[str] = None
+    ) -> dict:
+        """
+        Search employees with validation and business logic.
+        
+        Args:
+            search: Search term (optional; with search_backend="fulltext" results
+                are ranked by relevance and paged by offset only)
+            limit: Max results (1-100)
+            offset: Pagination offset
+            cursor: Opaque keyset cursor from a previous page (takes precedence over offset)
+            include_total: Whether to compute the total match count (None when False)
+            facets: Comma-separated facets to count over all matches
+                (department, designation, year)
+            fuzzy: Typo-tolerant matching ranked by edit distance (requires
+                search; no cursor, facets or filters)
+            department: Exact department filter
+            designation: Exact designation filter
+            joined_from: Earliest date of joining (inclusive)
+            joined_to: Latest date of joining (inclusive)
+            fields: Comma-separated sparse fieldset (see parse_fields)
+        
+        Returns:
+            Dict with employees list, total count, limit, offset and next cursor,
+            plus facet counts when requested
+        
+        Raises:
+            HTTPException: If validation fails
+        
+        Employees are returned as plain dicts in EmployeeResponse field order,
+        ready for direct JSON encoding without response-model validation.
+        Concurrent identical searches are coalesced into one execution (see
+        services.single_flight).
+        """
+        validate_search_params(search, limit, offset)
+        facet_fields = parse_facets(facets)
+        field_names = parse_fields(fields)
+        filters = build_filters(department, designation, joined_from, joined_to)
+        if fuzzy:
+            validate_fuzzy_params(search, cursor, facet_fields, filters)
+        ranked = not fuzzy and is_relevance_ranked(search, cursor)
+        after = parse_cursor(cursor)
+        if after is not None:
+            offset = 0
+        
+        version = await data_version.for_request(self.repository.db)
+        cache_key = search_result_cache.make_key(
+            version, search, limit, offset, cursor, include_total, facet_fields, fuzzy, filters.key(), field_names
+        )
+        cached = await search_result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        args = (
+            cache_key, search, limit, offset, after, include_total, facet_fields, filters, fuzzy, ranked, field_names
+        )
+        if not settings.search_coalescing_enabled:
+            return await self._run_search(self.repository, *args)
+        # Identical concurrent searches share one execution; it runs in its
+        # own session because it must outlive whichever request started it
+        return await search_flights.do(cache_key, lambda: self._run_shared_search(*args))
+    
+    async def _run_shared_search(self, *args) -> dict:
+        """Run a search for every coalesced request, in a session of its own."""
+        async with AsyncSessionLocal() as db:
+            return await self._run_search(AsyncEmployeeRepository(db), *args)
+    
+    async def _run_search(
+        self,
+        repository: AsyncEmployeeRepository,
+        cache_key: str,
+        search: Optional[str],
+        limit: int,
+        offset: int,
+        after: Optional[Tuple[str, int]],
+        include_total: bool,
+        facet_fields: Tuple[str, ...],
+        filters: EmployeeFilters,
+        fuzzy: bool,
+        ranked: bool,
+        field_names: Tuple[str, ...]
+    ) -> dict:
+        """Query the repository for a validated search, build the response dict and cache it."""
+        # Sparse fieldsets narrow the SELECT; keyset pages also need (name, id) for the cursor
+        columns = select_columns(field_names, sort_keys=not (fuzzy or ranked))
+        # Perform search, fetching one extra row to detect whether a next page exists
+        try:
+            if fuzzy:
+                # Ranked by edit distance, so pages are addressed by offset only
+                employees, total = await repository.fuzzy_search_employees(search.strip(), limit, offset, columns)
+                result = page_result(employees, total, limit, offset)
+            else:
+                # Relevance-ranked pages are addressed by offset only: no extra row, no cursor
+                employees, total, facet_counts = await repository.search_employees(
+                    search, limit if ranked else limit + 1, offset, after, include_total, facet_fields, filters,
+                    columns
+                )
+                result = page_result(employees, total, limit, offset, facet_counts)
+            # Rows are trusted DB output: build plain dicts instead of validating models
+            result["employees"] = self._row_dicts(result["employees"], field_names)
+            await search_result_cache.set(cache_key, result)
+            return result
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
+    
+    async def suggest_employees(self, query: str, limit: int = 10) -> dict:
+        """
+        Autocomplete names and departments from the in-memory prefix index.
+        
+        Args:
+            query: Prefix typed so far
+            limit: Max suggestions (1-20)
+        
+        Returns:
+            Dict with the query and its suggestions, most frequent first
+        
+        Raises:
+            HTTPException: If validation fails
+        """
+        validate_suggest_params(query, limit)
+        index = await self.repository.ensure_prefix_index()
+        return {"query": query, "suggestions": index.suggest(query, limit)}
+    
+    async def get_employee_by_id(self, employee_id: int, fields: Optional[str] = None) -> dict:
+        """
+        Get employee by ID, optionally as a sparse fieldset.
+        
+        Returns:
+            Plain dict in EmployeeResponse field order (only `fields` and id
+            when given), ready for direct JSON encoding
+        """
+        validate_employee_id(employee_id)
+        field_names = parse_fields(fields)
+        
+        rows = await self.repository.get_employee_rows_by_ids(
+            [employee_id], select_columns(field_names, sort_keys=False)
+        )
+        
+        if not rows:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Employee with ID {employee_id} not found"
+            )
+        
+        return self._row_dicts(rows, field_names)[0]
+    
+    @staticmethod
+    def _row_dicts(rows: list, field_names: Tuple[str, ...]) -> List[dict]:
+        """Rows as response dicts, keeping only the requested fields (and id) of a sparse fieldset."""
+        if not field_names:
+            return [row._asdict() for row in rows]
+        return [{field: getattr(row, field) for field in field_names} for row in rows]
+    
+    async def batch_get_employees(self, employee_ids: List[int]) -> dict:
+        """
+        Resolve many employees by ID with a single IN query.
+        
+        Args:
+            employee_ids: IDs to resolve (1 to settings.batch_get_max_ids)
+        
+        Returns:
+            Dict with the found employees in request order (a repeated ID
+            repeats its employee) and the distinct IDs that do not exist;
+            employees are plain dicts, ready for direct JSON encoding
+        
+        Raises:
+            HTTPException: If the request is empty or oversized
+        """
+        validate_batch_ids(employee_ids)
+        rows = await self.repository.get_employee_rows_by_ids(employee_ids)
+        result = batch_result(employee_ids, rows)
+        result["employees"] = [row._asdict() for row in rows]
+        return result
+    
+    async def get_changes(self, since: int, limit: int) -> dict:
+        """
+        Incremental change feed: employees created, updated or deleted after `since`.
+        
+        Args:
+            since: Last change sequence the consumer has processed (0 for everything)
+            limit: Maximum number of changes (1 to settings.change_feed_max_limit)
+        
+        Returns:
+            Dict with the changes in sequence order, the `next_since` to resume
+            from and whether more changes are already waiting
+        
+        Raises:
+            HTTPException: If since or limit is out of range
+        """
+        validate_changes_params(since, limit)
+        employees, tombstones = await self.repository.get_changes(since, limit + 1)
+        return changes_result(since, limit, employees, tombstones)
+    
+    async def create_employee(self, employee_data: EmployeeCreate) -> EmployeeResponse:
+        """Create a new employee."""
+        # Check if email already exists
+        existing_employee = await self.repository.get_employee_by_email(employee_data.email)
+        if existing_employee:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Employee with email {employee_data.email} already exists"
+            )
+        
+        try:
+            return await self.repository.create_employee(employee_data.model_dump())
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create employee: {str(e)}"
+            )
+    
+    async def bulk_create_employees(self, employees: List[EmployeeCreate]) -> dict:
+        """
+        Create many employees in one transaction.
+        
+        Email uniqueness is checked with one set-based query; rows with an
+        email that already exists (or repeats within the request) are reported
+        as errors and the remaining rows are inserted in batches.
+        
+        Returns:
+            Dict with created/failed counts and per-row results
+        """
+        validate_bulk_size(employees)
+        existing = await self.repository.get_existing_emails(list({e.email for e in employees}))
+        results, to_insert = plan_bulk_create(employees, existing)
+        
+        try:
+            ids = await self.repository.bulk_create_employees(
+                [employees[i].model_dump() for i in to_insert],
+                settings.bulk_insert_batch_size
+            )
+        except IntegrityError:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A conflicting employee was created concurrently; no rows were inserted. Retry the request."
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to create employees: {str(e)}"
+            )
+        return bulk_result(results, to_insert, ids)
+    
+    async def export_employees(self, search: Optional[str] = None, fmt: str = "ndjson") -> AsyncIterator[bytes]:
+        """
+        Encode all matching employees as NDJSON or CSV, one chunk per fetched batch.
+        
+        Args:
+            search: Optional search term (same matching as search_employees)
+            fmt: "ndjson" or "csv"
+        """
+        columns = ["id", "name", "email", "department", "designation", "date_of_joining"]
+        if fmt == "csv":
+            yield (",".join(columns) + "\r\n").encode("utf-8")
+        
+        async for rows in self.repository.stream_employee_rows(search):
+            if fmt == "csv":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(
+                    (*row[:5], row[5].isoformat()) for row in rows
+                )
+                yield buffer.getvalue().encode("utf-8")
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(columns, (*row[:5], row[5].isoformat())))) + "\n"
+                    for row in rows
+                ).encode("utf-8")
@@ -0,0 +1,370 @@
+"""
+Validation, parsing and response shaping for the employee endpoints.
+
+AsyncEmployeeService (services.async_employee_service) calls these around its
+repository reads and writes. They touch no database, so they are plain
+functions; HTTPException carries every validation error to the route.
+"""
+from repositories.employee_repository import EMPLOYEE_FIELDS
+from repositories.employee_filters import EmployeeFilters
+from repositories.fulltext_search import fulltext_match
+from indexes.facet_counts import FACET_FIELDS
+from schemas import EmployeeCreate
+from pagination import encode_cursor, decode_cursor
+from config import settings
+from datetime import date
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+
+
+def validate_suggest_params(query: str, limit: int) -> None:
+    """
+    Validate autocomplete parameters.
+    
+    Raises:
+        HTTPException: If validation fails
+    """
+    if not query.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query must not be empty"
+        )
+    if limit < 1 or limit > 20:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Limit must be between 1 and 20"
+        )
+
+
+def validate_search_params(search: Optional[str], limit: int, offset: int) -> None:
+    """
+    Validate search and pagination parameters.
+    
+    Raises:
+        HTTPException: If validation fails
+    """
+    # Validate pagination parameters
+    if limit < 1 or limit > 100:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Limit must be between 1 and 100"
+        )
+    
+    if offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Offset must be non-negative"
+        )
+    
+    validate_search_term(search)
+
+
+def validate_search_term(search: Optional[str]) -> None:
+    """
+    Validate the length of an optional search term.
+    
+    Raises:
+        HTTPException: If validation fails
+    """
+    # Validate search term length if provided
+    if search is not None and len(search.strip()) > 0:
+        if len(search.strip()) < 2:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search term must be at least 2 characters"
+            )
+        if len(search.strip()) > 100:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search term must be less than 100 characters"
+            )
+
+
+def validate_fuzzy_params(
+    search: Optional[str],
+    cursor: Optional[str],
+    facet_fields: Tuple[str, ...],
+    filters: EmployeeFilters
+) -> None:
+    """
+    Validate a fuzzy search request.
+    
+    Raises:
+        HTTPException: If the combination of parameters is not supported
+    """
+    if not search or not search.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Fuzzy search requires a search term"
+        )
+    if cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Fuzzy results are ranked by distance; page with offset instead of cursor"
+        )
+    if facet_fields:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Facets are not available for fuzzy search"
+        )
+    if filters:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filters are not available for fuzzy search"
+        )
+
+
+def is_relevance_ranked(search: Optional[str], cursor: Optional[str]) -> bool:
+    """
+    Whether the full-text backend answers this search, ranking results by relevance.
+    
+    Raises:
+        HTTPException: If a keyset cursor is given for a ranked search
+    """
+    if fulltext_match(search.strip() if search else None) is None:
+        return False
+    if cursor:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Full-text results are ranked by relevance; page with offset instead of cursor"
+        )
+    return True
+
+
+def build_filters(
+    department: Optional[str],
+    designation: Optional[str],
+    joined_from: Optional[date],
+    joined_to: Optional[date]
+) -> EmployeeFilters:
+    """
+    Normalize structured filters; blank department / designation values are ignored.
+    
+    Raises:
+        HTTPException: If the date range is empty
+    """
+    if joined_from is not None and joined_to is not None and joined_from > joined_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="joined_from must not be after joined_to"
+        )
+    return EmployeeFilters(
+        department=(department.strip() or None) if department else None,
+        designation=(designation.strip() or None) if designation else None,
+        joined_from=joined_from,
+        joined_to=joined_to
+    )
+
+
+def parse_facets(facets: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse the comma-separated facets parameter into known facet fields.
+    
+    Raises:
+        HTTPException: If an unknown facet is requested
+    """
+    if not facets:
+        return ()
+    fields = []
+    for field in facets.split(","):
+        field = field.strip().lower()
+        if not field or field in fields:
+            continue
+        if field not in FACET_FIELDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown facet '{field}'; available facets: {', '.join(FACET_FIELDS)}"
+            )
+        fields.append(field)
+    return tuple(fields)
+
+
+def parse_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse the comma-separated fields parameter into a sparse fieldset.
+    
+    Returns:
+        Requested fields plus id, in EmployeeResponse order; () for all fields
+    
+    Raises:
+        HTTPException: If an unknown field is requested
+    """
+    if not fields:
+        return ()
+    requested = {field.strip().lower() for field in fields.split(",") if field.strip()}
+    unknown = sorted(requested - set(EMPLOYEE_FIELDS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field '{unknown[0]}'; available fields: {', '.join(EMPLOYEE_FIELDS)}"
+        )
+    requested.add("id")
+    if len(requested) == len(EMPLOYEE_FIELDS):
+        return ()
+    return tuple(field for field in EMPLOYEE_FIELDS if field in requested)
+
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[str, int]]:
+    """Decode a pagination cursor into its (name, id) keyset, or None if absent."""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def page_result(
+    employees: list,
+    total: Optional[int],
+    limit: int,
+    offset: int,
+    facets: Optional[dict] = None
+) -> dict:
+    """
+    Build the list response from a page fetched with limit + 1 rows.
+    The extra row only signals that a next page exists.
+    """
+    next_cursor = None
+    if len(employees) > limit:
+        employees = employees[:limit]
+        next_cursor = encode_cursor(employees[-1].name, employees[-1].id)
+    
+    return {
+        "employees": employees,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+        "facets": facets
+    }
+
+
+def validate_employee_id(employee_id: int) -> None:
+    """Reject IDs that can never exist."""
+    if employee_id < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid employee ID"
+        )
+
+
+def validate_batch_ids(employee_ids: List[int]) -> None:
+    """Reject empty or oversized batch-get requests."""
+    if not employee_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one employee ID is required"
+        )
+    if len(employee_ids) > settings.batch_get_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.batch_get_max_ids} employee IDs can be requested at once"
+        )
+
+
+def batch_result(employee_ids: List[int], employees: list) -> dict:
+    """Pair the found employees with the distinct requested IDs that were not found."""
+    found = {employee.id for employee in employees}
+    missing = [employee_id for employee_id in dict.fromkeys(employee_ids) if employee_id not in found]
+    return {"employees": employees, "missing": missing}
+
+
+def validate_changes_params(since: int, limit: int) -> None:
+    """Reject a negative sequence or a limit outside 1..settings.change_feed_max_limit."""
+    if since < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="since must be non-negative"
+        )
+    if limit < 1 or limit > settings.change_feed_max_limit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must be between 1 and {settings.change_feed_max_limit}"
+        )
+
+
+def changes_result(since: int, limit: int, employees: list, tombstones: list) -> dict:
+    """
+    Merge employee and tombstone rows (each sorted by change_seq, up to
+    limit + 1) into one page of at most `limit` changes.
+    """
+    changes = [
+        {
+            "seq": row.change_seq,
+            "op": "upsert",
+            "id": row.id,
+            "employee": {field: getattr(row, field) for field in EMPLOYEE_FIELDS},
+        }
+        for row in employees
+    ]
+    changes += [
+        {"seq": row.change_seq, "op": "delete", "id": row.employee_id, "employee": None}
+        for row in tombstones
+    ]
+    changes.sort(key=lambda change: change["seq"])
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    return {
+        "changes": changes,
+        "next_since": changes[-1]["seq"] if changes else since,
+        "has_more": has_more,
+    }
+
+
+def validate_bulk_size(employees: List[EmployeeCreate]) -> None:
+    """Reject empty or oversized bulk requests."""
+    if not employees:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one employee is required"
+        )
+    if len(employees) > settings.bulk_create_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_create_max_rows} employees can be created per request"
+        )
+
+
+def plan_bulk_create(employees: List[EmployeeCreate], existing: set) -> Tuple[List[dict], List[int]]:
+    """
+    Split a bulk request into rows to insert and rows rejected for duplicate emails.
+    
+    Returns:
+        Tuple of (per-row results, indexes of rows to insert)
+    """
+    results = []
+    to_insert = []
+    seen = set()
+    for index, employee in enumerate(employees):
+        email = employee.email.lower()
+        error = None
+        if email in existing:
+            error = f"Employee with email {employee.email} already exists"
+        elif email in seen:
+            error = f"Duplicate email {employee.email} in request"
+        seen.add(email)
+        results.append({
+            "index": index,
+            "email": employee.email,
+            "status": "error" if error else "created",
+            "id": None,
+            "error": error
+        })
+        if error is None:
+            to_insert.append(index)
+    return results, to_insert
+
+
+def bulk_result(results: List[dict], to_insert: List[int], ids: List[int]) -> dict:
+    """Attach generated IDs to the inserted rows and summarize."""
+    for index, employee_id in zip(to_insert, ids):
+        results[index]["id"] = employee_id
+    return {
+        "created": len(to_insert),
+        "failed": len(results) - len(to_insert),
+        "results": results
+    }
@@ -0,0 +1,231 @@
+"""
+Search result cache in front of AsyncEmployeeService.search_employees.
+
+Results are cached per normalized (data version, search, limit, offset, cursor,
+include_total, facets, fuzzy, filters, fields) key with bounded size, LRU
+eviction and a TTL. The data version is the one the request reads at
+(repositories.data_version), so a search that was overtaken by a write stores
+its page under the old version, where no later request looks. Every committed
+write also clears the cache through the repository write listeners, which
+frees the entries no request can reach any more. The backend is pluggable:
+
+- "memory": in-process OrderedDict, one cache per worker
+- "sqlite": a SQLite file shared by all workers on the host, standing in for a
+  shared cache such as Redis; a write in any worker clears it for all of them.
+  Its lookups run in a worker thread, off the event loop
+- "none": caching disabled
+
+With the "memory" backend, writes made by other processes are picked up when
+the shared data version shows a change this process did not make.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Sequence, Tuple
+
+import orjson
+
+from config import settings
+from indexes.collation import fold
+from repositories.data_version import data_version
+from repositories.write_hooks import register_write_listener
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry."""
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqliteCacheBackend:
+    """
+    Host-local shared cache stored in a SQLite file.
+    
+    Stands in for a shared cache server: every worker process opens the same
+    file, so entries and invalidations are visible to all of them. Entries are
+    evicted oldest-stored first, so a hit is a single read and never a write.
+    """
+    
+    # File I/O under a lock: SearchResultCache runs the calls in a thread
+    blocking = True
+    
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        import sqlite3  # Only this backend needs the driver; keep it off the import path otherwise
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Earlier layout, ordered by last access
+        self._conn.execute("DROP TABLE IF EXISTS search_cache")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_results_stored_at ON search_results (stored_at)"
+        )
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM search_results WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            return row[0] if row is not None else None
+    
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (key, value, expires_at, stored_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now)
+            )
+            self._conn.execute("DELETE FROM search_results WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM search_results WHERE key IN ("
+                "SELECT key FROM search_results ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM search_results")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+
+
+class SearchResultCache:
+    """Normalizes keys, (de)serializes results and counts hits and misses."""
+    
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+    
+    @staticmethod
+    def make_key(
+        version: int,
+        search: Optional[str],
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+        include_total: bool,
+        facet_fields: Sequence[str] = (),
+        fuzzy: bool = False,
+        filters_key: str = "",
+        fields: Sequence[str] = ()
+    ) -> str:
+        """
+        Build the cache key for a search at data `version`; case is folded
+        as the database's LIKE folds it (indexes.collation.fold: ASCII
+        letters only), so terms share an entry only when they match alike.
+        """
+        term = fold(search.strip()) if search else ""
+        return json.dumps(
+            [
+                version, term, limit, offset, cursor or "", include_total, ",".join(facet_fields), fuzzy, filters_key,
+                ",".join(fields)
+            ],
+            separators=(",", ":")
+        )
+    
+    async def _call(self, method, *args):
+        """Call a backend method, in a worker thread when the backend blocks on I/O."""
+        if getattr(self.backend, "blocking", False):
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+    
+    async def get(self, key: str) -> Optional[dict]:
+        if self.backend is None:
+            return None
+        value = await self._call(self.backend.get, key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return orjson.loads(value)
+    
+    async def set(self, key: str, result: dict) -> None:
+        if self.backend is not None:
+            await self._call(self.backend.set, key, orjson.dumps(result).decode("utf-8"))
+    
+    def invalidate(self) -> None:
+        if self.backend is not None:
+            self.backend.clear()
+    
+    def on_employees_created(self, employees) -> None:
+        """Write listener: new employees can appear in any cached result."""
+        self.invalidate()
+    
+    def stats(self) -> dict:
+        """Hit/miss counters and current size for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": settings.search_cache_backend,
+            "entries": len(self.backend) if self.backend is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _create_backend():
+    """Instantiate the backend selected by settings.search_cache_backend."""
+    backend = settings.search_cache_backend.lower()
+    if backend == "memory":
+        return MemoryCacheBackend(settings.search_cache_max_entries, settings.search_cache_ttl_seconds)
+    if backend == "sqlite":
+        return SqliteCacheBackend(
+            settings.search_cache_path,
+            settings.search_cache_max_entries,
+            settings.search_cache_ttl_seconds
+        )
+    if backend == "none":
+        return None
+    raise ValueError(f"Unknown search cache backend: {settings.search_cache_backend}")
+
+
+# Shared result cache for this worker process
+search_result_cache = SearchResultCache(_create_backend())
+register_write_listener(search_result_cache.on_employees_created)
+data_version.register_external_change_listener(search_result_cache.invalidate)
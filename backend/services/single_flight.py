@@ -0,0 +1,71 @@
+"""
+Single-flight coalescing for identical concurrent searches.
+
+When many clients run the same search at the same moment (an all-hands email
+names someone), the first request starts the database work and every request
+with the same normalized parameters that arrives while it is in flight awaits
+that same execution instead of running its own queries. The key is the search
+result cache key, so "coalesced" means exactly "would have been a cache hit
+had the first request already finished". That key leads with the data version
+the request reads at: a request arriving after a write reads a newer version
+and starts its own execution rather than awaiting one that began before the
+write and may not see it.
+
+Coalescing is per worker process and only spans the time a search is in
+flight; the result cache takes over once it has finished.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from config import settings
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs one execution per key at a time and shares its outcome with every concurrent caller."""
+    
+    def __init__(self):
+        self._in_flight: Dict[str, "asyncio.Future"] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    async def do(self, key: str, work: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await the in-flight execution for `key`, starting `work()` if there is none.
+        
+        The execution runs as its own task and is shielded, so a caller that is
+        cancelled (client disconnect) never cancels it for the others. Its result
+        or exception is delivered to every caller.
+        
+        Args:
+            key: Normalized request parameters
+            work: Coroutine factory doing the actual work
+        
+        Returns:
+            The shared result
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _, key=key: self._in_flight.pop(key, None))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+    
+    def stats(self) -> dict:
+        """Execution and coalescing counters for monitoring."""
+        requests = self.executions + self.coalesced
+        return {
+            "enabled": settings.search_coalescing_enabled,
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / requests, 4) if requests else 0.0,
+        }
+
+
+# Shared search coalescer for this worker process
+search_flights = SingleFlight()
@@ -0,0 +1,142 @@
+"""
+Directory snapshot builder for multi-worker deployments.
+
+Builds the columnar directory snapshot once and publishes it as a file that
+every uvicorn worker on the host maps read-only (SNAPSHOT_FILE_PATH together
+with SNAPSHOT_SERVING_ENABLED=true), instead of each worker loading and
+holding its own copy:
+- the first version is built from one query over the employees table
+- afterwards the builder polls the directory data version (the change
+  sequence counter in the primary database) and, whenever it moves past the
+  snapshot, applies a change feed delta and republishes; writes from any
+  worker, host or the importer move it
+- every version is written to a temporary file and renamed over the previous
+  one, so workers always map a complete file
+
+Workers serve from the file only while it holds every change up to the data
+version their request reads at, and read from the database otherwise, so a
+write is visible immediately and served from the snapshot again after the
+next publish.
+
+Usage:
+    python snapshot_builder.py --path /dev/shm/employee_snapshot.bin
+    python snapshot_builder.py --path snapshot.bin --once
+"""
+import argparse
+import logging
+import time
+from sqlalchemy import select
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the data version
+POLL_SECONDS = 0.2
+
+
+def read_data_version() -> int:
+    """Current directory data version, from the primary database."""
+    from database import SessionLocal
+    from repositories.change_feed import data_version_query
+    
+    db = SessionLocal()
+    db.info["use_primary"] = True
+    try:
+        row = db.execute(data_version_query()).first()
+        return row.value if row else 0
+    finally:
+        db.close()
+
+
+def build_snapshot():
+    """Build a DirectorySnapshot from the primary database."""
+    from database import SessionLocal
+    from indexes.directory_snapshot import DirectorySnapshot
+    from models import Employee
+    from repositories.employee_repository import EMPLOYEE_COLUMNS
+    
+    db = SessionLocal()
+    db.info["use_primary"] = True
+    try:
+        snapshot = DirectorySnapshot()
+        snapshot.build(db.execute(select(Employee.change_seq, *EMPLOYEE_COLUMNS).order_by(Employee.id)).all())
+        return snapshot
+    finally:
+        db.close()
+
+
+def apply_delta(snapshot) -> None:
+    """Bring a snapshot up to date with the change feed."""
+    from database import SessionLocal
+    from repositories.employee_repository import EmployeeRepository
+    
+    # A session per delta, so each one reads in a new transaction
+    db = SessionLocal()
+    db.info["use_primary"] = True
+    try:
+        employees, tombstones = EmployeeRepository(db).get_changes(snapshot.seq, None)
+        snapshot.apply_changes(employees, tombstones)
+    finally:
+        db.close()
+
+
+def publish(path: str, snapshot) -> None:
+    """Write the snapshot file and report it."""
+    from indexes.snapshot_file import write_snapshot_file
+    
+    started = time.perf_counter()
+    size = write_snapshot_file(path, snapshot)
+    logger.info(
+        f"✓ Published snapshot seq {snapshot.seq} ({len(snapshot)} employees, "
+        f"{size / 2**20:.1f} MiB) in {time.perf_counter() - started:.2f}s"
+    )
+
+
+def run(path: str, once: bool = False) -> None:
+    """
+    Publish the snapshot to `path` and keep republishing it as the directory changes.
+    
+    Args:
+        path: Snapshot file shared with the workers (settings.snapshot_file_path)
+        once: Publish one version and return
+    """
+    started = time.perf_counter()
+    snapshot = build_snapshot()
+    # The build only sees live rows; a delta adds deletions recorded after them
+    apply_delta(snapshot)
+    logger.info(f"✓ Built snapshot of {len(snapshot)} employees in {time.perf_counter() - started:.2f}s")
+    publish(path, snapshot)
+    if once:
+        return
+    
+    while True:
+        time.sleep(POLL_SECONDS)
+        if read_data_version() <= snapshot.seq:
+            continue
+        seq = snapshot.seq
+        apply_delta(snapshot)
+        if snapshot.seq != seq:
+            publish(path, snapshot)
+
+
+def main(argv=None):
+    from config import settings
+    
+    parser = argparse.ArgumentParser(description="Publish the directory snapshot shared by worker processes.")
+    parser.add_argument(
+        "--path", default=settings.snapshot_file_path,
+        help="Snapshot file (default: SNAPSHOT_FILE_PATH)"
+    )
+    parser.add_argument("--once", action="store_true", help="Publish one version and exit")
+    args = parser.parse_args(argv)
+    
+    if not args.path:
+        parser.error("--path or SNAPSHOT_FILE_PATH is required")
+    try:
+        run(args.path, args.once)
+    except KeyboardInterrupt:
+        logger.info("Snapshot builder stopped")
+
+
+if __name__ == "__main__":
+    main()
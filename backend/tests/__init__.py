@@ -0,0 +1 @@
+"""Backend test package (pytest)."""
@@ -0,0 +1,129 @@
+"""
+Shared fixtures for the backend tests.
+
+Settings are read and engines are created when the application modules are
+imported, so the environment is pointed at a throwaway SQLite database before
+anything from the app is imported. Every test starts from a freshly created
+schema holding EMPLOYEES, with the in-memory indexes and caches emptied.
+
+Run from the backend directory:
+    python -m pytest -q
+"""
+import os
+import tempfile
+from datetime import date
+
+_directory = tempfile.mkdtemp(prefix="employee_directory_tests_")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_directory, 'employees.db')}",
+    ASYNC_DATABASE_URL="",
+    REPLICA_DATABASE_URLS="",
+    STARTUP_MODE="lean",
+    SEARCH_BACKEND="like",
+    SEARCH_CACHE_BACKEND="memory",
+    SNAPSHOT_SERVING_ENABLED="false",
+    SNAPSHOT_FILE_PATH="",
+)
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from database import AsyncSessionLocal, Base, SessionLocal, engine
+from init_db import init_db
+from models import Employee
+from repositories.change_feed import stamp_change_seqs
+
+# (name, department, designation, date_of_joining), inserted with IDs 1..8
+EMPLOYEES = [
+    ("Aarav Sharma", "Engineering", "Software Engineer", date(2019, 3, 1)),
+    ("Priya Kumar", "Engineering", "Senior Engineer", date(2020, 7, 15)),
+    ("Rahul Kumar", "Sales", "Account Manager", date(2021, 1, 4)),
+    ("Sneha Iyer", "Human Resources", "HR Manager", date(2021, 9, 30)),
+    ("Vikram Singh", "Sales", "Sales Executive", date(2022, 2, 14)),
+    ("Ananya Das", "Marketing", "Content Strategist", date(2022, 11, 1)),
+    ("Kiran Rao", "Engineering", "Intern", date(2023, 6, 5)),
+    ("Meera Nair", "Finance", "Analyst", date(2023, 12, 20)),
+]
+
+
+def employee_rows():
+    """EMPLOYEES as insert rows with unique emails."""
+    return [
+        {
+            "name": name,
+            "email": f"{name.lower().replace(' ', '.')}@company.com",
+            "department": department,
+            "designation": designation,
+            "date_of_joining": joined,
+        }
+        for name, department, designation, joined in EMPLOYEES
+    ]
+
+
+def new_employee(name: str, department: str = "Engineering", **fields) -> dict:
+    """JSON body for POST /api/employees."""
+    return {
+        "name": name,
+        "email": f"{name.lower().replace(' ', '.')}@company.com",
+        "department": department,
+        "designation": "Engineer",
+        "date_of_joining": "2024-01-02",
+        **fields,
+    }
+
+
+def reset_derived_state() -> None:
+    """Empty every in-memory index and cache built from the employees table."""
+    from indexes.directory_snapshot import directory_snapshot
+    from indexes.facet_counts import facet_counts
+    from indexes.fuzzy_index import fuzzy_index
+    from indexes.prefix_index import prefix_index
+    from indexes.trigram_index import trigram_index
+    from repositories.count_cache import search_count_cache
+    from repositories.data_version import data_version
+    from services.search_cache import search_result_cache
+    
+    trigram_index.reset()
+    facet_counts.reset()
+    prefix_index.reset()
+    fuzzy_index.reset()
+    directory_snapshot.reset()
+    search_count_cache.invalidate()
+    search_result_cache.invalidate()
+    # The recreated database starts its change counter over
+    data_version._seen = None
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Recreate the schema holding EMPLOYEES before every test."""
+    Base.metadata.drop_all(bind=engine)
+    assert init_db()
+    with SessionLocal() as db:
+        db.execute(insert(Employee), stamp_change_seqs(db, employee_rows()))
+        db.commit()
+    reset_derived_state()
+    yield
+    reset_derived_state()
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_db():
+    """An AsyncSession on the test database (aiosqlite), for repository tests."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+@pytest.fixture
+def client():
+    """TestClient for the application, with startup events run."""
+    from main import app
+    
+    with TestClient(app) as client:
+        yield client
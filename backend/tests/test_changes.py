@@ -0,0 +1,76 @@
+"""GET /api/employees/changes: the incremental change feed."""
+from sqlalchemy import delete, event, update
+
+from database import SessionLocal, engine
+from models import ChangeSequence, Employee
+from repositories.change_feed import allocate_change_seqs, record_deletions
+from tests.conftest import EMPLOYEES, new_employee
+
+
+def test_initial_sync_returns_every_employee(client):
+    body = client.get("/api/employees/changes", params={"since": 0, "limit": 1000}).json()
+    
+    assert [change["id"] for change in body["changes"]] == list(range(1, len(EMPLOYEES) + 1))
+    assert all(change["op"] == "upsert" for change in body["changes"])
+    assert body["changes"][0]["employee"]["name"] == "Aarav Sharma"
+    assert body["next_since"] == body["changes"][-1]["seq"]
+    assert body["has_more"] is False
+
+
+def test_pages_resume_from_next_since(client):
+    first = client.get("/api/employees/changes", params={"since": 0, "limit": 5}).json()
+    second = client.get("/api/employees/changes", params={"since": first["next_since"], "limit": 5}).json()
+    
+    assert first["has_more"] is True
+    assert second["has_more"] is False
+    assert [c["id"] for c in first["changes"] + second["changes"]] == list(range(1, len(EMPLOYEES) + 1))
+
+
+def test_updates_and_deletes_are_reported_once_in_their_latest_state(client):
+    since = client.get("/api/employees/changes", params={"since": 0, "limit": 1000}).json()["next_since"]
+    created = client.post("/api/employees", json=new_employee("Dev Patel")).json()
+    with SessionLocal() as db:
+        db.execute(
+            update(Employee).where(Employee.id == 2)
+            .values(designation="Staff Engineer", change_seq=allocate_change_seqs(db, 1)[0])
+        )
+        record_deletions(db, [4])
+        db.execute(delete(Employee).where(Employee.id == 4))
+        db.commit()
+    
+    changes = client.get("/api/employees/changes", params={"since": since}).json()["changes"]
+    
+    assert [(c["op"], c["id"]) for c in changes] == [("upsert", created["id"]), ("upsert", 2), ("delete", 4)]
+    assert changes[1]["employee"]["designation"] == "Staff Engineer"
+    assert changes[2]["employee"] is None
+    assert [c["seq"] for c in changes] == sorted(c["seq"] for c in changes)
+
+
+def test_nothing_new(client):
+    since = client.get("/api/employees/changes", params={"since": 0, "limit": 1000}).json()["next_since"]
+    
+    body = client.get("/api/employees/changes", params={"since": since}).json()
+    
+    assert body == {"changes": [], "next_since": since, "has_more": False}
+
+
+def test_first_writers_racing_to_create_the_counter_both_get_numbers():
+    with SessionLocal() as db:
+        db.execute(delete(ChangeSequence))
+        db.commit()
+    
+    def another_writer_creates_it_first(connection, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT") and "change_sequences" in statement:
+            cursor.execute("INSERT INTO change_sequences (name, value, modified_at) VALUES ('employees', ?, 0)", (
+                len(EMPLOYEES) + 1,
+            ))
+    
+    event.listen(engine, "before_cursor_execute", another_writer_creates_it_first)
+    try:
+        with SessionLocal() as db:
+            seqs = allocate_change_seqs(db, 2)
+            db.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", another_writer_creates_it_first)
+    
+    assert list(seqs) == [len(EMPLOYEES) + 2, len(EMPLOYEES) + 3]
@@ -0,0 +1,71 @@
+"""Single-flight coalescing of identical concurrent searches."""
+import asyncio
+from datetime import date
+
+import pytest
+
+from database import AsyncSessionLocal, SessionLocal
+from repositories.async_employee_repository import AsyncEmployeeRepository
+from repositories.employee_repository import EmployeeRepository
+from services.async_employee_service import AsyncEmployeeService
+from services.single_flight import search_flights
+from tests.conftest import new_employee
+
+pytestmark = pytest.mark.anyio
+
+
+async def search(term: str) -> list:
+    async with AsyncSessionLocal() as db:
+        result = await AsyncEmployeeService(db).search_employees(search=term)
+    return [employee["name"] for employee in result["employees"]]
+
+
+async def until(condition) -> None:
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+@pytest.fixture
+def hold_first_search(monkeypatch) -> asyncio.Event:
+    """Keep the first repository search waiting until the returned event is set."""
+    release = asyncio.Event()
+    search_employees = AsyncEmployeeRepository.search_employees
+    calls = []
+    
+    async def held(self, *args, **kwargs):
+        calls.append(args)
+        if len(calls) == 1:
+            await release.wait()
+        return await search_employees(self, *args, **kwargs)
+    
+    monkeypatch.setattr(AsyncEmployeeRepository, "search_employees", held)
+    return release
+
+
+async def test_identical_searches_share_one_execution(hold_first_search):
+    executions, coalesced = search_flights.executions, search_flights.coalesced
+    searches = [asyncio.create_task(search("kumar")) for _ in range(3)]
+    await until(lambda: search_flights.coalesced == coalesced + 2)
+    
+    hold_first_search.set()
+    
+    assert await asyncio.gather(*searches) == [["Priya Kumar", "Rahul Kumar"]] * 3
+    assert search_flights.executions == executions + 1
+
+
+async def test_a_search_after_a_write_does_not_join_an_earlier_flight(hold_first_search):
+    executions = search_flights.executions
+    first = asyncio.create_task(search("kumar"))
+    await until(lambda: search_flights.executions == executions + 1)
+    with SessionLocal() as db:
+        row = new_employee("Karan Kumar", date_of_joining=date(2024, 1, 2))
+        EmployeeRepository(db).bulk_create_employees([row])
+    
+    # Runs on its own while the earlier flight is still held
+    assert await asyncio.wait_for(search("kumar"), 5) == ["Karan Kumar", "Priya Kumar", "Rahul Kumar"]
+    hold_first_search.set()
+    await first
+    assert search_flights.executions == executions + 2
@@ -0,0 +1,100 @@
+"""Employee lookups and writes: get by ID, batch-get, create, bulk create and export."""
+import csv
+import io
+import json
+
+from tests.conftest import EMPLOYEES, new_employee
+
+
+def test_get_employee(client):
+    response = client.get("/api/employees/3")
+    
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": 3,
+        "name": "Rahul Kumar",
+        "email": "rahul.kumar@company.com",
+        "department": "Sales",
+        "designation": "Account Manager",
+        "date_of_joining": "2021-01-04",
+    }
+
+
+def test_get_employee_sparse_fieldset(client):
+    assert client.get("/api/employees/3", params={"fields": "email"}).json() == {
+        "id": 3, "email": "rahul.kumar@company.com"
+    }
+
+
+def test_get_missing_employee(client):
+    response = client.get("/api/employees/999")
+    
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Employee with ID 999 not found"}
+
+
+def test_batch_get_keeps_request_order_and_reports_missing(client):
+    response = client.post("/api/employees/batch-get", json={"ids": [5, 999, 1, 5]})
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert [employee["id"] for employee in body["employees"]] == [5, 1, 5]
+    assert body["missing"] == [999]
+
+
+def test_batch_get_rejects_empty_list(client):
+    assert client.post("/api/employees/batch-get", json={"ids": []}).status_code == 400
+
+
+def test_create_employee(client):
+    response = client.post("/api/employees", json=new_employee("Nisha Verma", department="Legal"))
+    
+    assert response.status_code == 201
+    created = response.json()
+    assert created["id"] == len(EMPLOYEES) + 1
+    assert client.get(f"/api/employees/{created['id']}").json() == created
+    assert client.get("/api/employees", params={"search": "legal"}).json()["total"] == 1
+
+
+def test_create_employee_with_duplicate_email(client):
+    response = client.post("/api/employees", json=new_employee("Copy", email="rahul.kumar@company.com"))
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Employee with email rahul.kumar@company.com already exists"}
+
+
+def test_bulk_create_reports_every_row(client):
+    response = client.post("/api/employees/bulk", json=[
+        new_employee("Bulk One"),
+        new_employee("Duplicate", email="priya.kumar@company.com"),
+        new_employee("Bulk Two"),
+        new_employee("Bulk Two Again", email="bulk.two@company.com"),
+    ])
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [row["status"] for row in body["results"]] == ["created", "error", "created", "error"]
+    created_ids = [row["id"] for row in body["results"] if row["id"] is not None]
+    assert [client.get(f"/api/employees/{i}").json()["name"] for i in created_ids] == ["Bulk One", "Bulk Two"]
+
+
+def test_bulk_create_rejects_empty_body(client):
+    assert client.post("/api/employees/bulk", json=[]).status_code == 400
+
+
+def test_export_ndjson(client):
+    response = client.get("/api/employees/export", params={"format": "ndjson", "search": "kumar"})
+    
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == ["Priya Kumar", "Rahul Kumar"]
+    assert rows[0]["date_of_joining"] == "2020-07-15"
+
+
+def test_export_csv(client):
+    response = client.get("/api/employees/export", params={"format": "csv"})
+    
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == len(EMPLOYEES)
+    assert rows[0]["email"] == "aarav.sharma@company.com"
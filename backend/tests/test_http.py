@@ -0,0 +1,158 @@
+"""HTTP layer: conditional GETs, response compression and /metrics."""
+import gzip
+import time
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from types import SimpleNamespace
+
+from sqlalchemy import select, update
+
+import pytest
+
+from compression import CompressionMiddleware
+from database import SessionLocal
+import http_cache
+from models import ChangeSequence, Employee
+from repositories.change_feed import allocate_change_seqs
+from tests.conftest import new_employee
+
+
+def last_written(seconds_ago: int) -> None:
+    """Date the last write `seconds_ago` back, as if it had been made then."""
+    with SessionLocal() as db:
+        db.execute(update(ChangeSequence).values(modified_at=int(time.time()) - seconds_ago))
+        db.commit()
+
+
+def test_etag_revalidation_until_a_write(client):
+    first = client.get("/api/employees", params={"search": "kumar"})
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    
+    revalidated = client.get("/api/employees", params={"search": "kumar"}, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    
+    client.post("/api/employees", json=new_employee("Karan Kumar"))
+    changed = client.get("/api/employees", params={"search": "kumar"}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["total"] == 3
+
+
+def test_if_modified_since(client):
+    last_written(60)
+    last_modified = client.get("/api/employees/1").headers["last-modified"]
+    
+    assert client.get("/api/employees/1", headers={"If-Modified-Since": last_modified}).status_code == 304
+    assert client.get(
+        "/api/employees/1", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}
+    ).status_code == 200
+
+
+def test_writes_carry_no_validators(client):
+    response = client.post("/api/employees", json=new_employee("Tara Menon"))
+    
+    assert response.status_code == 201
+    assert "etag" not in response.headers
+
+
+def test_large_bodies_are_gzipped(client):
+    response = client.get("/api/employees", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert len(response.json()["employees"]) == 8
+
+
+def test_small_bodies_are_not_compressed(client):
+    response = client.get("/api/employees/1", headers={"Accept-Encoding": "gzip"})
+    
+    assert "content-encoding" not in response.headers
+
+
+def test_streamed_exports_are_compressed_chunk_by_chunk(client):
+    with client.stream(
+        "GET", "/api/employees/export", params={"format": "csv"}, headers={"Accept-Encoding": "gzip"}
+    ) as response:
+        raw = b"".join(response.iter_raw())
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw).decode("utf-8").startswith("id,name,email")
+
+
+@pytest.mark.anyio
+async def test_each_streamed_chunk_decodes_on_arrival():
+    rows = [f"{number},Employee {number}\n".encode() for number in range(3)]
+    
+    async def export(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/csv")]})
+        for index, row in enumerate(rows):
+            await send({"type": "http.response.body", "body": row, "more_body": index < len(rows) - 1})
+    
+    sent = []
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(export)(scope, None, send)
+    
+    decoder = zlib.decompressobj(31)
+    assert [decoder.decompress(message["body"]) for message in sent[1:]] == rows
+    assert decoder.eof
+
+
+def test_metrics_exposition(client):
+    client.get("/api/employees", params={"search": "kumar"})
+    
+    body = client.get("/metrics").text
+    assert "# TYPE" in body
+    assert "/api/employees" in body
+
+
+def test_validators_come_from_the_database_counter(client):
+    from repositories.change_feed import data_version_query
+    
+    last_written(60)
+    with SessionLocal() as db:
+        counter = db.execute(data_version_query()).one()
+    response = client.get("/api/employees/1")
+    
+    assert response.headers["etag"] == f'W/"{counter.value}"'
+    assert response.headers["last-modified"] == formatdate(counter.modified_at, usegmt=True)
+
+
+def test_writes_from_another_host_change_the_etag_and_clear_caches(client):
+    etag = client.get("/api/employees", params={"search": "kumar"}).headers["etag"]
+    # A write this process never hears about, as made by a worker on another host
+    with SessionLocal() as db:
+        db.execute(
+            update(Employee).where(Employee.id == 2)
+            .values(name="Priya Menon", change_seq=allocate_change_seqs(db, 1)[0])
+        )
+        db.commit()
+    
+    response = client.get("/api/employees", params={"search": "kumar"}, headers={"If-None-Match": etag})
+    
+    assert response.status_code == 200
+    assert [employee["name"] for employee in response.json()["employees"]] == ["Rahul Kumar"]
+
+
+def test_last_modified_is_the_write_time_and_waits_for_its_second_to_end(client, monkeypatch):
+    last_written(60)
+    first = client.get("/api/employees/1").headers["last-modified"]
+    for number in range(5):
+        client.post("/api/employees", json=new_employee(f"Ira Bose {number}"))
+    
+    with SessionLocal() as db:
+        modified_at = db.scalar(select(ChangeSequence.modified_at))
+    assert parsedate_to_datetime(first).timestamp() < modified_at <= time.time()
+    
+    # Still in the second of the writes, which share its time: no Last-Modified, no 304 on it
+    monkeypatch.setattr(http_cache, "time", SimpleNamespace(time=lambda: modified_at + 0.5))
+    response = client.get("/api/employees/1", headers={"If-Modified-Since": formatdate(modified_at, usegmt=True)})
+    assert response.status_code == 200
+    assert "last-modified" not in response.headers
+    assert client.get("/api/employees/1", headers={"If-Modified-Since": first}).status_code == 200
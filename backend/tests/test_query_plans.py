@@ -0,0 +1,46 @@
+"""Employee indexes: every filter combination is answered through one (EXPLAIN QUERY PLAN on SQLite)."""
+import pytest
+from sqlalchemy import inspect, text
+
+from benchmarks.common import create_seeded_sqlite
+from benchmarks.explain_filters import explain, filter_combinations, statements
+from database import engine
+from indexes.facet_counts import facet_counts
+from init_db import init_db
+from repositories.employee_repository import facet_group_query
+
+# Enough rows for ANALYZE statistics to steer the planner as in production
+ROWS = 20000
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    """Engine on a seeded, analyzed SQLite database."""
+    engine = create_seeded_sqlite(ROWS)
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("kind", ["page", "next", "count"])
+@pytest.mark.parametrize("term", ["", "ra"])
+@pytest.mark.parametrize("label,filters", list(filter_combinations()))
+def test_filter_combinations_use_an_index(seeded, label, filters, term, kind):
+    with seeded.connect() as connection:
+        # As in a serving worker, so the filters are planned from real selectivities
+        facet_counts.build(connection.execute(facet_group_query()).all())
+        lines, uses_index = explain(connection, statements(filters, term)[kind])
+    
+    assert uses_index, "\n".join(lines)
+
+
+def test_init_db_drops_retired_indexes():
+    with engine.begin() as connection:
+        connection.execute(text("CREATE INDEX idx_department ON employees (department)"))
+    
+    assert init_db()
+    
+    names = {index["name"] for index in inspect(engine).get_indexes("employees")}
+    assert "idx_department" not in names
+    assert "idx_department_name" in names
@@ -0,0 +1,67 @@
+"""Read/write routing between the primary and a read replica."""
+import sqlite3
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+
+from config import settings
+from database import AsyncRoutingSession, AsyncSessionLocal, ReplicaSet, SessionLocal, _create_async_engine
+from models import Employee
+from tests.conftest import new_employee
+
+REPLICA_NAME = "Aarav Replica"
+
+
+def email_in(path: str, email: str) -> bool:
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT 1 FROM employees WHERE email = ?", (email,)).fetchone() is not None
+
+
+@pytest.fixture
+def replica(tmp_path, monkeypatch) -> str:
+    """
+    A replica of the test database in its own SQLite file, routed to by the async sessions.
+    
+    Employee 1 has another name there, so every read shows which database answered it.
+    """
+    path = str(tmp_path / "replica.db")
+    with sqlite3.connect(make_url(settings.database_url).database) as primary, sqlite3.connect(path) as copy:
+        primary.backup(copy)
+        copy.execute("UPDATE employees SET name = ? WHERE id = 1", (REPLICA_NAME,))
+    engine = _create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.setattr(AsyncRoutingSession, "replicas", ReplicaSet([engine.sync_engine]))
+    yield path
+    engine.sync_engine.dispose()
+
+
+def test_gets_read_the_replica(client, replica):
+    assert client.get("/api/employees/1").json()["name"] == REPLICA_NAME
+    assert [employee["name"] for employee in client.get(
+        "/api/employees", params={"search": "aarav"}
+    ).json()["employees"]] == [REPLICA_NAME]
+
+
+def test_posts_write_to_the_primary(client, replica):
+    response = client.post("/api/employees", json=new_employee("Tara Menon"))
+    
+    assert response.status_code == 201
+    assert email_in(make_url(settings.database_url).database, "tara.menon@company.com")
+    assert not email_in(replica, "tara.menon@company.com")
+
+
+@pytest.mark.anyio
+async def test_reads_after_a_flush_go_to_the_primary(replica):
+    query = select(Employee.name).where(Employee.id == 1)
+    async with AsyncSessionLocal() as db:
+        assert await db.scalar(query) == REPLICA_NAME
+        
+        db.add(Employee(**new_employee("Tara Menon", date_of_joining=date(2024, 1, 2)), change_seq=0))
+        await db.flush()
+        
+        assert await db.scalar(query) == "Aarav Sharma"
+        await db.rollback()
+    
+    with SessionLocal() as db:
+        assert db.scalar(select(Employee.id).where(Employee.email == "tara.menon@company.com")) is None
@@ -0,0 +1,236 @@
+"""AsyncEmployeeRepository: every search path returns what plain SQL returns."""
+import asyncio
+from datetime import date
+
+import pytest
+
+from config import settings
+from database import AsyncSessionLocal, SessionLocal
+from indexes.directory_snapshot import SnapshotReads, directory_snapshot
+from indexes.prefix_index import prefix_index
+from indexes.snapshot_file import MappedSnapshot, write_snapshot_file
+from indexes.trigram_index import TrigramIndex, trigram_index
+from repositories import async_employee_repository
+from repositories.async_employee_repository import INDEX_BUILD_ATTEMPTS, AsyncEmployeeRepository, index_builds
+from repositories.employee_filters import EmployeeFilters
+from repositories.employee_repository import EmployeeRepository
+from snapshot_builder import build_snapshot
+
+pytestmark = pytest.mark.anyio
+
+# In-memory paths compared with SQL; "mapped" serves from a published snapshot file
+PATHS = ["trigram", "snapshot", "mapped"]
+
+TERMS = ["", "kumar", "ar", "ENG", "an s", "sales", "nobody"]
+FILTERS = [
+    None,
+    EmployeeFilters(department="Engineering"),
+    EmployeeFilters(designation="Intern"),
+    EmployeeFilters(joined_from=date(2021, 1, 1), joined_to=date(2022, 12, 31)),
+    EmployeeFilters(department="Sales", joined_from=date(2021, 6, 1)),
+    # Exact comparison, as `=` under SQLite's BINARY collation
+    EmployeeFilters(department="engineering"),
+    EmployeeFilters(designation="Intern "),
+]
+FACETS = ("department", "designation", "year")
+
+# Names whose case folding or order differs between Python's str.lower() and
+# SQLite's ASCII-only lower() and LIKE: uppercase accents, the Kelvin sign
+# (lowercases to "k"), dotted capital I (lowercases to two characters) and a
+# lowercase first letter (sorts after every capital in byte order)
+UNICODE_NAMES = ["Élodie Martin", "élodie Roy", "\u212aarl Weiss", "İpek Yılmaz", "de Souza Ana"]
+UNICODE_TERMS = [
+    "élo", "ÉLO", "ELO", "lod", "karl", "arl", "ipek", "pek", "de s", "DE S", "ana", "étu", "ÉTUDES", "tudes"
+]
+
+
+@pytest.fixture(autouse=True)
+def mapped_snapshot(tmp_path, monkeypatch) -> MappedSnapshot:
+    """The mapped snapshot the repository serves from, backed by a file in tmp_path."""
+    snapshot = MappedSnapshot(str(tmp_path / "snapshot.bin"))
+    monkeypatch.setattr(async_employee_repository, "mapped_snapshot", snapshot)
+    return snapshot
+
+
+async def search(db, monkeypatch, path: str, *args):
+    monkeypatch.setattr(settings, "search_index_enabled", path == "trigram")
+    monkeypatch.setattr(settings, "snapshot_serving_enabled", path in ("snapshot", "mapped"))
+    monkeypatch.setattr(settings, "snapshot_file_path", "")
+    if path == "mapped":
+        # Published from the database as it is now, as snapshot_builder.py does
+        path = async_employee_repository.mapped_snapshot.path
+        write_snapshot_file(path, build_snapshot())
+        monkeypatch.setattr(settings, "snapshot_file_path", path)
+    employees, total, facets = await AsyncEmployeeRepository(db).search_employees(*args)
+    return [tuple(row) for row in employees], total, facets
+
+
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("term", TERMS)
+async def test_search_paths_agree_with_sql(async_db, monkeypatch, path, term, filters):
+    for args in (
+        (term, 3, 0, None, True, (), filters),
+        (term, 3, 2, None, True, FACETS, filters),
+        (term, 50, 0, ("Kiran Rao", 7), True, (), filters),
+    ):
+        assert await search(async_db, monkeypatch, path, *args) == await search(async_db, monkeypatch, "sql", *args)
+
+
+@pytest.fixture
+def unicode_names():
+    """Add employees named UNICODE_NAMES."""
+    with SessionLocal() as db:
+        EmployeeRepository(db).bulk_create_employees([
+            {
+                "name": name,
+                "email": f"unicode.{index}@company.com",
+                "department": "Études" if index % 2 else "Research",
+                "designation": "Scientist",
+                "date_of_joining": date(2024, 3, 1),
+            }
+            for index, name in enumerate(UNICODE_NAMES)
+        ])
+
+
+@pytest.mark.usefixtures("unicode_names")
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("term", UNICODE_TERMS + [""])
+async def test_search_paths_fold_case_and_order_like_the_database(async_db, monkeypatch, path, term):
+    for args in ((term, 50, 0), (term, 50, 0, ("Zed", 0))):
+        assert await search(async_db, monkeypatch, path, *args) == await search(async_db, monkeypatch, "sql", *args)
+
+
+def test_in_memory_search_only_narrows_where_python_cannot_reproduce_the_collation(monkeypatch):
+    assert trigram_index.exact and directory_snapshot.exact
+    
+    monkeypatch.setattr(settings, "database_url", "mysql+pymysql://user@db/employee_directory")
+    trigram_index.reset()
+    
+    assert trigram_index.can_answer("kumar") and not trigram_index.exact
+    assert directory_snapshot.can_answer("kumar") and not directory_snapshot.exact
+
+
+@pytest.mark.usefixtures("unicode_names")
+@pytest.mark.parametrize("path", PATHS)
+@pytest.mark.parametrize("term", UNICODE_TERMS + ["kumar", "sales", "nobody", "e\u0301tu"])
+async def test_candidates_narrow_sql_where_python_cannot_reproduce_the_collation(async_db, monkeypatch, path, term):
+    monkeypatch.setattr(settings, "database_url", "mysql+pymysql://user@db/employee_directory")
+    trigram_index.reset()
+    narrowed = []
+    
+    def spy(candidates):
+        def spied(self, term):
+            narrowed.append(candidates(self, term))
+            return narrowed[-1]
+        return spied
+    
+    monkeypatch.setattr(TrigramIndex, "candidates", spy(TrigramIndex.candidates))
+    monkeypatch.setattr(SnapshotReads, "candidates", spy(SnapshotReads.candidates))
+    for args in ((term, 50, 0), (term, 3, 0, None, True, FACETS), (term, 50, 0, None, True, (), FILTERS[1])):
+        assert await search(async_db, monkeypatch, path, *args) == await search(async_db, monkeypatch, "sql", *args)
+    
+    assert len(narrowed) == 3 and all(ids is not None for ids in narrowed)
+    # A listing cannot be narrowed, and Python cannot order it as MySQL does
+    assert await search(async_db, monkeypatch, path, "", 50, 0) == await search(async_db, monkeypatch, "sql", "", 50, 0)
+
+
+@pytest.mark.parametrize("path", ["snapshot", "mapped"])
+@pytest.mark.parametrize("term", ["a\x00p", "ar\tsh", "r\x7f"])
+async def test_snapshot_leaves_control_characters_to_sql(async_db, monkeypatch, path, term):
+    assert not directory_snapshot.can_answer(term)
+    assert await search(async_db, monkeypatch, path, term, 50, 0) == await search(
+        async_db, monkeypatch, "sql", term, 50, 0
+    )
+
+
+async def test_rows_by_ids_keep_order_and_repeats(async_db):
+    rows = await AsyncEmployeeRepository(async_db).get_employee_rows_by_ids([3, 999, 1, 3])
+    
+    assert [row.id for row in rows] == [3, 1, 3]
+    assert rows[0].name == "Rahul Kumar"
+
+
+async def test_concurrent_first_searches_share_one_index_build(monkeypatch):
+    monkeypatch.setattr(settings, "search_index_enabled", True)
+    executions = index_builds.executions
+    
+    async def search_kumar():
+        async with AsyncSessionLocal() as db:
+            employees, total, _ = await AsyncEmployeeRepository(db).search_employees("kumar")
+            return [row.name for row in employees], total
+    
+    results = await asyncio.gather(*(search_kumar() for _ in range(5)))
+    
+    assert index_builds.executions == executions + 1
+    assert results == [(["Priya Kumar", "Rahul Kumar"], 2)] * 5
+    assert trigram_index.ready
+
+
+async def test_concurrent_first_snapshot_reads_share_one_build(monkeypatch):
+    monkeypatch.setattr(settings, "snapshot_serving_enabled", True)
+    executions = index_builds.executions
+    
+    async def search_kumar():
+        async with AsyncSessionLocal() as db:
+            employees, total, _ = await AsyncEmployeeRepository(db).search_employees("kumar")
+            return [row.name for row in employees], total
+    
+    results = await asyncio.gather(*(search_kumar() for _ in range(5)))
+    
+    assert index_builds.executions == executions + 1
+    assert results == [(["Priya Kumar", "Rahul Kumar"], 2)] * 5
+    assert directory_snapshot.ready
+
+
+async def test_a_write_during_an_index_build_is_not_lost(async_db, monkeypatch):
+    monkeypatch.setattr(settings, "search_index_enabled", True)
+    build = trigram_index.build
+    
+    def build_after_a_write(rows, generation=None):
+        # The rows were read before this employee existed
+        with SessionLocal() as db:
+            EmployeeRepository(db).bulk_create_employees([{
+                "name": "Kumar Late",
+                "email": "kumar.late@company.com",
+                "department": "Sales",
+                "designation": "Intern",
+                "date_of_joining": date(2024, 5, 1),
+            }])
+        monkeypatch.setattr(trigram_index, "build", build)
+        return build(rows, generation)
+    
+    monkeypatch.setattr(trigram_index, "build", build_after_a_write)
+    repository = AsyncEmployeeRepository(async_db)
+    
+    for _ in range(2):
+        _, total, _ = await repository.search_employees("kumar")
+        assert total == 3
+    assert trigram_index.ready
+
+
+async def test_index_builds_give_up_on_publishing_under_constant_writes(async_db, monkeypatch):
+    build = prefix_index.build
+    builds = []
+    
+    def build_after_a_write(rows, generation=None):
+        builds.append(generation)
+        with SessionLocal() as db:
+            EmployeeRepository(db).bulk_create_employees([{
+                "name": f"Kumar Writer{len(builds)}",
+                "email": f"kumar.writer{len(builds)}@company.com",
+                "department": "Sales",
+                "designation": "Intern",
+                "date_of_joining": date(2024, 5, 1),
+            }])
+        return build(rows, generation)
+    
+    monkeypatch.setattr(prefix_index, "build", build_after_a_write)
+    index = await AsyncEmployeeRepository(async_db).ensure_prefix_index()
+    
+    assert len(builds) == INDEX_BUILD_ATTEMPTS
+    assert not prefix_index.ready
+    # Answered from the last build, whose rows include the writes before it
+    assert [suggestion["text"] for suggestion in index.suggest("kumar writer", 10)] == [
+        f"Kumar Writer{n}" for n in range(1, INDEX_BUILD_ATTEMPTS)
+    ]
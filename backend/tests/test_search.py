@@ -0,0 +1,245 @@
+"""GET /api/employees: substring search, paging, totals, facets, filters and fuzzy matching."""
+from datetime import date
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import SessionLocal
+from repositories.async_employee_repository import AsyncEmployeeRepository
+from repositories.employee_repository import EmployeeRepository
+from tests.conftest import EMPLOYEES, new_employee
+
+ALL_NAMES = sorted(name for name, *_ in EMPLOYEES)
+
+
+def names(response) -> list:
+    return [employee["name"] for employee in response.json()["employees"]]
+
+
+@pytest.fixture(params=[True, False], ids=["trigram", "sql"])
+def search_index(request, monkeypatch):
+    """Run a test with the in-memory trigram index and with plain SQL."""
+    monkeypatch.setattr(settings, "search_index_enabled", request.param)
+    return request.param
+
+
+def test_lists_everyone_by_name(client):
+    response = client.get("/api/employees")
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert names(response) == ALL_NAMES
+    assert body["total"] == len(EMPLOYEES)
+    assert body["next_cursor"] is None
+    assert body["facets"] is None
+    assert set(body["employees"][0]) == {"id", "name", "email", "department", "designation", "date_of_joining"}
+
+
+@pytest.mark.usefixtures("search_index")
+def test_substring_search_matches_name_or_department(client):
+    assert names(client.get("/api/employees", params={"search": "kumar"})) == ["Priya Kumar", "Rahul Kumar"]
+    # "eer" occurs in no name: every match comes from the department
+    response = client.get("/api/employees", params={"search": "INEER"})
+    assert names(response) == ["Aarav Sharma", "Kiran Rao", "Priya Kumar"]
+    assert response.json()["total"] == 3
+
+
+@pytest.mark.usefixtures("search_index")
+def test_terms_with_like_wildcards(client):
+    client.post("/api/employees", json=new_employee("Percent 100% Sure", email="percent@company.com"))
+    
+    assert names(client.get("/api/employees", params={"search": "0%"})) == ["Percent 100% Sure"]
+
+
+def test_search_term_too_short(client):
+    response = client.get("/api/employees", params={"search": " a "})
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Search term must be at least 2 characters"}
+
+
+@pytest.mark.usefixtures("search_index")
+def test_cursor_pages_cover_every_match_once(client):
+    seen = []
+    params = {"limit": 3}
+    while True:
+        body = client.get("/api/employees", params=params).json()
+        seen.extend(employee["name"] for employee in body["employees"])
+        if body["next_cursor"] is None:
+            break
+        params = {"limit": 3, "cursor": body["next_cursor"]}
+    
+    assert seen == ALL_NAMES
+
+
+def test_offset_paging(client):
+    response = client.get("/api/employees", params={"limit": 2, "offset": 6})
+    
+    assert names(response) == ALL_NAMES[6:]
+    assert response.json()["next_cursor"] is None
+
+
+def test_invalid_cursor(client):
+    response = client.get("/api/employees", params={"cursor": "not-a-cursor"})
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid pagination cursor"}
+
+
+def test_total_can_be_skipped(client):
+    # Two characters: too short for the trigram index, so the COUNT is the only source of a total
+    body = client.get("/api/employees", params={"search": "ku", "include_total": "false"}).json()
+    
+    assert body["total"] is None
+    assert len(body["employees"]) == 2
+
+
+def test_total_follows_writes(client):
+    assert client.get("/api/employees", params={"search": "kumar"}).json()["total"] == 2
+    client.post("/api/employees", json=new_employee("Anil Kumar"))
+    
+    assert client.get("/api/employees", params={"search": "kumar"}).json()["total"] == 3
+
+
+def test_facets_count_every_match(client):
+    body = client.get(
+        "/api/employees", params={"search": "engineer", "facets": "department,designation,year", "limit": 1}
+    ).json()
+    
+    assert body["facets"]["department"] == {"Engineering": 3}
+    assert body["facets"]["designation"] == {"Intern": 1, "Senior Engineer": 1, "Software Engineer": 1}
+    assert body["facets"]["year"] == {"2019": 1, "2020": 1, "2023": 1}
+
+
+def test_facets_of_the_whole_directory(client):
+    body = client.get("/api/employees", params={"facets": "department"}).json()
+    
+    assert body["facets"]["department"] == {
+        "Engineering": 3, "Finance": 1, "Human Resources": 1, "Marketing": 1, "Sales": 2
+    }
+
+
+def test_unknown_facet(client):
+    response = client.get("/api/employees", params={"facets": "salary"})
+    
+    assert response.status_code == 400
+
+
+@pytest.mark.usefixtures("search_index")
+def test_structured_filters(client):
+    assert names(client.get("/api/employees", params={"department": "Sales"})) == ["Rahul Kumar", "Vikram Singh"]
+    assert names(client.get("/api/employees", params={"designation": "Intern"})) == ["Kiran Rao"]
+    assert names(client.get(
+        "/api/employees", params={"joined_from": "2021-01-01", "joined_to": "2021-12-31"}
+    )) == ["Rahul Kumar", "Sneha Iyer"]
+    assert names(client.get(
+        "/api/employees", params={"search": "ku", "department": "Sales"}
+    )) == ["Rahul Kumar"]
+
+
+def test_empty_date_range(client):
+    response = client.get("/api/employees", params={"joined_from": "2022-01-01", "joined_to": "2021-01-01"})
+    
+    assert response.status_code == 400
+
+
+def test_sparse_fieldset(client):
+    body = client.get("/api/employees", params={"search": "kumar", "fields": "name"}).json()
+    
+    assert body["employees"] == [
+        {"id": 2, "name": "Priya Kumar"},
+        {"id": 3, "name": "Rahul Kumar"},
+    ]
+    assert client.get("/api/employees", params={"fields": "salary"}).status_code == 400
+
+
+def test_fuzzy_search_tolerates_typos(client):
+    body = client.get("/api/employees", params={"search": "vikrm", "fuzzy": "true"}).json()
+    
+    assert [employee["name"] for employee in body["employees"]] == ["Vikram Singh"]
+
+
+def test_fuzzy_search_requires_a_term(client):
+    response = client.get("/api/employees", params={"fuzzy": "true"})
+    
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Fuzzy search requires a search term"}
+
+
+def test_cached_results_are_invalidated_by_writes(client):
+    assert names(client.get("/api/employees", params={"search": "singh"})) == ["Vikram Singh"]
+    client.post("/api/employees", json=new_employee("Arjun Singh"))
+    
+    assert names(client.get("/api/employees", params={"search": "singh"})) == ["Arjun Singh", "Vikram Singh"]
+
+
+def test_a_search_overtaken_by_a_write_does_not_cache_its_page(client, monkeypatch):
+    search = AsyncEmployeeRepository.search_employees
+    
+    async def search_then_write(self, *args, **kwargs):
+        page = await search(self, *args, **kwargs)
+        # Another request commits a new match before this one caches its page
+        monkeypatch.setattr(AsyncEmployeeRepository, "search_employees", search)
+        with SessionLocal() as db:
+            row = new_employee("Karan Kumar", date_of_joining=date(2024, 1, 2))
+            EmployeeRepository(db).bulk_create_employees([row])
+        return page
+    
+    monkeypatch.setattr(AsyncEmployeeRepository, "search_employees", search_then_write)
+    assert names(client.get("/api/employees", params={"search": "kumar"})) == ["Priya Kumar", "Rahul Kumar"]
+    
+    assert names(client.get("/api/employees", params={"search": "kumar"})) == [
+        "Karan Kumar", "Priya Kumar", "Rahul Kumar"
+    ]
+
+
+def test_a_total_counted_before_a_write_is_not_cached(client, monkeypatch):
+    monkeypatch.setattr(settings, "search_index_enabled", False)
+    scalar = AsyncSession.scalar
+    
+    async def count_then_write(self, *args, **kwargs):
+        total = await scalar(self, *args, **kwargs)
+        # A new match is committed while the COUNT result is on its way back
+        monkeypatch.setattr(AsyncSession, "scalar", scalar)
+        with SessionLocal() as db:
+            row = new_employee("Karan Kumar", date_of_joining=date(2024, 1, 2))
+            EmployeeRepository(db).bulk_create_employees([row])
+        return total
+    
+    monkeypatch.setattr(AsyncSession, "scalar", count_then_write)
+    assert client.get("/api/employees", params={"search": "kumar"}).json()["total"] == 2
+    
+    assert client.get("/api/employees", params={"search": "kumar"}).json()["total"] == 3
+
+
+def test_totals_are_cached_per_term_as_the_database_folds_it(client, monkeypatch):
+    monkeypatch.setattr(settings, "search_index_enabled", False)
+    for name in ("Élodie Martin", "Élodie Blanc", "élodie Roy"):
+        client.post("/api/employees", json=new_employee(name, email=f"{name.split()[1].lower()}@company.com"))
+    
+    # LIKE folds ASCII letters only: the lowercase é does not match É
+    assert client.get("/api/employees", params={"search": "Élodie"}).json()["total"] == 2
+    assert client.get("/api/employees", params={"search": "élodie"}).json()["total"] == 1
+
+
+def test_facets_counted_before_a_write_are_not_kept(client, monkeypatch):
+    execute = AsyncSession.execute
+    
+    async def group_then_write(self, statement, *args, **kwargs):
+        result = await execute(self, statement, *args, **kwargs)
+        if "GROUP BY" not in str(statement):
+            return result
+        # A new employee is committed while the GROUP BY result is on its way back
+        monkeypatch.setattr(AsyncSession, "execute", execute)
+        with SessionLocal() as db:
+            row = new_employee("Karan Mehta", "Sales", date_of_joining=date(2024, 1, 2))
+            EmployeeRepository(db).bulk_create_employees([row])
+        return result
+    
+    monkeypatch.setattr(AsyncSession, "execute", group_then_write)
+    body = client.get("/api/employees", params={"facets": "department", "limit": 1, "include_total": False}).json()
+    assert body["facets"]["department"]["Sales"] == 2
+    
+    body = client.get("/api/employees", params={"facets": "department", "limit": 1}).json()
+    assert (body["total"], body["facets"]["department"]["Sales"]) == (9, 3)
@@ -0,0 +1,37 @@
+"""Search result cache backends."""
+import pytest
+
+from services.search_cache import SearchResultCache, SqliteCacheBackend
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_sqlite_backend_evicts_the_oldest_stored_entry(tmp_path):
+    cache = SearchResultCache(SqliteCacheBackend(str(tmp_path / "cache.db"), max_entries=2, ttl_seconds=60))
+    await cache.set("a", {"page": 1})
+    await cache.set("b", {"page": 2})
+    # A hit only reads; it does not move the entry up
+    assert await cache.get("a") == {"page": 1}
+    
+    await cache.set("c", {"page": 3})
+    
+    assert await cache.get("a") is None
+    assert [await cache.get("b"), await cache.get("c")] == [{"page": 2}, {"page": 3}]
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_keys_fold_case_and_differ_per_data_version():
+    key = SearchResultCache.make_key(1, "kumar", 50, 0, None, True)
+    
+    assert SearchResultCache.make_key(1, " Kumar ", 50, 0, None, True) == key
+    assert SearchResultCache.make_key(2, "kumar", 50, 0, None, True) != key
+
+
+def test_keys_fold_only_the_case_the_database_folds():
+    # LIKE folds ASCII letters only, so "Élodie" and "élodie" match different rows
+    assert SearchResultCache.make_key(1, "ÉLODIE", 50, 0, None, True) == SearchResultCache.make_key(
+        1, "Élodie", 50, 0, None, True
+    )
+    assert SearchResultCache.make_key(1, "élodie", 50, 0, None, True) != SearchResultCache.make_key(
+        1, "Élodie", 50, 0, None, True
+    )
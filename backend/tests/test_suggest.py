@@ -0,0 +1,46 @@
+"""GET /api/employees/suggest: prefix autocomplete of departments and names."""
+from tests.conftest import new_employee
+
+
+def suggestions(client, q: str, **params) -> list:
+    response = client.get("/api/employees/suggest", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(s["text"], s["type"], s["count"]) for s in response.json()["suggestions"]]
+
+
+def test_suggestions_rank_by_count(client):
+    assert suggestions(client, "s", limit=1) == [("Sales", "department", 2)]
+    client.post("/api/employees", json=new_employee("Sam Fox", department="Support"))
+    for number in range(3):
+        client.post("/api/employees", json=new_employee("Sneha Iyer", email=f"sneha.{number}@company.com"))
+    
+    assert suggestions(client, "s") == [
+        ("Sneha Iyer", "name", 4),
+        ("Sales", "department", 2),
+        ("Support", "department", 1),
+        ("Sam Fox", "name", 1),
+        ("Aarav Sharma", "name", 1),
+        ("Vikram Singh", "name", 1),
+    ]
+    # The top of the whole prefix range, not of its first keys
+    assert suggestions(client, "s", limit=1) == [("Sneha Iyer", "name", 4)]
+    assert suggestions(client, "sneha", limit=1) == [("Sneha Iyer", "name", 4)]
+
+
+def test_names_complete_from_any_word(client):
+    assert suggestions(client, "  KUM ") == [("Priya Kumar", "name", 1), ("Rahul Kumar", "name", 1)]
+
+
+def test_limit(client):
+    assert len(suggestions(client, "s", limit=2)) == 2
+
+
+def test_new_employees_are_suggested(client):
+    assert suggestions(client, "zo") == []
+    client.post("/api/employees", json=new_employee("Zoya Khan"))
+    
+    assert suggestions(client, "zo") == [("Zoya Khan", "name", 1)]
+
+
+def test_limit_out_of_range(client):
+    assert client.get("/api/employees/suggest", params={"q": "a", "limit": 50}).status_code == 422
@@ -24,6 +24,7 @@ function App() {
   const [selectedDepartment, setSelectedDepartment] = useState('All Departments');
   const [employees, setEmployees] = useState<Employee[]>([]);
   const [allEmployees, setAllEmployees] = useState<Employee[]>([]);
+  const [departmentCounts, setDepartmentCounts] = useState<Record<string, number>>({});
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   
@@ -38,9 +39,10 @@ function App() {
         setIsLoading(true);
         setError(null);
 
-        // Fetch all employees
-        const response = await employeeAPI.searchEmployees(undefined, 50, 0);
+        // Fetch all employees, with directory-wide department counts for the filter
+        const response = await employeeAPI.searchEmployees(undefined, 50, 0, ['department']);
         setAllEmployees(response.employees);
+        setDepartmentCounts(response.facets?.department ?? {});
       } catch (err) {
         if (err instanceof Error) {
           if (err.message === 'Request cancelled') {
@@ -86,9 +88,9 @@ function App() {
     setEmployees(filtered);
   }, [allEmployees, debouncedSearchTerm, selectedDepartment]);
 
-  // Get unique departments from employees
+  // Get unique departments from the department facet (covers the whole directory)
   const uniqueDepartments = Array.from(
-    new Set(allEmployees.map((emp) => emp.department))
+    new Set([...Object.keys(departmentCounts), ...allEmployees.map((emp) => emp.department)])
   ).sort();
 
   return (
@@ -133,6 +135,7 @@ function App() {
               selectedDepartment={selectedDepartment}
               onDepartmentChange={setSelectedDepartment}
               departments={uniqueDepartments}
+              departmentCounts={departmentCounts}
             />
           </div>
 
@@ -5,12 +5,14 @@ interface FilterBarProps {
   selectedDepartment: string;
   onDepartmentChange: (department: string) => void;
   departments: string[];
+  departmentCounts?: Record<string, number>;
 }
 
 const FilterBar: React.FC<FilterBarProps> = ({
   selectedDepartment,
   onDepartmentChange,
   departments,
+  departmentCounts,
 }) => {
   return (
     <div className="filter-bar">
@@ -26,7 +28,7 @@ const FilterBar: React.FC<FilterBarProps> = ({
         <option value="All Departments">All Departments</option>
         {departments.map((dept) => (
           <option key={dept} value={dept}>
-            {dept}
+            {departmentCounts?.[dept] !== undefined ? `${dept} (${departmentCounts[dept]})` : dept}
           </option>
         ))}
       </select>
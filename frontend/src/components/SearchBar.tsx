@@ -1,4 +1,6 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
+import { employeeAPI } from '../services/api';
+import { useDebounce } from '../hooks/useDebounce';
 import './SearchBar.css';
 
 interface SearchBarProps {
@@ -16,8 +18,9 @@ interface SearchBarProps {
  * - Visual feedback when typing
  * - Disabled state during loading
  * - Accessible with proper labels
+ * - Native typeahead list fed by the suggest endpoint (debounced 150ms)
  * 
- * Note: Debouncing is handled by parent component using useDebounce hook
+ * Note: Debouncing of the search itself is handled by parent component using useDebounce hook
  */
 const SearchBar: React.FC<SearchBarProps> = ({
   value,
@@ -25,6 +28,27 @@ const SearchBar: React.FC<SearchBarProps> = ({
   placeholder = 'Search employees by name or department...',
   disabled = false,
 }) => {
+  const [suggestions, setSuggestions] = useState<string[]>([]);
+
+  // Ask for suggestions once typing pauses rather than on every keystroke
+  const debouncedValue = useDebounce(value, 150);
+
+  useEffect(() => {
+    if (!debouncedValue.trim()) {
+      setSuggestions([]);
+      return;
+    }
+    let active = true;
+    employeeAPI.suggest(debouncedValue).then((results) => {
+      if (active) {
+        setSuggestions(results.map((suggestion) => suggestion.text));
+      }
+    });
+    return () => {
+      active = false;
+    };
+  }, [debouncedValue]);
+
   const handleClear = () => {
     onChange('');
   };
@@ -54,8 +78,16 @@ const SearchBar: React.FC<SearchBarProps> = ({
           onChange={(e) => onChange(e.target.value)}
           disabled={disabled}
           aria-label="Search employees"
+          list="search-suggestions"
+          autoComplete="off"
         />
         
+        <datalist id="search-suggestions">
+          {suggestions.map((suggestion) => (
+            <option key={suggestion} value={suggestion} />
+          ))}
+        </datalist>
+        
         {value && (
           <button
             className="clear-button"
@@ -1,4 +1,4 @@
-import type { EmployeeListResponse } from '../types/employee';
+import type { EmployeeListResponse, Suggestion, SuggestResponse } from '../types/employee';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
@@ -7,6 +7,7 @@ const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000
  */
 class EmployeeAPI {
   private abortController: AbortController | null = null;
+  private suggestAbortController: AbortController | null = null;
 
   /**
    * Search employees by name or department.
@@ -15,13 +16,15 @@ class EmployeeAPI {
    * @param search - Search term (optional)
    * @param limit - Maximum results to return
    * @param offset - Pagination offset
+   * @param facets - Facets to count over all matches (department, designation, year)
    * @returns Employee list with pagination metadata
    * @throws Error with user-friendly message
    */
   async searchEmployees(
     search?: string,
     limit: number = 50,
-    offset: number = 0
+    offset: number = 0,
+    facets: string[] = []
   ): Promise<EmployeeListResponse> {
     // Cancel previous request if still pending
     this.cancelPendingRequest();
@@ -37,6 +40,9 @@ class EmployeeAPI {
       }
       params.append('limit', limit.toString());
       params.append('offset', offset.toString());
+      if (facets.length > 0) {
+        params.append('facets', facets.join(','));
+      }
 
       const url = `${API_BASE_URL}/api/employees?${params.toString()}`;
 
@@ -71,6 +77,33 @@ class EmployeeAPI {
     }
   }
 
+  /**
+   * Fetch typeahead suggestions for a prefix.
+   * Cancels the previous suggestion request; failures resolve to no suggestions.
+   * 
+   * @param query - Prefix typed so far
+   * @param limit - Maximum suggestions to return
+   * @returns Name and department completions
+   */
+  async suggest(query: string, limit: number = 8): Promise<Suggestion[]> {
+    this.suggestAbortController?.abort();
+    this.suggestAbortController = new AbortController();
+
+    try {
+      const params = new URLSearchParams({ q: query.trim(), limit: limit.toString() });
+      const response = await fetch(`${API_BASE_URL}/api/employees/suggest?${params.toString()}`, {
+        signal: this.suggestAbortController.signal,
+      });
+      if (!response.ok) {
+        return [];
+      }
+      const data: SuggestResponse = await response.json();
+      return data.suggestions;
+    } catch {
+      return [];
+    }
+  }
+
   /**
    * Cancel any pending API request.
    */
@@ -9,9 +9,22 @@ export interface Employee {
 
 export interface EmployeeListResponse {
   employees: Employee[];
-  total: number;
+  total: number | null;
   limit: number;
   offset: number;
+  next_cursor?: string | null;
+  facets?: Record<string, Record<string, number>>;
+}
+
+export interface Suggestion {
+  text: string;
+  type: 'name' | 'department';
+  count: number;
+}
+
+export interface SuggestResponse {
+  query: string;
+  suggestions: Suggestion[];
 }
 
 export interface ApiError {